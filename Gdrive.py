@@ -1,8 +1,12 @@
 import io
 import os
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
 from docx import Document
 from PyPDF2 import PdfReader
 from datetime import datetime
@@ -20,16 +24,95 @@ MIME_TYPES = {
 }
 
 
-def fetch_data(selected_files, access_token):
-    # Setup credentials
-    creds = Credentials(
-        token=access_token,
-        scopes=["https://www.googleapis.com/auth/drive.readonly"]
-    )
-    drive_service = build("drive", "v3", credentials=creds)
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+GOOGLE_DOC_MIME = "application/vnd.google-apps.document"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def _make_session(max_workers=8):
+    """Create a pooled requests session with retries for Drive downloads"""
+    session = requests.Session()
+    retry = Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers * 2, max_retries=retry)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared across fetches so downloads reuse pooled TLS connections
+_session = _make_session()
+
+
+def _download_file(session, file_info, access_token):
+    """Download (or export, for Google Docs) a single Drive file into memory"""
+    headers = {'Authorization': f'Bearer {access_token}'}
+
+    # Export if Google Doc, else normal download
+    if file_info['mimeType'] == GOOGLE_DOC_MIME:
+        url = f"{DRIVE_FILES_URL}/{file_info['id']}/export"
+        params = {'mimeType': DOCX_MIME}
+    else:
+        url = f"{DRIVE_FILES_URL}/{file_info['id']}"
+        params = {'alt': 'media'}
+
+    fh = io.BytesIO()
+    with session.get(url, headers=headers, params=params, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=1024 * 1024):
+            fh.write(chunk)
+    fh.seek(0)
+    return fh
+
+
+def _extract_text(file_name, fh):
+    """Extract text from a downloaded file based on its extension"""
+    if file_name.lower().endswith(".txt"):
+        return fh.read().decode("utf-8", errors="ignore")
+
+    elif file_name.lower().endswith(".pdf"):
+        reader = PdfReader(fh)
+        pdf_text = ""
+        for page in reader.pages:
+            extracted_text = page.extract_text()
+            if extracted_text:
+                pdf_text += extracted_text
+        return pdf_text
+
+    elif file_name.lower().endswith(".docx"):
+        # Per-file temp path so parallel downloads don't overwrite each other
+        with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as temp:
+            temp.write(fh.read())
+        try:
+            doc = Document(temp.name)
+            return "\n".join(
+                [para.text for para in doc.paragraphs if para.text.strip()])
+        finally:
+            os.remove(temp.name)
+
+    else:
+        # fallback for unknown types
+        return fh.read().decode("utf-8", errors="ignore")
+
+
+def _fetch_one(session, file_info, access_token):
+    """Download one file and return its text with a header"""
+    fh = _download_file(session, file_info, access_token)
+    return f"\n\n--- {file_info['name']} ---\n\n" + _extract_text(file_info['name'], fh)
 
-    combined_text = ""
-    temp_docx = "temp_drive_file.docx"
+
+def fetch_data(selected_files, access_token, session=None, max_workers=8):
+    """
+    Download the selected Drive files in parallel and combine their text.
+
+    Args:
+        selected_files (list): File dicts with 'id', 'name' and 'mimeType'
+        access_token (str): The OAuth access token
+        session (requests.Session, optional): Session to download with (default: shared module session)
+        max_workers (int): Number of concurrent downloads
+
+    Returns:
+        str: Path of the combined text file in fetched_files
+    """
+    session = session or _session
 
     # Output paths
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -45,65 +128,22 @@ def fetch_data(selected_files, access_token):
     combined_path_fetched = os.path.join(FETCHED_FILES_DIR, output_filename)
     combined_path_upload = os.path.join(UPLOAD_DIR, "fetched_data.txt")
 
-    for file_info in selected_files:
-        try:
-            file_id = file_info['id']
-            file_name = file_info['name']
-            mime_type = file_info['mimeType']
-
-            fh = io.BytesIO()
-
-            # Export if Google Doc, else normal download
-            if mime_type == 'application/vnd.google-apps.document':
-                request = drive_service.files().export_media(
-                    fileId=file_id,
-                    mimeType='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-                )
-            else:
-                request = drive_service.files().get_media(fileId=file_id)
-
-            # Download in chunks
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-
-            fh.seek(0)
-
-            # Prepare header for each file
-            header = f"\n\n--- {file_name} ---\n\n"
-
-            # Handle based on file extension
-            if file_name.lower().endswith(".txt"):
-                text_content = fh.read().decode("utf-8", errors="ignore")
-                combined_text += header + text_content
-
-            elif file_name.lower().endswith(".pdf"):
-                reader = PdfReader(fh)
-                pdf_text = ""
-                for page in reader.pages:
-                    extracted_text = page.extract_text()
-                    if extracted_text:
-                        pdf_text += extracted_text
-                combined_text += header + pdf_text
-
-            elif file_name.lower().endswith(".docx"):
-                with open(temp_docx, "wb") as temp:
-                    temp.write(fh.read())
-                doc = Document(temp_docx)
-                doc_text = "\n".join(
-                    [para.text for para in doc.paragraphs if para.text.strip()])
-                combined_text += header + doc_text
-                os.remove(temp_docx)
-
-            else:
-                # fallback for unknown types
-                fallback_text = fh.read().decode("utf-8", errors="ignore")
-                combined_text += header + fallback_text
-
-        except Exception as e:
-            print(
-                f"[ERROR] Failed to process file {file_info.get('name', 'unknown')}: {e}")
+    # Keep the combined text in the order the files were selected
+    parts = [""] * len(selected_files)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_fetch_one, session, file_info, access_token): index
+            for index, file_info in enumerate(selected_files)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                parts[index] = future.result()
+            except Exception as e:
+                print(
+                    f"[ERROR] Failed to process file {selected_files[index].get('name', 'unknown')}: {e}")
+
+    combined_text = "".join(parts)
 
     # Save combined text
     with open(combined_path_fetched, "w", encoding="utf-8") as f_out:
@@ -114,7 +154,7 @@ def fetch_data(selected_files, access_token):
     print(f"[DONE] Combined file saved to: {combined_path_fetched}")
     print(f"[DONE] Overwritten fetched_data.txt at: {combined_path_upload}")
 
-    return output_filename
+    return combined_path_fetched
 
 
 def list_files(access_token, file_type='all', folder_id='root', global_search=False):
@@ -66,26 +66,25 @@ IMPORTANT_FILES = [
     ".env.example"
 ]
 
-def run_command(command, capture_output=True):
-    """Run a shell command and return the output"""
+def run_command(args, capture_output=True):
+    """Run a command (argv list, no shell) and return the output"""
     try:
         result = subprocess.run(
-            command,
-            shell=True,
+            args,
             check=True,
             text=True,
             capture_output=capture_output
         )
         return result.stdout.strip() if capture_output else None
-    except subprocess.CalledProcessError as e:
-        print(f"Error executing command: {command}")
-        print(f"Error message: {e.stderr}")
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Error executing command: {' '.join(args)}")
+        print(f"Error message: {getattr(e, 'stderr', None) or str(e)}")
         sys.exit(1)
 
 def check_git_repo():
     """Check if the current directory is a Git repository"""
     try:
-        run_command("git rev-parse --is-inside-work-tree")
+        run_command(["git", "rev-parse", "--is-inside-work-tree"])
         return True
     except:
         return False
@@ -94,7 +93,7 @@ def setup_github_repo(repo_name):
     """Set up a GitHub repository if it doesn't exist"""
     # Check if remote origin is already configured
     try:
-        remote_url = run_command("git remote get-url origin")
+        remote_url = run_command(["git", "remote", "get-url", "origin"])
         print(f"GitHub repository already configured: {remote_url}")
         return
     except:
@@ -102,8 +101,8 @@ def setup_github_repo(repo_name):
 
     # Check if Git user is configured
     try:
-        user_name = run_command("git config --global user.name")
-        user_email = run_command("git config --global user.email")
+        user_name = run_command(["git", "config", "--global", "user.name"])
+        user_email = run_command(["git", "config", "--global", "user.email"])
 
         if not user_name or not user_email:
             print("Git user not fully configured. Please run setup_github.py first.")
@@ -125,7 +124,7 @@ def setup_github_repo(repo_name):
 
     # Add the remote origin
     remote_url = f"https://github.com/{github_username}/{repo_name}.git"
-    run_command(f"git remote add origin {remote_url}")
+    run_command(["git", "remote", "add", "origin", remote_url])
     print(f"Added remote: {remote_url}")
 
 def backup_files():
@@ -141,23 +140,24 @@ def backup_files():
     # Set up GitHub repository if needed
     setup_github_repo(repo_name)
 
-    # Add each important file to Git
+    # Collect the important files and add them to Git in one call
+    to_add = []
     for file in IMPORTANT_FILES:
         if os.path.exists(file):
-            # Check if it's a directory
+            to_add.append(file)
+            # Directories are added recursively
             if os.path.isdir(file):
-                # Add all files in the directory
-                run_command(f"git add {file}/*")
-                print(f"Added all files in directory {file} to Git")
+                print(f"Adding all files in directory {file} to Git")
             else:
-                # Add the individual file
-                run_command(f"git add {file}")
-                print(f"Added {file} to Git")
+                print(f"Adding {file} to Git")
         else:
             print(f"Warning: {file} not found, skipping")
 
+    if to_add:
+        run_command(["git", "add", "--"] + to_add)
+
     # Check if there are changes to commit
-    status = run_command("git status --porcelain")
+    status = run_command(["git", "status", "--porcelain"])
     if not status:
         print("No changes to commit.")
         return False
@@ -173,11 +173,11 @@ def backup_files():
         commit_message = f"Automated backup: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"
 
     # Commit changes
-    run_command(f'git commit -m "{commit_message}"')
+    run_command(["git", "commit", "-m", commit_message])
     print(f"Committed changes with message: {commit_message}")
 
     # Push to GitHub
-    run_command("git push -u origin master", capture_output=False)
+    run_command(["git", "push", "-u", "origin", "master"], capture_output=False)
     print("Pushed changes to GitHub")
 
     return True
@@ -0,0 +1,21 @@
+"""
+Document Text Extractors
+
+PDF and DOCX text extraction used by main2's S3 ingestion. These run in a
+separate process pool, so this module must stay free of import-time side
+effects: worker processes import it instead of main2.
+"""
+
+def extract_pdf_text(path):
+    """Extract the text of every page of a PDF file"""
+    # Import here so the pool's workers only load the parser they need
+    from PyPDF2 import PdfReader
+    reader = PdfReader(path)
+    return "".join((page.extract_text() or "") for page in reader.pages)
+
+def extract_docx_text(path):
+    """Extract paragraph text from a DOCX file"""
+    # Import here so the pool's workers only load the parser they need
+    from docx import Document
+    doc = Document(path)
+    return "".join(para.text + '\n' for para in doc.paragraphs)
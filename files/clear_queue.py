@@ -5,7 +5,6 @@ This script clears all tasks from the message broker's queue.
 """
 
 import os
-import pickle
 import logging
 
 # Configure logging
@@ -21,18 +20,19 @@ logger = logging.getLogger('clear_queue')
 
 def clear_queue():
     """Clear all tasks from the message broker's queue"""
-    queue_file = "streaming_tasks.pickle"
-    
-    if os.path.exists(queue_file):
-        # Create an empty queue file
-        with open(queue_file, 'wb') as f:
-            pickle.dump([], f)
-        
-        logger.info(f"Queue file {queue_file} cleared")
-        print(f"Queue file {queue_file} cleared")
-    else:
-        logger.info(f"Queue file {queue_file} does not exist")
-        print(f"Queue file {queue_file} does not exist")
+    queue_files = ["streaming_tasks.log", "streaming_tombstones.log"]
+
+    for queue_file in queue_files:
+        if os.path.exists(queue_file):
+            # Replace with an empty file; the new inode tells running brokers to re-read
+            open(f"{queue_file}.tmp", 'wb').close()
+            os.replace(f"{queue_file}.tmp", queue_file)
+
+            logger.info(f"Queue file {queue_file} cleared")
+            print(f"Queue file {queue_file} cleared")
+        else:
+            logger.info(f"Queue file {queue_file} does not exist")
+            print(f"Queue file {queue_file} does not exist")
 
 if __name__ == "__main__":
     clear_queue()
@@ -10,20 +10,19 @@ import os
 import subprocess
 import getpass
 
-def run_command(command):
-    """Run a shell command and return the output"""
+def run_command(args):
+    """Run a command (argv list, no shell) and return the output"""
     try:
         result = subprocess.run(
-            command,
-            shell=True,
+            args,
             check=True,
             text=True,
             capture_output=True
         )
         return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Error executing command: {command}")
-        print(f"Error message: {e.stderr}")
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Error executing command: {' '.join(args)}")
+        print(f"Error message: {getattr(e, 'stderr', None) or str(e)}")
         return None
 
 def setup_git_config():
@@ -36,8 +35,9 @@ def setup_git_config():
     
     # Configure Git
     if name and email:
-        run_command(f'git config --global user.name "{name}"')
-        run_command(f'git config --global user.email "{email}"')
+        # Names with quotes or spaces are passed through untouched without a shell
+        run_command(["git", "config", "--global", "user.name", name])
+        run_command(["git", "config", "--global", "user.email", email])
         print("\nGit configuration updated successfully!")
         print(f"Name: {name}")
         print(f"Email: {email}")
@@ -72,14 +72,13 @@ def setup_github_credentials():
             
             # Set up the remote origin
             remote_url = f"https://github.com/{username}/{repo_name}.git"
-            run_command(f"git remote add origin {remote_url}")
+            run_command(["git", "remote", "add", "origin", remote_url])
             print(f"\nRemote origin added: {remote_url}")
         else:
             print("Repository name was empty. Repository setup aborted.")
     
     # Configure credential helper to cache credentials
-    run_command("git config --global credential.helper cache")
-    run_command("git config --global credential.helper 'cache --timeout=3600'")
+    run_command(["git", "config", "--global", "credential.helper", "cache --timeout=3600"])
     
     print("\nGitHub setup completed!")
     print("Your credentials will be cached for 1 hour after your first push.")
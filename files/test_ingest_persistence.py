@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Ingest Persistence
+
+This script checks that entries added by the ingest tail reach MongoDB by:
+1. Creating a test repository file and loading it into MongoDB
+2. Ingesting a first and a second batch the way main2's _finalize_ingest does
+   (process_file, load_text, then the debounced persist_new_entries)
+3. Verifying that a keyword unique to each batch is stored in MongoDB and that
+   the repository metadata records the highest entity ID
+"""
+
+import os
+import sys
+import random
+import string
+from final2 import KnowledgeRetrieval
+from text import process_file, get_last_entity_id
+
+def write_input(input_file, words, num_paragraphs=3):
+    """Write random paragraphs built from words to input_file."""
+    paragraphs = [" ".join(random.choices(words, k=20)) for _ in range(num_paragraphs)]
+    with open(input_file, "w") as f:
+        f.write("\n\n".join(paragraphs))
+
+def ingest(knowledge_system, repo_file, words):
+    """Ingest one batch like the ingest tail; return a keyword that only this batch contains."""
+    # Random letters, so an earlier run or the real repository can't already hold it
+    marker = "".join(random.choices(string.ascii_lowercase, k=12))
+    input_file = "temp_ingest_input.txt"
+    write_input(input_file, words + [marker] * len(words))
+    try:
+        generated = process_file(input_file, repo_file)
+    finally:
+        os.remove(input_file)
+
+    knowledge_system.load_text(generated, append=True)
+    knowledge_system.persist_new_entries(repo_file)
+    return marker
+
+def main():
+    print("=" * 80)
+    print("TESTING INGEST PERSISTENCE")
+    print("=" * 80)
+
+    repo_file = "test_ingest_repository.txt"
+    input_file = "temp_ingest_input.txt"
+    write_input(input_file, ["test", "data", "repository", "entity", "mongodb", "knowledge"], 5)
+    process_file(input_file, repo_file, append=False)
+    os.remove(input_file)
+
+    print("\nInitializing knowledge retrieval system...")
+    knowledge_system = KnowledgeRetrieval()
+    if not knowledge_system.use_mongodb or knowledge_system.mongo_db is None:
+        print("MongoDB is not available; nothing to test.")
+        os.remove(repo_file)
+        sys.exit(1)
+
+    print("\nLoading initial data...")
+    knowledge_system.load_data(local=True, file_path=repo_file, append=True, save_to_db=True)
+
+    failed = False
+    for batch, words in enumerate((["first", "batch", "ingest", "upload"],
+                                   ["second", "batch", "slack", "drive"]), start=1):
+        print(f"\nIngesting batch {batch}...")
+        marker = ingest(knowledge_system, repo_file, words)
+        if knowledge_system.mongo_db['dictionary'].find_one({"_id": marker}) is None:
+            failed = True
+            print(f"FAIL: batch {batch} keyword '{marker}' is missing from MongoDB")
+        else:
+            print(f"OK: batch {batch} keyword '{marker}' is in MongoDB")
+
+    metadata = knowledge_system.mongo_db.metadata.find_one({"_id": "repository_file"})
+    highest_entity_id = get_last_entity_id(repo_file)
+    if not metadata or metadata.get("highest_entity_id") != highest_entity_id:
+        failed = True
+        print(f"FAIL: repository metadata {metadata} does not record highest entity ID {highest_entity_id}")
+    else:
+        print(f"OK: repository metadata records highest entity ID {highest_entity_id}")
+
+    print("\nCleaning up...")
+    os.remove(repo_file)
+
+    print("\nTest failed!" if failed else "\nTest completed!")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
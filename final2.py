@@ -28,6 +28,17 @@ except ImportError:
         def __exit__(self, type, value, traceback):
             pass
 
+# Connection pool settings for the shared MongoClient
+MONGO_POOL_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 5,
+    "serverSelectionTimeoutMS": 3000,
+}
+
+def create_mongo_client(connection_string):
+    """Create a pooled MongoClient; share one per process rather than one per request."""
+    return MongoClient(connection_string, **MONGO_POOL_OPTIONS)
+
 # Define required collections that must exist for the system to work properly
 REQUIRED_COLLECTIONS = [
     'dictionary',
@@ -57,7 +68,7 @@ class KnowledgeRetrieval:
     Processes user queries against a corpus of text data and returns relevant information.
     """
 
-    def __init__(self, use_mongodb=True, mongo_connection_string="mongodb://localhost:27017", mongo_db_name="KnowledgeBase"):
+    def __init__(self, use_mongodb=True, mongo_connection_string="mongodb://localhost:27017", mongo_db_name="KnowledgeBase", mongo_client=None):
         """
         Initialize the knowledge retrieval system with empty tables.
 
@@ -65,6 +76,7 @@ class KnowledgeRetrieval:
             use_mongodb (bool): Whether to use MongoDB for storage (default: True)
             mongo_connection_string (str): MongoDB connection string
             mongo_db_name (str): MongoDB database name
+            mongo_client (MongoClient, optional): Shared client to use instead of creating one
         """
         # MongoDB configuration
         self.use_mongodb = use_mongodb  # Use the provided value
@@ -81,7 +93,7 @@ class KnowledgeRetrieval:
                 self.mongo_db = None
                 return
 
-            self.mongo_client = MongoClient(self.mongo_connection_string, serverSelectionTimeoutMS=5000)
+            self.mongo_client = mongo_client or create_mongo_client(self.mongo_connection_string)
             # Verify connection
             self.mongo_client.admin.command('ping')
             self.mongo_db = self.mongo_client[self.mongo_db_name]
@@ -171,6 +183,51 @@ class KnowledgeRetrieval:
         self.backend_tables = self._initialize_backend_tables()
         self.backend_params = self._get_backend_params()
 
+    def reconfigure_mongo(self, use_mongodb, connection_string, db_name):
+        """
+        Point the system at a different MongoDB without rebuilding the in-memory tables.
+
+        Args:
+            use_mongodb (bool): Whether to use MongoDB for storage
+            connection_string (str): MongoDB connection string
+            db_name (str): MongoDB database name
+
+        Returns:
+            bool: True if MongoDB is in use after the change
+        """
+        if self.mongo_client is not None:
+            self.mongo_client.close()
+
+        self.use_mongodb = use_mongodb
+        self.mongo_connection_string = connection_string
+        self.mongo_db_name = db_name
+        self.mongo_client = None
+        self.mongo_db = None
+
+        if not use_mongodb:
+            print("MongoDB is disabled in configuration. Using file-based storage.")
+            return False
+
+        try:
+            self.mongo_client = create_mongo_client(connection_string)
+            self.mongo_client.admin.command('ping')
+            self.mongo_db = self.mongo_client[db_name]
+            print(f"Connected to MongoDB database: {db_name}")
+
+            existing_collections = self.mongo_db.list_collection_names()
+            for collection in REQUIRED_COLLECTIONS:
+                if collection not in existing_collections:
+                    self.mongo_db.create_collection(collection)
+                    print(f"Created empty collection: {collection}")
+            return True
+        except Exception as e:
+            print(f"WARNING: Failed to connect to MongoDB: {e}")
+            print("Falling back to file-based storage.")
+            self.use_mongodb = False
+            self.mongo_client = None
+            self.mongo_db = None
+            return False
+
     def _initialize_backend_tables(self):
         """Initialize all backend tables as empty dictionaries."""
         table_names = (
@@ -658,42 +715,110 @@ class KnowledgeRetrieval:
 
                     # Update the processed file hash, line count, and highest entity ID in the database
                     if file_hash:
-                        # Count lines in the file
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            line_count = sum(1 for line in f if line.strip())
-
-                        # Get the highest entity ID from the repository file
-                        highest_entity_id = 0
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            for line in f:
-                                if line.strip():
-                                    try:
-                                        # Extract the entity ID from the beginning of the line
-                                        parts = line.split('~~', 1)
-                                        if len(parts) >= 1 and parts[0].isdigit():
-                                            entity_id = int(parts[0])
-                                            if entity_id > highest_entity_id:
-                                                highest_entity_id = entity_id
-                                    except Exception as e:
-                                        pass
-
-                        self.mongo_db.metadata.update_one(
-                            {"_id": "repository_file"},
-                            {"$set": {
-                                "hash": file_hash,
-                                "line_count": line_count,
-                                "entity_count": line_count,  # Keep for backward compatibility
-                                "highest_entity_id": highest_entity_id,
-                                "timestamp": time.time()
-                            }},
-                            upsert=True
-                        )
-                        print(f"Updated repository file hash in database: {file_hash}")
-                        print(f"Updated line count in database: {line_count}")
-                        print(f"Updated highest entity ID in database: {highest_entity_id}")
+                        self.update_repository_metadata(file_path, file_hash)
             else:
                 print("No new data to load. Using existing data from MongoDB.")
 
+    def update_repository_metadata(self, file_path, file_hash=None):
+        """
+        Record the repository file's hash, line count and highest entity ID in MongoDB.
+
+        load_data() compares these on the next start to decide whether the file
+        has new data, so call this only once the tables holding its entries are saved.
+
+        Args:
+            file_path (str): Path to the repository file
+            file_hash (str, optional): MD5 of the file, if the caller already has it
+        """
+        if not self.use_mongodb or self.mongo_db is None:
+            return
+
+        # One pass over the file for the hash, the line count and the highest ID
+        md5 = hashlib.md5() if file_hash is None else None
+        line_count = 0
+        highest_entity_id = 0
+        with open(file_path, 'rb') as f:
+            for line in f:
+                if md5 is not None:
+                    md5.update(line)
+                if line.strip():
+                    line_count += 1
+                    # Extract the entity ID from the beginning of the line
+                    entity_id = line.split(b'~~', 1)[0]
+                    if entity_id.isdigit() and int(entity_id) > highest_entity_id:
+                        highest_entity_id = int(entity_id)
+        if md5 is not None:
+            file_hash = md5.hexdigest()
+
+        self.mongo_db.metadata.update_one(
+            {"_id": "repository_file"},
+            {"$set": {
+                "hash": file_hash,
+                "line_count": line_count,
+                "entity_count": line_count,  # Keep for backward compatibility
+                "highest_entity_id": highest_entity_id,
+                "timestamp": time.time()
+            }},
+            upsert=True
+        )
+        print(f"Updated repository file hash in database: {file_hash}")
+        print(f"Updated line count in database: {line_count}")
+        print(f"Updated highest entity ID in database: {highest_entity_id}")
+
+    def persist_new_entries(self, file_path=None):
+        """
+        Save the backend tables after new entries were merged in, then record the repository file.
+
+        save_backend_tables() skips the save once MongoDB holds any data unless
+        forced, so new entries always force it, as load_data() does.
+
+        Args:
+            file_path (str, optional): Repository file the new entries were appended to
+        """
+        self.save_backend_tables(force=True)
+        if file_path and os.path.exists(file_path):
+            self.update_repository_metadata(file_path)
+
+    def load_text(self, text, append=True, process_source="main", save_to_db=False, file_path=None):
+        """
+        Build backend tables from repository-format text already in memory.
+
+        Use this after generating new entries instead of load_data(), which
+        would re-read and re-parse the whole repository file. With save_to_db
+        the tables are saved and the repository metadata updated the way
+        load_data() does after a merge; otherwise the caller must persist them
+        (persist_new_entries()), or the entries are lost on restart.
+
+        Args:
+            text (str): Repository lines ("ID~~{...}") to add
+            append (bool): Whether to append to existing data or replace it
+            process_source (str): Source of the process calling this method ('main' or 'worker')
+            save_to_db (bool): Whether to save to MongoDB before returning
+            file_path (str, optional): Repository file the entries were appended to,
+                recorded in the metadata after saving
+        """
+        if not text:
+            return
+
+        lock_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'repository_lock')
+
+        with FileLock(lock_file_path):
+            print(f"[{process_source}] Acquired lock for loading in-memory data")
+
+            # First, ensure KW_map is loaded if it exists
+            if not self.backend_tables['KW_map']:
+                self.backend_tables['KW_map'] = self._load_keyword_map()
+
+            self.build_tables(text, append=append)
+
+            # After building tables, ensure KW_map is updated
+            self.create_keyword_map(update_memory=True, save_to_file=False)
+
+            # Save while still holding the lock, as load_data() does
+            if save_to_db:
+                print(f"[{process_source}] Saving new entries to MongoDB...")
+                self.persist_new_entries(file_path)
+
     def build_tables(self, data, append=True):
         """Build all backend tables from loaded data."""
         entities = data.split("\n")
@@ -0,0 +1,22 @@
+# Gunicorn settings for serving main2:app
+#
+#   gunicorn -c gunicorn.conf.py main2:app
+#
+# With gevent installed, the gevent worker patches the standard library before
+# main2 is imported, so OAuth calls to Google, Redis and MongoDB I/O yield instead
+# of holding a thread. Without it, threaded (gthread) workers are used.
+
+bind = "0.0.0.0:5001"
+
+try:
+    import gevent  # noqa: F401
+    worker_class = "gevent"
+    worker_connections = 1000
+except ImportError:
+    worker_class = "gthread"
+    threads = 16
+
+# Processing status, OAuth tokens and the loaded knowledge base live in process
+# memory, so a single worker process serves all connections.
+workers = 1
+timeout = 300
@@ -1,41 +1,161 @@
-from flask import Flask, request, jsonify, render_template, redirect, url_for, session
+# When run as the server script, patch sockets, sleeps and locks for gevent before
+# anything else imports them, so requests, redis and pymongo calls yield instead of
+# blocking. Importers (the gevent gunicorn worker, which patches on its own, and the
+# streaming workers, which must stay on real threads) are left unpatched.
+monkey = None
+if __name__ == '__main__':
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+    except ImportError:
+        monkey = None
+
+from flask import Flask, Response, request, render_template, redirect, url_for, session
 from flask_cors import CORS
+from jinja2 import ChoiceLoader, FileSystemLoader
 import os
-import sys
 import threading
 import time
-import subprocess
-import hashlib
+import shutil
+import tempfile
+import codecs
+import uuid
+import secrets
+import functools
+import collections
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode
 import datetime
-from final2 import KnowledgeRetrieval
+import atexit
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import multiprocessing
+from final2 import KnowledgeRetrieval, create_mongo_client
 from text import process_file  # Changed from corpus2 import generate_corpus
+from extractors import extract_pdf_text, extract_docx_text
 import json
 import io
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Optional
+from werkzeug.exceptions import BadRequest
 # Import the new Gdrive module
 import Gdrive
+# forkserver/spawn pool children (PDF_POOL, text.py's pool) import the server script
+# again as __mp_main__ when it is run directly; they only run pool tasks, so they skip
+# the broker, the knowledge system and the background load
+_POOL_CHILD = __name__ == '__mp_main__'
+
 # Import message broker for streaming API
-try:
-    from message_broker import broker as message_broker
-except ImportError:
-    print("Message broker not available. Streaming API will use direct processing.")
+if _POOL_CHILD:
     message_broker = None
+else:
+    try:
+        from message_broker import broker as message_broker
+    except ImportError:
+        print("Message broker not available. Streaming API will use direct processing.")
+        message_broker = None
 try:
     import boto3
+    from botocore.config import Config
 except ImportError:
     print("boto3 not installed. AWS S3 functionality will not work.")
+    boto3 = None
 try:
-    from dotenv import load_dotenv
+    from dotenv import dotenv_values
 except ImportError:
     print("python-dotenv not installed. AWS S3 and Slack functionality will not work.")
+try:
+    import orjson
+except ImportError:
+    print("orjson not installed. JSON responses will use the standard json module.")
+    orjson = None
+try:
+    from cachetools import TLRUCache
+except ImportError:
+    print("cachetools not installed. OAuth tokens will be kept without expiry.")
+    TLRUCache = None
 try:
     from slack_sdk import WebClient
     from slack_sdk.errors import SlackApiError
+    import slack_integration
 except ImportError:
     print("slack_sdk not installed. Slack functionality will not work.")
+    slack_integration = None
 
 app = Flask(__name__)
-app.secret_key = os.urandom(24)  # Set a secret key for sessions
+
+# Templates are read straight from the repo: the top-level pages (home.html,
+# data_input.html) first, then templates/ for the rest. Jinja caches them in memory.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+app.jinja_loader = ChoiceLoader([
+    FileSystemLoader(BASE_DIR),
+    FileSystemLoader(os.path.join(BASE_DIR, 'templates')),
+])
+
+# JSON encoding for responses: orjson when available, otherwise the stdlib encoder
+if orjson is not None:
+    def _json_dumps(obj):
+        return orjson.dumps(obj, default=str)
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, default=str).encode('utf-8')
+
+def _json_response(body, status=200):
+    """Wrap already-encoded JSON bytes in a response"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def jsonify_fast(obj, status=200):
+    """Drop-in for jsonify() that encodes with orjson when it is installed"""
+    return _json_response(_json_dumps(obj), status)
+
+# Error bodies returned on every unauthorized Drive request, encoded once
+_NOT_AUTHORIZED_JSON = _json_dumps({"error": "Not authorized. Please connect to Google Drive first."})
+_INVALID_TOKEN_JSON = _json_dumps({"error": "Invalid token. Please reconnect to Google Drive."})
+# Persist the session secret so restarts don't invalidate existing session cookies
+SECRET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.flask_secret')
+SECRET_LENGTH = 32
+
+def _load_secret_key(path):
+    """Read the persisted secret, creating it if it is missing or truncated
+
+    The secret is written in full to a temp file before it appears at path, so
+    other workers never read a partial one; when several start at once, the
+    first link wins and everyone reads that secret back.
+    """
+    try:
+        with open(path, 'rb') as f:
+            key = f.read()
+        if len(key) >= SECRET_LENGTH:
+            return key
+        broken = True  # Left short by a crash before this was atomic
+    except FileNotFoundError:
+        broken = False
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.flask_secret.')  # 0o600
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(secrets.token_bytes(SECRET_LENGTH))
+            f.flush()
+            os.fsync(f.fileno())
+        if broken:
+            os.replace(tmp, path)
+        else:
+            try:
+                os.link(tmp, path)
+            except FileExistsError:
+                pass  # Another worker got there first; use its secret
+    finally:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+
+    with open(path, 'rb') as f:
+        return f.read()
+
+app.secret_key = _load_secret_key(SECRET_PATH)
 # Configure session to be more secure
 app.config['SESSION_COOKIE_SECURE'] = False  # Set to True in production with HTTPS
 app.config['SESSION_COOKIE_HTTPONLY'] = True
@@ -49,6 +169,22 @@ processing_status = {
     "status": "idle",
     "error": None
 }
+_status_lock = threading.RLock()
+# Notified whenever processing_status changes; used by /status/stream
+_status_condition = threading.Condition(_status_lock)
+
+def get_status():
+    """Return a consistent snapshot of processing_status"""
+    with _status_lock:
+        return dict(processing_status)
+
+def set_status(**kwargs):
+    """Apply several processing_status fields at once, skipping no-op writes"""
+    with _status_lock:
+        if any(processing_status.get(k) != v for k, v in kwargs.items()):
+            processing_status.update(kwargs)
+            processing_status["updated_at"] = time.monotonic()
+            _status_condition.notify_all()
 
 # MongoDB configuration
 def get_app_config():
@@ -81,33 +217,52 @@ def get_app_config():
 
     return config
 
+# Get application configuration
+app_config = get_app_config()
+
 # Initialize the KnowledgeRetrieval system at startup
-try:
-    # Get application configuration
-    app_config = get_app_config()
-    connection_string = app_config.get("connection_string", "mongodb://localhost:27017")
-    db_name = app_config.get("db_name", "KnowledgeBase")
-    repository_file = app_config.get("repository_file")
+if not _POOL_CHILD:
+    try:
+        connection_string = app_config.get("connection_string", "mongodb://localhost:27017")
+        db_name = app_config.get("db_name", "KnowledgeBase")
+        repository_file = app_config.get("repository_file")
+
+        # One pooled MongoClient for the whole process, shared with the knowledge system
+        mongo_client = create_mongo_client(connection_string)
+
+        # Initialize with MongoDB
+        print(f"Initializing KnowledgeRetrieval with MongoDB: {db_name}")
+        knowledge_system = KnowledgeRetrieval(
+            mongo_connection_string=connection_string,
+            mongo_db_name=db_name,
+            mongo_client=mongo_client
+        )
 
-    # Initialize with MongoDB
-    print(f"Initializing KnowledgeRetrieval with MongoDB: {db_name}")
-    knowledge_system = KnowledgeRetrieval(
-        mongo_connection_string=connection_string,
-        mongo_db_name=db_name
-    )
+        print("Knowledge system class initialized successfully.")
 
-    print("Knowledge system class initialized successfully.")
+    except Exception as e:
+        print(f"CRITICAL ERROR: Failed to initialize KnowledgeRetrieval: {e}")
+        print("Application may not function correctly.")
 
-    # Load data from repository file if specified
-    if repository_file and os.path.exists(repository_file):
-        print(f"Using repository file from config: {repository_file}")
-        knowledge_system.load_data(local=True, file_path=repository_file, save_to_db=True, process_source="main")
+# Load the repository in the background so importing this module stays fast;
+# queries wait on _ready until the initial load has finished
+_ready = threading.Event()
 
-    print("Knowledge system initialized successfully!")
+def _bg_load():
+    """Load the configured repository file into the knowledge system"""
+    try:
+        if repository_file and os.path.exists(repository_file):
+            print(f"Using repository file from config: {repository_file}")
+            knowledge_system.load_data(local=True, file_path=repository_file, save_to_db=True, process_source="main")
+        print("Knowledge system initialized successfully!")
+    except Exception as e:
+        print(f"CRITICAL ERROR: Failed to load repository data: {e}")
+        print("Application may not function correctly.")
+    finally:
+        _ready.set()
 
-except Exception as e:
-    print(f"CRITICAL ERROR: Failed to initialize KnowledgeRetrieval: {e}")
-    print("Application may not function correctly.")
+if not _POOL_CHILD:
+    threading.Thread(target=_bg_load, daemon=True).start()
 
 # Data loading is now handled during initialization
 
@@ -117,6 +272,8 @@ MIME_TYPES = {
     'pdf': "application/pdf",
     'docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 }
+# The file-type list never changes, so encode it once for /get-drive-file-types
+_DRIVE_FILE_TYPES_JSON = _json_dumps(list(MIME_TYPES.keys()))
 
 # Google OAuth configuration
 GOOGLE_CLIENT_ID = "311723313181-pp08rji8pjkl9jd1vdq33tisumlfavjm.apps.googleusercontent.com"  # Replace with your actual client ID
@@ -126,32 +283,226 @@ GOOGLE_TOKEN_URI = "https://oauth2.googleapis.com/token"
 GOOGLE_AUTH_PROVIDER_X509_CERT_URL = "https://www.googleapis.com/oauth2/v1/certs"
 GOOGLE_DRIVE_SCOPE = "https://www.googleapis.com/auth/drive.readonly"
 
-# Function to get the redirect URI based on the request
-def get_redirect_uri():
-    """Get the redirect URI based on the request host"""
-    # Always use the current host dynamically
-    host = request.host_url.rstrip('/')
+# Static part of the authorization URL; redirect_uri and state are added per request
+_AUTH_PREFIX = GOOGLE_AUTH_URI + "?" + urlencode({
+    "response_type": "code",
+    "client_id": GOOGLE_CLIENT_ID,
+    "scope": GOOGLE_DRIVE_SCOPE,
+    "access_type": "offline",
+    "prompt": "consent",
+})
+
+# Shared HTTP session so repeated calls to Google reuse pooled TLS connections
+HTTP = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                            max_retries=Retry(total=2, backoff_factor=0.2))
+HTTP.mount('https://', _http_adapter)
+HTTP.mount('http://', _http_adapter)
+
+# (connect, read) timeouts for calls to Google made on a request thread
+GOOGLE_TIMEOUT = (3.05, 10)
+
+@functools.lru_cache(maxsize=16)
+def _normalize_host(host_url):
+    """Strip the trailing slash and force https for ngrok hosts"""
+    host = host_url.rstrip('/')
 
     # For ngrok URLs, ensure we're using https
     if 'ngrok-free.app' in host:
-        # Extract the ngrok subdomain
         if host.startswith('http://'):
             host = 'https://' + host[7:]
 
-    redirect_uri = f"{host}/oauth2callback"
-    print(f"DEBUG - Using dynamic redirect URI: {redirect_uri}")
+    return host
+
+# Bounded pool for background ingestion jobs; extra jobs queue instead of spawning threads
+INGEST_WORKERS = app_config.get("ingest_workers", 16)
+INGEST_POOL = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest")
+atexit.register(INGEST_POOL.shutdown, wait=False)
 
-    # Log additional information for debugging
-    print(f"DEBUG - Request host: {request.host}")
-    print(f"DEBUG - Request scheme: {request.scheme}")
-    print(f"DEBUG - Request URL: {request.url}")
-    print(f"DEBUG - Request headers: {dict(request.headers)}")
+# Number of submitted jobs still waiting for a free worker
+_ingest_pending = 0
+_ingest_pending_lock = threading.Lock()
+
+def dispatch_background(target, *args):
+    """Queue an ingestion job on the shared pool without blocking the request"""
+    global _ingest_pending
+
+    def run():
+        global _ingest_pending
+        with _ingest_pending_lock:
+            _ingest_pending -= 1
+        try:
+            return target(*args)
+        except Exception as e:
+            print(f"Error in background job {target.__name__}: {e}")
+            raise
+
+    with _ingest_pending_lock:
+        _ingest_pending += 1
+    return INGEST_POOL.submit(run)
+
+# Admin actions (save tables, Mongo reconfigure, clear queue) run on the ingest pool
+# and are reported by /status?task_id=...; only the most recent ones are kept
+ADMIN_JOB_HISTORY = 256
+_admin_jobs = {}
+_admin_jobs_lock = threading.Lock()
+
+def _set_admin_job(job_id, **fields):
+    with _admin_jobs_lock:
+        _admin_jobs[job_id].update(fields, updated=datetime.datetime.now().isoformat())
+
+def get_admin_job(job_id):
+    """Return a copy of an admin job's status, or None"""
+    with _admin_jobs_lock:
+        job = _admin_jobs.get(job_id)
+        return dict(job) if job else None
+
+def submit_admin_job(action, target, *args):
+    """Run an admin action in the background and answer 202 with a status URL"""
+    job_id = uuid.uuid4().hex
+    with _admin_jobs_lock:
+        if len(_admin_jobs) >= ADMIN_JOB_HISTORY:
+            del _admin_jobs[next(iter(_admin_jobs))]
+        _admin_jobs[job_id] = {"id": job_id, "action": action, "status": "queued"}
+
+    def run():
+        _set_admin_job(job_id, status="processing")
+        try:
+            result = target(*args)
+        except Exception as e:
+            _set_admin_job(job_id, status="failed", error=str(e))
+            raise
+        _set_admin_job(job_id, status="completed", result=result)
+
+    dispatch_background(run)
+
+    status_url = url_for('check_status', task_id=job_id)
+    response = jsonify_fast({"status": "accepted", "task_id": job_id, "status_url": status_url}, 202)
+    response.headers['Location'] = status_url
+    return response
+
+# Function to get the redirect URI based on the request
+@functools.lru_cache(maxsize=16)
+def _redirect_uri_for(host_url):
+    """OAuth callback URL for a host; constant per host, so memoized"""
+    return f"{_normalize_host(host_url)}/oauth2callback"
+
+def get_redirect_uri():
+    """Get the redirect URI based on the request host"""
+    # Always use the current host dynamically
+    redirect_uri = _redirect_uri_for(request.host_url)
+
+    # Log additional information for debugging (skipped entirely unless DEBUG is enabled)
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Using dynamic redirect URI: %s", redirect_uri)
+        app.logger.debug("Request host: %s scheme: %s url: %s", request.host, request.scheme, request.url)
+        app.logger.debug("Request headers: %s", request.headers)
 
     return redirect_uri
 
 # Store OAuth tokens (in a real application, this would be in a database)
-# We'll use a dictionary with session IDs as keys
-oauth_tokens = {}
+# Keyed by session ID; each entry expires when Google's access token does
+# Keep tokens that carry a refresh_token around long enough to be refreshed
+REFRESHABLE_TOKEN_TTL = 30 * 24 * 3600
+
+def _oauth_token_ttu(_key, token_info, now):
+    """Expire a cached token after its own expires_in (default one hour)"""
+    if token_info.get('refresh_token'):
+        return now + REFRESHABLE_TOKEN_TTL
+    return now + token_info.get('expires_in', 3600)
+
+OAUTH_TOKEN_CACHE_SIZE = 10000
+
+if TLRUCache is not None:
+    oauth_tokens = TLRUCache(maxsize=OAUTH_TOKEN_CACHE_SIZE, ttu=_oauth_token_ttu)
+else:
+    oauth_tokens = {}
+
+# TLRUCache is not thread-safe, so all access goes through these helpers
+_tokens_lock = threading.RLock()
+
+def get_token(user_id):
+    """Return the cached token info for a user, or None"""
+    with _tokens_lock:
+        return oauth_tokens.get(user_id)
+
+def set_token(user_id, token_info):
+    """Store (or replace) the token info for a user"""
+    with _tokens_lock:
+        if TLRUCache is None:
+            # Plain dict fallback: stay bounded by dropping the oldest session
+            oauth_tokens.pop(user_id, None)
+            if len(oauth_tokens) >= OAUTH_TOKEN_CACHE_SIZE:
+                del oauth_tokens[next(iter(oauth_tokens))]
+        oauth_tokens[user_id] = token_info
+
+def pop_token(user_id):
+    """Remove and return the token info for a user, or None"""
+    with _tokens_lock:
+        return oauth_tokens.pop(user_id, None)
+
+def token_count():
+    """Number of users with a cached token"""
+    with _tokens_lock:
+        return len(oauth_tokens)
+
+# Per-user locks so concurrent requests trigger at most one token refresh
+_token_locks = {}
+_token_locks_guard = threading.Lock()
+
+def _refresh_access_token(token_info):
+    """Exchange the refresh token for a new access token; returns the updated token info or None"""
+    refresh_token = token_info.get('refresh_token')
+    if not refresh_token:
+        return None
+
+    response = HTTP.post(GOOGLE_TOKEN_URI, data={
+        'client_id': GOOGLE_CLIENT_ID,
+        'client_secret': GOOGLE_CLIENT_SECRET,
+        'refresh_token': refresh_token,
+        'grant_type': 'refresh_token'
+    }, timeout=GOOGLE_TIMEOUT)
+    refreshed = response.json()
+    if 'error' in refreshed or not refreshed.get('access_token'):
+        print(f"Error refreshing Google access token: {refreshed.get('error')}")
+        return None
+
+    updated = dict(token_info)
+    updated.update(refreshed)
+    updated['expires_at'] = time.monotonic() + refreshed.get('expires_in', 3600)
+    return updated
+
+def get_valid_access_token(user_id):
+    """Return a non-expired access token for the user, refreshing it once if needed"""
+    token_info = get_token(user_id)
+    if token_info is None:
+        return None
+
+    # Fast path: the cached token is good for at least another minute
+    if token_info.get('expires_at', 0) > time.monotonic() + 60:
+        return token_info.get('access_token')
+
+    with _token_locks_guard:
+        lock = _token_locks.setdefault(user_id, threading.Lock())
+
+    with lock:
+        # Another request may have refreshed the token while we waited
+        token_info = get_token(user_id)
+        if token_info is None:
+            return None
+        if token_info.get('expires_at', 0) > time.monotonic() + 60:
+            return token_info.get('access_token')
+
+        try:
+            updated = _refresh_access_token(token_info)
+        except Exception as e:
+            print(f"Error refreshing Google access token: {e}")
+            updated = None
+        if updated is None:
+            return None
+
+        set_token(user_id, updated)
+        return updated.get('access_token')
 
 # Helper function to get a unique session ID for the current user
 def get_user_session_id():
@@ -162,7 +513,7 @@ def get_user_session_id():
     # Check if a session ID exists, if not create one
     if 'user_session_id' not in session:
         # Generate a random session ID
-        session['user_session_id'] = hashlib.md5(os.urandom(32)).hexdigest()
+        session['user_session_id'] = secrets.token_hex(16)
         print(f"Created new session ID: {session['user_session_id']}")
     else:
         print(f"Using existing session ID: {session['user_session_id']}")
@@ -174,29 +525,147 @@ AWS_CREDENTIALS_FILE = '.env'
 
 # Slack constants
 SLACK_CREDENTIALS_FILE = '.env'
+_VALID_SOURCES = frozenset(('public', 'private', 'dm'))
+_VALID_DATA_TYPES = frozenset(('messages', 'files'))
+
+# Streaming API constants
+_STREAMING_SOURCES = ("url", "file", "gdrive", "s3", "slack")
+_VALID_STREAMING_SOURCES = frozenset(_STREAMING_SOURCES)
+_INVALID_STREAMING_SOURCE_ERROR = f"Invalid source. Must be one of: {', '.join(_STREAMING_SOURCES)}"
+_INVALID_S3_URI_ERROR = "Invalid S3 URI format. Expected s3://bucket-name/path/to/file"
+
+# Request payloads are validated up front so bad input is rejected with a 400
+# before processing_status is reset or any background job is queued
+@dataclass
+class FileTypesReq:
+    file_types: List[str]
+
+    @classmethod
+    def from_json(cls, data):
+        file_types = data.get('fileTypes', [])
+        if not file_types or not isinstance(file_types, list):
+            raise BadRequest("File types must be provided as a list")
+        for ft in file_types:
+            if ft not in MIME_TYPES:
+                raise BadRequest(f"Unsupported file type: {ft}")
+        return cls(file_types)
+
+@dataclass
+class SlackReq:
+    sources: List[str]
+    data_types: List[str]
+    slack_token: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, data, sources_key='sources', default_sources=None, default_data_types=None):
+        sources = data.get(sources_key, default_sources or [])
+        data_types = data.get('dataTypes', default_data_types or [])
+        # The streaming API accepts a single value as well as a list
+        if default_sources is not None and not isinstance(sources, list):
+            sources = [sources]
+        if default_data_types is not None and not isinstance(data_types, list):
+            data_types = [data_types]
 
-def reset_processing_status():
-    global processing_status
-    processing_status = {
-        "progress": 0,
-        "status": "idle",
-        "error": None,
-        "total_files": 0,
-        "processed_files": 0,
-        "current_file": ""
-    }
-# Simplified language detection function for English-only processing
-def detect_language(_):
-    """
-    Always returns 'en' since we only support English now.
+        if not sources or not isinstance(sources, list):
+            raise BadRequest("Sources must be provided as a list")
+        if not data_types or not isinstance(data_types, list):
+            raise BadRequest("Data types must be provided as a list")
+        for source in sources:
+            if source not in _VALID_SOURCES:
+                raise BadRequest(f"Unsupported source: {source}")
+        for data_type in data_types:
+            if data_type not in _VALID_DATA_TYPES:
+                raise BadRequest(f"Unsupported data type: {data_type}")
+        return cls(sources, data_types, data.get('slackBotToken'))
+
+@dataclass
+class StreamingReq:
+    source: str
+    uri: Any
+    trigger: str
+    event_id: Optional[str]
+    metadata: dict
+    file_ids: Optional[List[str]] = None    # gdrive
+    s3_file_ext: Optional[str] = None       # s3
+    slack: Optional[SlackReq] = None        # slack
+
+    @classmethod
+    def from_json(cls, data):
+        if not data:
+            raise BadRequest("No data provided")
+        for field in ("source", "uri"):
+            if field not in data:
+                raise BadRequest(f"Missing required field: {field}")
+
+        source = data.get("source")
+        if not isinstance(source, str) or source.lower() not in _VALID_STREAMING_SOURCES:
+            raise BadRequest(_INVALID_STREAMING_SOURCE_ERROR)
+        source = source.lower()
+        uri = data.get("uri")
+        metadata = data.get("metadata") or {}
+        req = cls(source, uri, str(data.get("trigger", "manual")).lower(), data.get("eventId"), metadata)
+
+        if source == "gdrive":
+            # URI should be a file ID or a list of file IDs
+            if isinstance(uri, str):
+                req.file_ids = [uri]
+            elif isinstance(uri, list):
+                req.file_ids = uri
+            else:
+                raise BadRequest("Invalid URI format for Google Drive. Expected string or list of file IDs")
+
+        elif source == "s3":
+            # URI should be in the format "s3://bucket-name/path/to/file"
+            if not isinstance(uri, str) or not uri.startswith("s3://"):
+                raise BadRequest(_INVALID_S3_URI_ERROR)
+            s3_parts = uri[5:].split("/", 1)
+            if len(s3_parts) < 2:
+                raise BadRequest(_INVALID_S3_URI_ERROR)
+            req.s3_file_ext = os.path.splitext(s3_parts[1])[1].lstrip('.')
+            if not req.s3_file_ext:
+                raise BadRequest("Could not determine file type from S3 URI")
+
+        elif source == "slack":
+            req.slack = SlackReq.from_json(
+                metadata.get("slack", {}), sources_key='channelTypes',
+                default_sources=["public"], default_data_types=["messages"]
+            )
+
+        elif not isinstance(uri, str):
+            raise BadRequest(f"Invalid URI for source {source}. Expected a string")
+
+        return req
 
-    Parameters:
-    _ (str): Text to analyze (ignored)
+@functools.lru_cache(maxsize=32)
+def _load_creds(path, mtime):
+    """Parse a credentials .env file; cached until the file changes"""
+    return dotenv_values(path)
 
-    Returns:
-    str: Always 'en' for English
+def load_creds(path):
+    """Return credentials from a .env file without touching os.environ
+
+    Keys missing from the file fall back to the process environment.
     """
-    return 'en'  # Always return English
+    try:
+        values = _load_creds(path, os.path.getmtime(path))
+    except OSError:
+        values = {}
+    return collections.ChainMap(values, os.environ)
+
+def reset_processing_status():
+    with _status_lock:
+        processing_status.clear()
+        processing_status.update({
+            "progress": 0,
+            "status": "idle",
+            "error": None,
+            "total_files": 0,
+            "processed_files": 0,
+            "current_file": "",
+            "updated_at": time.monotonic()
+        })
+        _status_condition.notify_all()
+
 @app.route('/')
 def home_page():
     """Serve the home page (query interface)"""
@@ -216,14 +685,9 @@ def api_examples_page():
 def current_ngrok_url():
     """Return the current ngrok URL"""
     # Get the current host URL
-    host_url = request.host_url.rstrip('/')
-
-    # For ngrok URLs, ensure we're using https
-    if 'ngrok-free.app' in host_url:
-        if host_url.startswith('http://'):
-            host_url = 'https://' + host_url[7:]
+    host_url = _normalize_host(request.host_url)
 
-    return jsonify({"url": host_url})
+    return jsonify_fast({"url": host_url})
 
 @app.route('/query', methods=['POST'])
 def handle_query():
@@ -233,7 +697,10 @@ def handle_query():
     use_local = data.get('use_local', False)  # New parameter to control local rephrasing
 
     if not user_query:
-        return jsonify({"error": "Query cannot be empty"}), 400
+        return jsonify_fast({"error": "Query cannot be empty"}), 400
+
+    if not _ready.wait(timeout=30):
+        return jsonify_fast({"error": "Knowledge system is still warming up. Please try again shortly."}), 503
 
     try:
         # Log the query for debugging
@@ -283,7 +750,7 @@ def handle_query():
             # Fallback to original description if rephrasing fails
             rephrased_description = clean_description
 
-        return jsonify({
+        return jsonify_fast({
             "original_description": original_description,
             "rephrased_description": rephrased_description,
             "detected_language": "en",  # Always English
@@ -291,19 +758,39 @@ def handle_query():
         })
     except Exception as e:
         print(f"Error processing query: {str(e)}")
-        return jsonify({"error": f"Error processing query: {str(e)}"}), 500
+        return jsonify_fast({"error": f"Error processing query: {str(e)}"}), 500
 
 @app.route('/progress', methods=['GET'])
 def get_progress():
     """Return the current processing status and progress"""
     global processing_status
-    return jsonify(processing_status)
+    return jsonify_fast(get_status())
+
+@app.route('/status/stream')
+def stream_status():
+    """Push processing_status to the client as server-sent events whenever it changes"""
+    def generate():
+        last = None
+        while True:
+            with _status_condition:
+                # Send the current state first, then wake on every change;
+                # the timeout doubles as a keep-alive
+                if last is not None:
+                    _status_condition.wait(timeout=30)
+                current = get_status()
+            if current != last:
+                last = current
+                yield b"data: " + _json_dumps(current) + b"\n\n"
+            else:
+                yield b": keep-alive\n\n"
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 @app.route('/file-progress', methods=['GET'])
 def get_file_progress():
     """Return the current file processing status and progress"""
     global processing_status
-    return jsonify(processing_status)
+    return jsonify_fast(get_status())
 
 def process_file_async(file_path, output_file):
     """Process a single file in a separate thread and update progress"""
@@ -311,42 +798,35 @@ def process_file_async(file_path, output_file):
     global knowledge_system
 
     try:
-        processing_status["status"] = "reading"
-        processing_status["progress"] = 10
+        set_status(status="reading", progress=10)
         time.sleep(1)  # Just to make progress visible
 
         # Generate corpus from the file content using text.py's process_file function
-        processing_status["status"] = "generating_corpus"
-        processing_status["progress"] = 30
+        set_status(status="generating_corpus", progress=30)
 
         # Call the process_file function from text.py
         process_file(file_path, output_file)
 
         # Update progress
-        processing_status["status"] = "processing_content"
-        processing_status["progress"] = 60
+        set_status(status="processing_content", progress=60)
 
-        processing_status["status"] = "loading_knowledge"
-        processing_status["progress"] = 70
+        set_status(status="loading_knowledge", progress=70)
 
         # Update existing knowledge system instead of replacing it
         try:
             # Load the processed data - let the system handle checking for new data
             knowledge_system.load_data(local=True, file_path=output_file, append=True, save_to_db=True, process_source="main")
 
-            processing_status["status"] = "complete"
-            processing_status["progress"] = 100
+            set_status(status="complete", progress=100)
 
             print(f"File processing complete. Knowledge system updated and saved.")
 
         except Exception as e:
-            processing_status["status"] = "error"
-            processing_status["error"] = f"Error in knowledge system processing: {str(e)}"
+            set_status(status="error", error=f"Error in knowledge system processing: {str(e)}")
             print(f"Error in knowledge system: {e}")
 
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
+        set_status(status="error", error=str(e))
         print(f"Error in file processing: {e}")
 
 def process_multiple_files_async(file_paths, output_file):
@@ -356,95 +836,58 @@ def process_multiple_files_async(file_paths, output_file):
 
     try:
         total_files = len(file_paths)
-        processing_status["total_files"] = total_files
-        processing_status["processed_files"] = 0
-        processing_status["status"] = "processing_multiple_files"
-        processing_status["progress"] = 5
+        set_status(total_files=total_files, processed_files=0, status="processing_multiple_files", progress=5)
 
-        # Create a temporary file for each file's processed content
-        temp_output_files = []
+        # Entries generated for this request; process_file appends each file's
+        # entries to the repository with IDs continuing from its last entity
+        generated = []
+        temp_dir = os.path.dirname(file_paths[0]) if file_paths else None
 
         # Process each file individually
         for i, file_path in enumerate(file_paths):
             file_name = os.path.basename(file_path)
-            processing_status["status"] = f"processing_file_{i+1}_of_{total_files}"
-            processing_status["current_file"] = file_name
-            processing_status["progress"] = 5 + (i * 70 // total_files)
-
-            # Create a temporary output file for this file
-            temp_output = os.path.join(os.path.dirname(output_file), f"temp_output_{i}_{int(time.time())}.txt")
+            set_status(
+                status=f"processing_file_{i+1}_of_{total_files}",
+                current_file=file_name,
+                progress=5 + (i * 70 // total_files)
+            )
 
             try:
                 # Process the file
-                process_file(file_path, temp_output)
-                temp_output_files.append(temp_output)
+                generated.append(process_file(file_path, output_file))
 
                 # Update progress
-                processing_status["processed_files"] = i + 1
-                processing_status["progress"] = 5 + ((i + 1) * 70 // total_files)
+                set_status(processed_files=i + 1, progress=5 + ((i + 1) * 70 // total_files))
 
             except Exception as e:
                 print(f"Error processing file {file_name}: {e}")
                 # Continue with other files even if one fails
 
-        # Combine all processed files into the final output file
-        processing_status["status"] = "combining_files"
-        processing_status["progress"] = 75
-
-        # If the output file already exists, we'll append to it
-        # Otherwise, we'll create a new one
-        if not os.path.exists(output_file):
-            # Create an empty file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                pass
-
-        # Append each temp file to the output file
-        for temp_file in temp_output_files:
-            if os.path.exists(temp_file) and os.path.getsize(temp_file) > 0:
-                with open(temp_file, 'r', encoding='utf-8') as src:
-                    content = src.read()
-
-                    with open(output_file, 'a', encoding='utf-8') as dest:
-                        dest.write(content)
-                        dest.write("\n\n")  # Add some separation between files
-
-                # Clean up the temp file
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass  # Ignore errors in cleanup
-
-        # Load the combined data into the knowledge system
-        processing_status["status"] = "loading_knowledge"
-        processing_status["progress"] = 85
+        # Load the new entries into the knowledge system
+        set_status(status="loading_knowledge", progress=85)
 
         try:
-            # Load the processed data - let the system handle checking for new data
-            knowledge_system.load_data(local=True, file_path=output_file, append=True, save_to_db=True, process_source="main")
+            # Only the new entries are built, from memory; they are saved to MongoDB
+            # (forced) and the repository metadata updated before reporting completion
+            knowledge_system.load_text("".join(generated), append=True, save_to_db=True, file_path=output_file)
 
-            processing_status["status"] = "complete"
-            processing_status["progress"] = 100
+            set_status(status="complete", progress=100)
 
             print(f"Multiple files processing complete. Knowledge system updated and saved.")
 
         except Exception as e:
-            processing_status["status"] = "error"
-            processing_status["error"] = f"Error in knowledge system processing: {str(e)}"
+            set_status(status="error", error=f"Error in knowledge system processing: {str(e)}")
             print(f"Error in knowledge system: {e}")
 
-        # Clean up the temporary directory
+        # Clean up the temporary upload directory
         try:
-            if file_paths and len(file_paths) > 0:
-                temp_dir = os.path.dirname(file_paths[0])
-                if os.path.exists(temp_dir) and 'temp_' in temp_dir:
-                    import shutil
-                    shutil.rmtree(temp_dir)
+            if temp_dir and os.path.exists(temp_dir) and 'temp_' in temp_dir:
+                shutil.rmtree(temp_dir)
         except Exception as e:
             print(f"Error cleaning up temporary directory: {e}")
 
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
+        set_status(status="error", error=str(e))
         print(f"Error in multiple files processing: {e}")
 
 def update_status(status_info):
@@ -452,8 +895,85 @@ def update_status(status_info):
     global processing_status
 
     if status_info and isinstance(status_info, dict):
-        for key, value in status_info.items():
-            processing_status[key] = value
+        set_status(**status_info)
+
+# Debounced save of the backend tables: a burst of ingests triggers a single
+# save SAVE_DEBOUNCE_SECONDS after the last one finishes. The timer thread is
+# not a daemon, so a pending save still runs before the process exits.
+SAVE_DEBOUNCE_SECONDS = 5.0
+_save_lock = threading.Lock()
+_save_timer = None
+
+def _do_save():
+    try:
+        # Only scheduled after new entries were loaded, so the save is forced (an
+        # unforced save is skipped once MongoDB holds any data); the repository
+        # file's metadata is recorded after the tables so a restart doesn't reload it
+        knowledge_system.persist_new_entries(
+            app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"))
+        print("Backend tables saved.")
+    except Exception as e:
+        print(f"Error saving backend tables: {e}")
+
+def _schedule_save():
+    """(Re)start the debounce timer for saving the backend tables"""
+    global _save_timer
+    with _save_lock:
+        if _save_timer is not None:
+            _save_timer.cancel()
+        _save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, _do_save)
+        _save_timer.start()
+
+def _finalize_ingest(output_file_path):
+    """Turn collected text into repository entries, load them and schedule a save"""
+    # Define output file path for knowledge system
+    knowledge_output_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
+
+    # Process the collected content; the new entries are appended to the repository
+    generated = process_file(output_file_path, knowledge_output_path)
+
+    # Load the generated corpus into the knowledge system
+    set_status(status="loading_knowledge", progress=90)
+    if app_config.get("persist_intermediate", False):
+        # Debug path: reload through the repository file (load_data saves to MongoDB itself)
+        knowledge_system.load_data(local=True, file_path=knowledge_output_path, append=True, save_to_db=True)
+    else:
+        # Load just the new entries from memory instead of re-reading the repository;
+        # load_text doesn't save, so the debounced (forced) save persists them
+        knowledge_system.load_text(generated, append=True)
+        _schedule_save()
+
+def _disk_fileno(stream):
+    """File descriptor of an upload stream that is a real file, else None
+
+    Spooled and in-memory streams (SpooledTemporaryFile, BytesIO) return None:
+    fileno() would force a spool to disk, so they are copied instead.
+    """
+    if isinstance(stream, (tempfile.SpooledTemporaryFile, io.BytesIO)):
+        return None
+    try:
+        return stream.fileno()
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def save_upload(file, dest_path):
+    """Save an uploaded FileStorage, copying in-kernel with sendfile when it is disk-backed"""
+    src = file.stream
+    src_fd = _disk_fileno(src)
+    if src_fd is None:
+        # Spooled and in-memory uploads are copied out by FileStorage.save
+        file.save(dest_path)
+        return
+
+    src.seek(0)  # Also flushes any buffered writes to the file
+    size = os.fstat(src_fd).st_size
+    with open(dest_path, 'wb') as out:
+        offset = 0
+        while offset < size:
+            n = os.sendfile(out.fileno(), src_fd, offset, size - offset)
+            if n == 0:
+                break
+            offset += n
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
@@ -462,49 +982,44 @@ def upload_file():
 
     # Check if the post request has the file part
     if 'file' not in request.files:
-        return jsonify({"error": "No file part in the request"}), 400
+        return jsonify_fast({"error": "No file part in the request"}), 400
 
     file = request.files['file']
 
     # If user does not select file, browser might send empty file without filename
     if file.filename == '':
-        return jsonify({"error": "No file selected"}), 400
+        return jsonify_fast({"error": "No file selected"}), 400
 
     if file:
         try:
             # Reset processing status
             reset_processing_status()
-            processing_status["status"] = "starting"
+            set_status(status="starting")
 
             # Create uploads directory if it doesn't exist
             os.makedirs('uploads', exist_ok=True)
 
             # Save the file
             input_file_path = os.path.join('uploads', file.filename)
-            file.save(input_file_path)
+            save_upload(file, input_file_path)
 
             # Define output file path - use the configured repository file if available
             output_file_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
 
             # Start processing in a separate thread to not block the response
-            processing_thread = threading.Thread(
-                target=process_file_async,
-                args=(input_file_path, output_file_path)
-            )
-            processing_thread.start()
+            dispatch_background(process_file_async, input_file_path, output_file_path)
 
-            return jsonify({
+            return jsonify_fast({
                 "message": "File uploaded and processing started.",
                 "status": "processing"
             })
 
         except Exception as e:
             reset_processing_status()
-            processing_status["status"] = "error"
-            processing_status["error"] = str(e)
-            return jsonify({"error": f"Error processing file: {str(e)}"}), 500
+            set_status(status="error", error=str(e))
+            return jsonify_fast({"error": f"Error processing file: {str(e)}"}), 500
 
-    return jsonify({"error": "Unknown error occurred"}), 500
+    return jsonify_fast({"error": "Unknown error occurred"}), 500
 
 @app.route('/upload-multiple', methods=['POST'])
 def upload_multiple_files():
@@ -513,20 +1028,18 @@ def upload_multiple_files():
 
     # Check if the post request has the files part
     if 'files' not in request.files:
-        return jsonify({"error": "No files part in the request"}), 400
+        return jsonify_fast({"error": "No files part in the request"}), 400
 
     files = request.files.getlist('files')
 
     # Check if any files were selected
     if not files or files[0].filename == '':
-        return jsonify({"error": "No files selected"}), 400
+        return jsonify_fast({"error": "No files selected"}), 400
 
     try:
         # Reset processing status
         reset_processing_status()
-        processing_status["status"] = "starting"
-        processing_status["total_files"] = len(files)
-        processing_status["processed_files"] = 0
+        set_status(status="starting", total_files=len(files), processed_files=0)
 
         # Create uploads directory if it doesn't exist
         os.makedirs('uploads', exist_ok=True)
@@ -540,29 +1053,24 @@ def upload_multiple_files():
         for file in files:
             if file and file.filename:
                 file_path = os.path.join(temp_dir, file.filename)
-                file.save(file_path)
+                save_upload(file, file_path)
                 file_paths.append(file_path)
 
         # Define output file path - use the configured repository file if available
         output_file_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
 
         # Start processing in a separate thread to not block the response
-        processing_thread = threading.Thread(
-            target=process_multiple_files_async,
-            args=(file_paths, output_file_path)
-        )
-        processing_thread.start()
+        dispatch_background(process_multiple_files_async, file_paths, output_file_path)
 
-        return jsonify({
+        return jsonify_fast({
             "message": f"{len(files)} files uploaded and processing started.",
             "status": "processing"
         })
 
     except Exception as e:
         reset_processing_status()
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
-        return jsonify({"error": f"Error processing files: {str(e)}"}), 500
+        set_status(status="error", error=str(e))
+        return jsonify_fast({"error": f"Error processing files: {str(e)}"}), 500
 
 @app.route('/start-crawl', methods=['POST'])
 def start_crawl():
@@ -573,24 +1081,22 @@ def start_crawl():
         data = request.get_json()
         url = data.get('url')
         if not url:
-            return jsonify({"error": "URL is required"}), 400
+            return jsonify_fast({"error": "URL is required"}), 400
 
         # Reset processing status
         reset_processing_status()
-        processing_status["status"] = "starting_crawl"
-        processing_status["progress"] = 5
+        set_status(status="starting_crawl", progress=5)
 
         # Start crawling in a separate thread
-        threading.Thread(
-            target=crawl_website,
-            args=(url,)
-        ).start()
+        dispatch_background(crawl_website, url)
 
-        return jsonify({"message": "Crawling started"})
+        return jsonify_fast({"message": "Crawling started"})
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
-        return jsonify({"error": str(e)}), 500
+        set_status(status="error", error=str(e))
+        return jsonify_fast({"error": str(e)}), 500
+
+# Characters replaced with '_' when turning a crawled URL into a file name
+_URL_SANITIZE = str.maketrans({'/': '_', '?': '_', '&': '_', ':': '_'})
 
 def crawl_website(url):
     """Crawl website and process the content"""
@@ -603,32 +1109,33 @@ def crawl_website(url):
         import crawling
 
         # Update status
-        processing_status["status"] = "crawling"
-        processing_status["progress"] = 20
+        set_status(status="crawling", progress=20)
 
         # Get content from crawling.py (which now uses crawling2.py)
         content = crawling.crawl(url)
 
         # Create a safe filename from the URL for the raw content
-        safe_url = url.replace('://', '_').replace('/', '_').replace('?', '_').replace('&', '_')
+        safe_url = url.translate(_URL_SANITIZE)
         raw_content_file = os.path.join('uploads', f"crawled_{safe_url[:50]}.txt")
 
-        # Save raw crawled content to the URL-specific file with proper encoding
-        with open(raw_content_file, 'w', encoding='utf-8') as f:
+        # Save raw crawled content to the URL-specific file with proper encoding.
+        # Write to a sibling temp file and rename it into place so readers never
+        # see a half-written file.
+        temp_content_file = raw_content_file + '.part'
+        with open(temp_content_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
             f.write(content)
+        os.replace(temp_content_file, raw_content_file)
 
         print(f"Raw crawled content saved to: {raw_content_file}")
 
         # Check if we got meaningful content
         if content.startswith("No content was retrieved from"):
-            processing_status["status"] = "error"
-            processing_status["error"] = content
+            set_status(status="error", error=content)
             print(f"Crawling error: {content}")
             return  # Exit the function early
 
         # Update status
-        processing_status["status"] = "processing_content"
-        processing_status["progress"] = 40
+        set_status(status="processing_content", progress=40)
 
         # Define output file path - use the configured repository file if available
         output_file_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
@@ -637,22 +1144,35 @@ def crawl_website(url):
         process_file(raw_content_file, output_file_path)
 
         # Load the generated corpus into the knowledge system
-        processing_status["status"] = "loading_knowledge"
-        processing_status["progress"] = 90
+        set_status(status="loading_knowledge", progress=90)
 
         # Update existing knowledge system - let the system handle checking for new data
         knowledge_system.load_data(local=True, file_path=output_file_path, append=True, save_to_db=True)
 
-        processing_status["status"] = "complete"
-        processing_status["progress"] = 100
+        set_status(status="complete", progress=100)
 
         print(f"Web crawling complete. Knowledge system updated and saved.")
 
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
+        set_status(status="error", error=str(e))
         print(f"Error in web crawling: {e}")
 
+def _atomic_write(path, data_bytes):
+    """Write bytes to path atomically with owner-only (0o600) permissions"""
+    # A unique temp file per call (mkstemp creates it 0o600), so concurrent writers
+    # never share one
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data_bytes)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
 # New Google Drive integration endpoints
 @app.route('/save-credentials', methods=['POST'])
 def save_credentials():
@@ -663,7 +1183,7 @@ def save_credentials():
         credentials = data.get('credentials')
 
         if not credential_type or not credentials:
-            return jsonify({"error": "Missing credential type or credentials"}), 400
+            return jsonify_fast({"error": "Missing credential type or credentials"}), 400
 
         # Create credentials directory if it doesn't exist
         os.makedirs('user_credentials', exist_ok=True)
@@ -671,8 +1191,7 @@ def save_credentials():
         # Save credentials based on type
         if credential_type == 'google':
             # Save Google Drive credentials
-            with open('user_credentials/google_credentials.json', 'w') as f:
-                json.dump(credentials, f, indent=2)
+            _atomic_write('user_credentials/google_credentials.json', json.dumps(credentials, indent=2).encode())
 
             # For immediate use, update the service account file path
             global SERVICE_ACCOUNT_FILE
@@ -680,11 +1199,13 @@ def save_credentials():
 
         elif credential_type == 'aws':
             # Save AWS S3 credentials to .env file
-            with open('user_credentials/aws_credentials.env', 'w') as f:
-                f.write(f"AWS_ACCESS_KEY_ID={credentials.get('awsAccessKey', '')}\n")
-                f.write(f"AWS_SECRET_ACCESS_KEY={credentials.get('awsSecretKey', '')}\n")
-                f.write(f"AWS_DEFAULT_REGION={credentials.get('awsRegion', 'us-east-1')}\n")
-                f.write(f"S3_BUCKET_NAME={credentials.get('awsBucket', '')}\n")
+            aws_env = (
+                f"AWS_ACCESS_KEY_ID={credentials.get('awsAccessKey', '')}\n"
+                f"AWS_SECRET_ACCESS_KEY={credentials.get('awsSecretKey', '')}\n"
+                f"AWS_DEFAULT_REGION={credentials.get('awsRegion', 'us-east-1')}\n"
+                f"S3_BUCKET_NAME={credentials.get('awsBucket', '')}\n"
+            )
+            _atomic_write('user_credentials/aws_credentials.env', aws_env.encode())
 
             # For immediate use, update the AWS credentials file path
             global AWS_CREDENTIALS_FILE
@@ -692,8 +1213,7 @@ def save_credentials():
 
         elif credential_type == 'slack':
             # Save Slack credentials to .env file
-            with open('user_credentials/slack_credentials.env', 'w') as f:
-                f.write(f"SLACK_BOT_TOKEN={credentials.get('slackBotToken', '')}\n")
+            _atomic_write('user_credentials/slack_credentials.env', f"SLACK_BOT_TOKEN={credentials.get('slackBotToken', '')}\n".encode())
 
             # For immediate use, update the Slack credentials file path
             global SLACK_CREDENTIALS_FILE
@@ -701,27 +1221,25 @@ def save_credentials():
 
         elif credential_type == 'api':
             # Save API credentials
-            with open('user_credentials/api_credentials.json', 'w') as f:
-                json.dump(credentials, f, indent=2)
+            _atomic_write('user_credentials/api_credentials.json', json.dumps(credentials, indent=2).encode())
 
         elif credential_type == 'db':
             # Save database credentials
-            with open('user_credentials/db_credentials.json', 'w') as f:
-                json.dump(credentials, f, indent=2)
+            _atomic_write('user_credentials/db_credentials.json', json.dumps(credentials, indent=2).encode())
 
         else:
-            return jsonify({"error": f"Unknown credential type: {credential_type}"}), 400
+            return jsonify_fast({"error": f"Unknown credential type: {credential_type}"}), 400
 
-        return jsonify({"message": f"{credential_type.capitalize()} credentials saved successfully"})
+        return jsonify_fast({"message": f"{credential_type.capitalize()} credentials saved successfully"})
 
     except Exception as e:
         print(f"Error saving credentials: {e}")
-        return jsonify({"error": str(e)}), 500
+        return jsonify_fast({"error": str(e)}), 500
 
 @app.route('/get-drive-file-types', methods=['GET'])
 def get_drive_file_types():
     """Return available file types for Google Drive fetching"""
-    return jsonify(list(MIME_TYPES.keys()))
+    return _json_response(_DRIVE_FILE_TYPES_JSON)
 
 @app.route('/get-drive-user-info', methods=['GET'])
 def get_drive_user_info():
@@ -730,15 +1248,14 @@ def get_drive_user_info():
     user_id = get_user_session_id()
 
     # Check if we have a token for this user
-    if user_id not in oauth_tokens:
-        return jsonify({"error": "Not authorized. Please connect to Google Drive first."}), 401
+    token_info = get_token(user_id)
+    if token_info is None:
+        return _json_response(_NOT_AUTHORIZED_JSON, 401)
 
-    # Get the token and user info
-    token_info = oauth_tokens[user_id]
     user_info = token_info.get('user_info', {})
 
     # Return user info
-    return jsonify({
+    return jsonify_fast({
         "isConnected": True,
         "email": user_info.get('email', 'Unknown'),
         "name": user_info.get('name', 'Unknown'),
@@ -752,15 +1269,14 @@ def get_drive_files():
     user_id = get_user_session_id()
 
     # Check if we have a token for this user
-    if user_id not in oauth_tokens:
-        return jsonify({"error": "Not authorized. Please connect to Google Drive first."}), 401
+    if get_token(user_id) is None:
+        return _json_response(_NOT_AUTHORIZED_JSON, 401)
 
-    # Get the token
-    token_info = oauth_tokens[user_id]
-    access_token = token_info.get('access_token')
+    # Refreshes the access token first if it has expired
+    access_token = get_valid_access_token(user_id)
 
     if not access_token:
-        return jsonify({"error": "Invalid token. Please reconnect to Google Drive."}), 401
+        return _json_response(_INVALID_TOKEN_JSON, 401)
 
     # Get the file type filter, folder ID, and global search flag from the query parameters
     file_type = request.args.get('type', 'all')
@@ -770,10 +1286,10 @@ def get_drive_files():
     try:
         # Use the Gdrive module to list files
         result = Gdrive.list_files(access_token, file_type, folder_id, global_search)
-        return jsonify(result)
+        return jsonify_fast(result)
     except Exception as e:
         print(f"Error listing Drive files: {e}")
-        return jsonify({"error": str(e)}), 500
+        return jsonify_fast({"error": str(e)}), 500
 
 @app.route('/fetch-from-drive', methods=['POST'])
 def fetch_from_drive():
@@ -784,39 +1300,32 @@ def fetch_from_drive():
 
     try:
         # Check if we have a token for this user
-        if user_id not in oauth_tokens:
-            return jsonify({"error": "Not authorized. Please connect to Google Drive first."}), 401
+        if get_token(user_id) is None:
+            return _json_response(_NOT_AUTHORIZED_JSON, 401)
 
-        # Get the token
-        token_info = oauth_tokens[user_id]
-        access_token = token_info.get('access_token')
+        # Refreshes the access token first if it has expired
+        access_token = get_valid_access_token(user_id)
 
         if not access_token:
-            return jsonify({"error": "Invalid token. Please reconnect to Google Drive."}), 401
+            return _json_response(_INVALID_TOKEN_JSON, 401)
 
         data = request.get_json()
         selected_files = data.get('selectedFiles', [])
 
         if not selected_files:
-            return jsonify({"error": "No files selected. Please select files to process."}), 400
+            return jsonify_fast({"error": "No files selected. Please select files to process."}), 400
 
         # Reset processing status
         reset_processing_status()
-        processing_status["status"] = "starting_drive_fetch"
-        processing_status["progress"] = 5
-        processing_status["total_files"] = len(selected_files)
+        set_status(status="starting_drive_fetch", progress=5, total_files=len(selected_files))
 
         # Start drive fetching in a separate thread
-        threading.Thread(
-            target=process_drive_files,
-            args=(selected_files, access_token)
-        ).start()
+        dispatch_background(process_drive_files, selected_files, access_token)
 
-        return jsonify({"message": "Google Drive fetch started", "fileCount": len(selected_files)})
+        return jsonify_fast({"message": "Google Drive fetch started", "fileCount": len(selected_files)})
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
-        return jsonify({"error": str(e)}), 500
+        set_status(status="error", error=str(e))
+        return jsonify_fast({"error": str(e)}), 500
 
 @app.route('/fetch-from-s3', methods=['POST'])
 def fetch_from_s3():
@@ -824,33 +1333,22 @@ def fetch_from_s3():
     global processing_status
 
     try:
-        data = request.get_json()
-        file_types = data.get('fileTypes', [])
-
-        if not file_types or not isinstance(file_types, list):
-            return jsonify({"error": "File types must be provided as a list"}), 400
-
-        # Validate file types
-        for ft in file_types:
-            if ft not in MIME_TYPES:
-                return jsonify({"error": f"Unsupported file type: {ft}"}), 400
+        try:
+            req = FileTypesReq.from_json(request.get_json(silent=True) or {})
+        except BadRequest as e:
+            return jsonify_fast({"error": e.description}), 400
 
         # Reset processing status
         reset_processing_status()
-        processing_status["status"] = "starting_s3_fetch"
-        processing_status["progress"] = 5
+        set_status(status="starting_s3_fetch", progress=5)
 
         # Start S3 fetching in a separate thread
-        threading.Thread(
-            target=fetch_s3_files_async,
-            args=(file_types,)
-        ).start()
+        dispatch_background(fetch_s3_files_async, req.file_types)
 
-        return jsonify({"message": "AWS S3 fetch started"})
+        return jsonify_fast({"message": "AWS S3 fetch started"})
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
-        return jsonify({"error": str(e)}), 500
+        set_status(status="error", error=str(e))
+        return jsonify_fast({"error": str(e)}), 500
 
 @app.route('/fetch-from-slack', methods=['POST'])
 def fetch_from_slack():
@@ -867,45 +1365,22 @@ def fetch_from_slack():
     global processing_status
 
     try:
-        data = request.get_json()
-        sources = data.get('sources', [])
-        data_types = data.get('dataTypes', [])
-        slack_token = data.get('slackBotToken')  # Optional bot token
-
-        if not sources or not isinstance(sources, list):
-            return jsonify({"error": "Sources must be provided as a list"}), 400
-
-        if not data_types or not isinstance(data_types, list):
-            return jsonify({"error": "Data types must be provided as a list"}), 400
-
-        # Validate sources
-        valid_sources = ['public', 'private', 'dm']
-        for source in sources:
-            if source not in valid_sources:
-                return jsonify({"error": f"Unsupported source: {source}"}), 400
-
-        # Validate data types
-        valid_data_types = ['messages', 'files']
-        for data_type in data_types:
-            if data_type not in valid_data_types:
-                return jsonify({"error": f"Unsupported data type: {data_type}"}), 400
+        try:
+            req = SlackReq.from_json(request.get_json(silent=True) or {})
+        except BadRequest as e:
+            return jsonify_fast({"error": e.description}), 400
 
         # Reset processing status
         reset_processing_status()
-        processing_status["status"] = "starting_slack_fetch"
-        processing_status["progress"] = 5
+        set_status(status="starting_slack_fetch", progress=5)
 
         # Start Slack fetching in a separate thread
-        threading.Thread(
-            target=fetch_slack_data_async,
-            args=(sources, data_types, slack_token)
-        ).start()
+        dispatch_background(fetch_slack_data_async, req.sources, req.data_types, req.slack_token)
 
-        return jsonify({"message": "Slack fetch started"})
+        return jsonify_fast({"message": "Slack fetch started"})
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
-        return jsonify({"error": str(e)}), 500
+        set_status(status="error", error=str(e))
+        return jsonify_fast({"error": str(e)}), 500
 
 def fetch_slack_data_async(sources, data_types, provided_token=None):
     """
@@ -920,8 +1395,7 @@ def fetch_slack_data_async(sources, data_types, provided_token=None):
     global knowledge_system
 
     try:
-        processing_status["status"] = "initializing_slack_api"
-        processing_status["progress"] = 10
+        set_status(status="initializing_slack_api", progress=10)
 
         # Create uploads directory if it doesn't exist
         os.makedirs('uploads', exist_ok=True)
@@ -943,142 +1417,171 @@ def fetch_slack_data_async(sources, data_types, provided_token=None):
                 # Use user-provided credentials
                 credential_file = user_credentials_path
                 # Load the Slack token from the credentials file
-                from dotenv import load_dotenv
-                load_dotenv(credential_file)
-                slack_token = os.getenv("SLACK_BOT_TOKEN")
+                slack_token = load_creds(credential_file).get("SLACK_BOT_TOKEN")
                 print("Using Slack token from user credentials")
             else:
                 # 3. Fall back to default credentials
                 credential_file = SLACK_CREDENTIALS_FILE
                 # Load the Slack token from the credentials file
-                from dotenv import load_dotenv
-                load_dotenv(credential_file)
-                slack_token = os.getenv("SLACK_BOT_TOKEN")
+                slack_token = load_creds(credential_file).get("SLACK_BOT_TOKEN")
                 print("Using Slack token from default credentials")
 
         if not slack_token:
-            processing_status["status"] = "error"
-            processing_status["error"] = "Missing Slack Bot Token. Please provide a token in the API call or save it in credentials."
+            set_status(
+                status="error",
+                error="Missing Slack Bot Token. Please provide a token in the API call or save it in credentials."
+            )
             return
 
-        # Convert sources and data_types lists to comma-separated strings
-        sources_str = ','.join(sources)
-        data_types_str = ','.join(data_types)
-
-        # Run the slack_integration.py script with the selected sources and data types
-        processing_status["status"] = "running_slack_integration"
-        processing_status["progress"] = 20
+        # Run the Slack integration with the selected sources and data types
+        set_status(status="running_slack_integration", progress=20)
 
         try:
-            # Create a temporary copy of slack_integration.py with the correct output path
-            with open('slack_integration.py', 'r') as f:
-                script_content = f.read()
-
-            # Replace the FETCHED_DATA_PATH with our repository path
-            repository_path = "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"
-            modified_script = script_content.replace(
-                'FETCHED_DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "augmentoolkit", "original", "saved_pages", "fetched_data.txt"))',
-                f'FETCHED_DATA_PATH = "{repository_path}"'
-            )
-
-            # Write the modified script to a temporary file
-            temp_script_path = 'temp_slack_integration.py'
-            with open(temp_script_path, 'w') as f:
-                f.write(modified_script)
-
-            # Set environment variables for the script
-            env = os.environ.copy()
-            env["SLACK_BOT_TOKEN"] = slack_token
-
-            # Run the modified script
-            cmd = [sys.executable, temp_script_path, sources_str, data_types_str]
-            process = subprocess.Popen(
-                cmd,
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-
-            stdout, stderr = process.communicate()
-
-            # Clean up the temporary script
-            if os.path.exists(temp_script_path):
-                os.remove(temp_script_path)
-
-            if process.returncode != 0:
-                processing_status["status"] = "error"
-                processing_status["error"] = f"Slack integration failed: {stderr}"
+            if slack_integration is None:
+                set_status(status="error", error="Slack integration not available. Install slack_sdk.")
                 return
 
-            # Extract the output file path from the script's output
-            output_path = None
-            for line in stdout.splitlines():
-                if line.startswith("[SLACK_FETCH_RESULT_PATH]"):
-                    output_path = line.split("[SLACK_FETCH_RESULT_PATH]")[1].strip()
-                    break
+            # Fetch in-process; the integration writes into the repository path directly
+            repository_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
+            try:
+                output_path = slack_integration.run(sources, data_types, slack_token, repository_path)
+            except Exception as slack_error:
+                set_status(status="error", error=f"Slack integration failed: {slack_error}")
+                return
 
             if not output_path or not os.path.exists(output_path):
-                processing_status["status"] = "error"
-                processing_status["error"] = "Failed to get output from Slack integration"
+                set_status(status="error", error="Failed to get output from Slack integration")
                 return
 
-            # Copy the content to our output file
-            with open(output_path, 'r', encoding='utf-8') as src:
-                with open(output_file_path, 'w', encoding='utf-8') as dest:
-                    dest.write(src.read())
+            # Copy the content to our output file (in-kernel via sendfile on Linux)
+            shutil.copyfile(output_path, output_file_path)
 
-            processing_status["status"] = "slack_data_fetched"
-            processing_status["progress"] = 70
+            set_status(status="slack_data_fetched", progress=70)
 
         except Exception as script_error:
-            processing_status["status"] = "error"
-            processing_status["error"] = f"Error running Slack integration: {str(script_error)}"
+            set_status(status="error", error=f"Error running Slack integration: {str(script_error)}")
             return
 
         # Process the collected texts
         if os.path.exists(output_file_path) and os.path.getsize(output_file_path) > 0:
-            processing_status["status"] = "processing_slack_content"
-            processing_status["progress"] = 75
-
-            # Define output file path for knowledge system
-            knowledge_output_path = "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"
-
-            # Process the Slack content
-            process_file(output_file_path, knowledge_output_path)
-
-            # Load the generated corpus into the knowledge system
-            processing_status["status"] = "loading_knowledge"
-            processing_status["progress"] = 90
+            set_status(status="processing_slack_content", progress=75)
 
-            # Update existing knowledge system
-            knowledge_system.load_data(local=True, file_path=knowledge_output_path, append=True)
+            # Generate the corpus, load it and schedule a backend-table save
+            _finalize_ingest(output_file_path)
 
-            # Save the updated backend tables
-            knowledge_system.save_backend_tables()
+            set_status(status="complete", progress=100)
 
-            processing_status["status"] = "complete"
-            processing_status["progress"] = 100
-
-            print(f"Slack data processing complete. Knowledge system updated and saved.")
+            print(f"Slack data processing complete. Knowledge system updated.")
         else:
-            processing_status["status"] = "error"
-            processing_status["error"] = "No content was retrieved from Slack"
+            set_status(status="error", error="No content was retrieved from Slack")
             print("No content was retrieved from Slack")
 
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
+        set_status(status="error", error=str(e))
         print(f"Error in Slack data processing: {e}")
 
+# Shared pool for per-object S3 downloads; the boto3 client is thread-safe for reads
+S3_DOWNLOAD_WORKERS = app_config.get("s3_download_workers", 8)
+DOWNLOAD_POOL = ThreadPoolExecutor(max_workers=S3_DOWNLOAD_WORKERS, thread_name_prefix="s3-download")
+atexit.register(DOWNLOAD_POOL.shutdown, wait=False)
+
+# One S3 client per credential set, reused across fetches so TLS connections stay pooled
+_s3_client_cache = {}
+_s3_client_lock = threading.Lock()
+
+def get_s3_client(aws_access_key, aws_secret_key, aws_region):
+    """Return a cached boto3 S3 client for the given credentials and region"""
+    cache_key = (aws_access_key, aws_secret_key, aws_region)
+    client = _s3_client_cache.get(cache_key)
+    if client is not None:
+        return client
+
+    with _s3_client_lock:
+        client = _s3_client_cache.get(cache_key)
+        if client is None:
+            client = boto3.client(
+                's3',
+                aws_access_key_id=aws_access_key,
+                aws_secret_access_key=aws_secret_key,
+                region_name=aws_region,
+                config=Config(
+                    max_pool_connections=S3_DOWNLOAD_WORKERS,
+                    retries={'max_attempts': 5, 'mode': 'adaptive'},
+                    tcp_keepalive=True
+                )
+            )
+            _s3_client_cache[cache_key] = client
+    return client
+
+def _pool_context():
+    """forkserver (else spawn) context for process pools
+
+    This process already runs threads (the background load, the thread pools,
+    pymongo's monitors), so forking it directly could leave a child holding a
+    lock that is never released.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+# PDF/DOCX parsing is pure-Python CPU work that holds the GIL, so it runs in worker
+# processes. The extractors live in their own side-effect-free module.
+PDF_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_pool_context())
+atexit.register(PDF_POOL.shutdown, wait=False)
+
+def download_s3_object(s3, bucket_name, key, ft):
+    """Download one S3 object
+
+    Returns ('text', str) for txt objects, decoded while streaming, or
+    ('path', temp_path) for pdf/docx objects, ready for extraction.
+    """
+    # Stream the body instead of reading the whole object into memory
+    with s3.get_object(Bucket=bucket_name, Key=key)['Body'] as stream:
+        # Process based on file type
+        if ft == 'txt':
+            out = io.StringIO()
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            for chunk in iter(lambda: stream.read(65536), b''):
+                out.write(decoder.decode(chunk))
+            out.write(decoder.decode(b'', final=True))
+            return 'text', out.getvalue()
+
+        if ft not in ('pdf', 'docx'):
+            return 'text', ""
+
+        # Save to a per-download temporary file that the extraction process can open
+        temp = tempfile.NamedTemporaryFile(suffix='.' + ft, delete=False)
+        try:
+            with temp:
+                shutil.copyfileobj(stream, temp, length=1024 * 1024)
+        except Exception:
+            # Don't leave a partial download behind
+            os.unlink(temp.name)
+            raise
+        return 'path', temp.name
+
+def _discard_download(future):
+    """Done-callback for downloads that will never be extracted: remove their temp file"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    kind, value = future.result()
+    if kind == 'path':
+        try:
+            os.remove(value)
+        except OSError:
+            pass
+
 def fetch_s3_files_async(file_types):
     """Process AWS S3 files in a separate thread"""
     global processing_status
     global knowledge_system
 
     try:
-        processing_status["status"] = "initializing_s3_api"
-        processing_status["progress"] = 10
+        if boto3 is None:
+            set_status(status="error", error="AWS S3 integration not available. Install boto3.")
+            return
+
+        set_status(status="initializing_s3_api", progress=10)
 
         # Create uploads directory if it doesn't exist
         os.makedirs('uploads', exist_ok=True)
@@ -1095,167 +1598,142 @@ def fetch_s3_files_async(file_types):
             # Fall back to default credentials
             credential_file = AWS_CREDENTIALS_FILE
 
-        # Load environment variables from the credentials file
-        from dotenv import load_dotenv
-        load_dotenv(credential_file)
-
-        # Get AWS credentials from environment variables
-        aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-        aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-        aws_region = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
-        bucket_name = os.getenv("S3_BUCKET_NAME")
+        # Get AWS credentials from the credentials file
+        creds = load_creds(credential_file)
+        aws_access_key = creds.get("AWS_ACCESS_KEY_ID")
+        aws_secret_key = creds.get("AWS_SECRET_ACCESS_KEY")
+        aws_region = creds.get("AWS_DEFAULT_REGION") or "us-east-1"
+        bucket_name = creds.get("S3_BUCKET_NAME")
 
         if not aws_access_key or not aws_secret_key or not bucket_name:
-            processing_status["status"] = "error"
-            processing_status["error"] = "Missing AWS credentials or bucket name"
+            set_status(status="error", error="Missing AWS credentials or bucket name")
             return
 
         # Initialize AWS S3 client
         try:
-            import boto3
-            s3 = boto3.client(
-                's3',
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key,
-                region_name=aws_region
-            )
+            s3 = get_s3_client(aws_access_key, aws_secret_key, aws_region)
 
-            # Delete previous output if any
-            if os.path.exists(output_file_path):
-                os.remove(output_file_path)
-
-            processing_status["status"] = "listing_s3_objects"
-            processing_status["progress"] = 20
+            set_status(status="listing_s3_objects", progress=20)
 
             total_files_processed = 0
-            total_files_found = 0
-
-            # Process each selected type
-            for file_type_index, ft in enumerate(file_types):
-                processing_status["status"] = f"searching_{ft}_files"
-
-                # List files in the S3 bucket
-                paginator = s3.get_paginator('list_objects_v2')
-
-                files = []
-                for page in paginator.paginate(Bucket=bucket_name):
-                    for obj in page.get('Contents', []):
-                        key = obj['Key']
-                        ext = os.path.splitext(key)[1]
-
-                        if ext.lstrip('.') == ft:  # Match the selected file types
-                            files.append({
-                                'key': key,
-                                'size': obj['Size']
-                            })
-
-                total_files_found += len(files)
-                print(f"[INFO] Found {len(files)} {ft} files in S3 bucket")
 
-                # Update status with file count
-                processing_status["status"] = f"found_{len(files)}_{ft}_files"
-                current_progress = 20 + (file_type_index * 5)
-                processing_status["progress"] = min(current_progress, 30)
-
-                processing_status["status"] = f"downloading_{ft}_files"
-
-                # Process files of this type
-                for file in files:
-                    key = file['key']
-                    file_name = os.path.basename(key)
+            # List the bucket once and group keys by the selected file types
+            paginator = s3.get_paginator('list_objects_v2')
+            paginate_args = {'Bucket': bucket_name, 'PaginationConfig': {'PageSize': 1000}}
+            s3_prefix = app_config.get("s3_prefix")
+            if s3_prefix:
+                paginate_args['Prefix'] = s3_prefix
+
+            wanted_types = set(file_types)
+            files_by_ext = collections.defaultdict(list)
+            for page in paginator.paginate(**paginate_args):
+                for obj in page.get('Contents', []):
+                    key = obj['Key']
+                    ext = os.path.splitext(key)[1].lstrip('.')
+
+                    if ext in wanted_types:  # Match the selected file types
+                        files_by_ext[ext].append({
+                            'key': key,
+                            'size': obj['Size']
+                        })
+
+            total_files_found = sum(len(files) for files in files_by_ext.values())
+            last_progress_int = None
+
+            def write_result(out, file_name, extracted_text):
+                """Append one file's text to the output and update progress"""
+                nonlocal total_files_processed, last_progress_int
+
+                # Save content to the output file
+                out.write(f"\n\n--- {file_name} ---\n\n")
+                out.write(extracted_text)
+
+                # Only write the status when the integer progress moves; the current
+                # file is reported along with it rather than once per file
+                total_files_processed += 1
+                progress_int = min(int(30 + (total_files_processed / total_files_found * 40)), 70)
+                if progress_int != last_progress_int:
+                    last_progress_int = progress_int
+                    set_status(current_file=file_name, progress=progress_int)
+
+            # Open the output once for the whole fetch (truncating any previous output)
+            with open(output_file_path, 'w', encoding='utf-8', buffering=1024 * 1024) as out:
+                # Process each selected type
+                for file_type_index, ft in enumerate(file_types):
+                    files = files_by_ext.get(ft, [])
+                    print(f"[INFO] Found {len(files)} {ft} files in S3 bucket")
+
+                    # Update status with file count
+                    set_status(status=f"found_{len(files)}_{ft}_files")
+                    current_progress = 20 + (file_type_index * 5)
+                    set_status(progress=min(current_progress, 30))
+
+                    set_status(status=f"downloading_{ft}_files")
+
+                    # Download on the thread pool and hand pdf/docx files to the process pool
+                    # as each download finishes, so network I/O and parsing overlap.
+                    # Results are written from this thread only, so the output needs no lock.
+                    download_futures = {
+                        DOWNLOAD_POOL.submit(download_s3_object, s3, bucket_name, file['key'], ft): file['key']
+                        for file in files
+                    }
+                    extractor = extract_pdf_text if ft == 'pdf' else extract_docx_text
+                    extract_futures = {}
 
                     try:
-                        # Download file content
-                        processing_status["current_file"] = file_name
-
-                        # Get the object from S3
-                        file_obj = s3.get_object(Bucket=bucket_name, Key=key)
-                        body = file_obj['Body'].read()
-                        fh = io.BytesIO(body)
-
-                        # Save content to the output file
-                        with open(output_file_path, 'a', encoding='utf-8') as out:
-                            out.write(f"\n\n--- {file_name} ---\n\n")
-
-                            # Process based on file type
-                            if ft == 'txt':
-                                content = fh.read().decode('utf-8')
-                                out.write(content)
-
-                            elif ft == 'pdf':
-                                # Import here to avoid potential import issues
-                                from PyPDF2 import PdfReader
-                                reader = PdfReader(fh)
-                                for page in reader.pages:
-                                    # Extract text
-                                    extracted_text = page.extract_text() or ""
-                                    out.write(extracted_text)
-
-                            elif ft == 'docx':
-                                # Import here to avoid potential import issues
-                                from docx import Document
-                                # Save as temporary file
-                                temp_file = "temp.docx"
-                                with open(temp_file, "wb") as temp:
-                                    temp.write(fh.read())
-
-                                # Process docx
-                                doc = Document(temp_file)
-                                for para in doc.paragraphs:
-                                    out.write(para.text + '\n')
-
-                                # Remove temporary file
-                                if os.path.exists(temp_file):
-                                    os.remove(temp_file)
-
-                        # Update progress
-                        total_files_processed += 1
-                        if total_files_found > 0:
-                            current_progress = 30 + (total_files_processed / total_files_found * 40)
-                            processing_status["progress"] = min(int(current_progress), 70)
-
-                    except Exception as file_error:
-                        print(f"Error processing {file_name}: {file_error}")
-                        continue
+                        for future in as_completed(download_futures):
+                            file_name = os.path.basename(download_futures.pop(future))
+                            try:
+                                kind, value = future.result()
+                            except Exception as file_error:
+                                print(f"Error processing {file_name}: {file_error}")
+                                continue
+
+                            if kind == 'path':
+                                extract_futures[PDF_POOL.submit(extractor, value)] = (file_name, value)
+                            else:
+                                write_result(out, file_name, value)
+
+                        for future in as_completed(extract_futures):
+                            file_name, temp_path = extract_futures.pop(future)
+                            try:
+                                write_result(out, file_name, future.result())
+                            except Exception as file_error:
+                                print(f"Error processing {file_name}: {file_error}")
+                            finally:
+                                os.remove(temp_path)
+                    finally:
+                        # Only left over if the loops above exited early: drop their temp files
+                        for future in download_futures:
+                            if not future.cancel():
+                                future.add_done_callback(_discard_download)
+                        for future, (_, temp_path) in extract_futures.items():
+                            future.cancel()
+                            try:
+                                os.remove(temp_path)
+                            except OSError:
+                                pass
 
             # Process the collected texts using text.py
             if os.path.exists(output_file_path) and os.path.getsize(output_file_path) > 0:
-                processing_status["status"] = "processing_s3_content"
-                processing_status["progress"] = 75
-
-                # Define output file path for knowledge system
-                knowledge_output_path = "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"
-
-                # Process the S3 content
-                process_file(output_file_path, knowledge_output_path)
+                set_status(status="processing_s3_content", progress=75)
 
-                # Load the generated corpus into the knowledge system
-                processing_status["status"] = "loading_knowledge"
-                processing_status["progress"] = 90
+                # Generate the corpus, load it and schedule a backend-table save
+                _finalize_ingest(output_file_path)
 
-                # Update existing knowledge system
-                knowledge_system.load_data(local=True, file_path=knowledge_output_path, append=True)
+                set_status(status="complete", progress=100)
 
-                # Save the updated backend tables
-                knowledge_system.save_backend_tables()
-
-                processing_status["status"] = "complete"
-                processing_status["progress"] = 100
-
-                print(f"S3 file processing complete. Knowledge system updated and saved.")
+                print(f"S3 file processing complete. Knowledge system updated.")
             else:
-                processing_status["status"] = "error"
-                processing_status["error"] = "No content was retrieved from AWS S3"
+                set_status(status="error", error="No content was retrieved from AWS S3")
                 print("No content was retrieved from AWS S3")
 
         except Exception as s3_api_error:
             print(f"Error with AWS S3 API: {s3_api_error}")
-            processing_status["status"] = "error"
-            processing_status["error"] = f"Error with AWS S3 API: {str(s3_api_error)}"
+            set_status(status="error", error=f"Error with AWS S3 API: {str(s3_api_error)}")
 
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
+        set_status(status="error", error=str(e))
         print(f"Error in S3 file processing: {e}")
 
 def process_drive_files(selected_files, access_token):
@@ -1264,56 +1742,38 @@ def process_drive_files(selected_files, access_token):
     global knowledge_system
 
     try:
-        processing_status["status"] = "initializing_drive_api"
-        processing_status["progress"] = 10
+        set_status(status="initializing_drive_api", progress=10)
 
         # Create uploads directory if it doesn't exist
         os.makedirs('uploads', exist_ok=True)
 
-        processing_status["status"] = "fetching_from_drive"
-        processing_status["progress"] = 30
+        set_status(status="fetching_from_drive", progress=30)
 
         try:
             # Use the new Gdrive.py module to fetch data
-            output_file_path = Gdrive.fetch_data(selected_files, access_token)
+            output_file_path = Gdrive.fetch_data(
+                selected_files, access_token, max_workers=app_config.get("drive_workers", 8)
+            )
 
             if not output_file_path or not os.path.exists(output_file_path):
-                processing_status["status"] = "error"
-                processing_status["error"] = "No content was retrieved from Google Drive"
+                set_status(status="error", error="No content was retrieved from Google Drive")
                 return
 
-            processing_status["status"] = "processing_drive_content"
-            processing_status["progress"] = 75
-
-            # Define output file path for knowledge system
-            knowledge_output_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
+            set_status(status="processing_drive_content", progress=75)
 
-            # Process the drive content
-            process_file(output_file_path, knowledge_output_path)
+            # Generate the corpus, load it and schedule a backend-table save
+            _finalize_ingest(output_file_path)
 
-            # Load the generated corpus into the knowledge system
-            processing_status["status"] = "loading_knowledge"
-            processing_status["progress"] = 90
+            set_status(status="complete", progress=100)
 
-            # Update existing knowledge system
-            knowledge_system.load_data(local=True, file_path=knowledge_output_path, append=True)
-
-            # Save the updated backend tables
-            knowledge_system.save_backend_tables()
-
-            processing_status["status"] = "complete"
-            processing_status["progress"] = 100
-
-            print(f"Drive file processing complete. Knowledge system updated and saved.")
+            print(f"Drive file processing complete. Knowledge system updated.")
 
         except Exception as drive_error:
             print(f"Error with Google Drive API: {drive_error}")
-            processing_status["status"] = "error"
-            processing_status["error"] = f"Error with Google Drive API: {str(drive_error)}"
+            set_status(status="error", error=f"Error with Google Drive API: {str(drive_error)}")
 
     except Exception as e:
-        processing_status["status"] = "error"
-        processing_status["error"] = str(e)
+        set_status(status="error", error=str(e))
         print(f"Error in Drive file processing: {e}")
 
 @app.route('/api/streaming', methods=['POST'])
@@ -1344,38 +1804,17 @@ def streaming_api():
     global processing_status
 
     try:
-        # Get the request data
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-
-        # Validate required fields
-        required_fields = ["source", "uri"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-
-        # Extract data from the request
-        source = data.get("source").lower()
-        uri = data.get("uri")
-        trigger = data.get("trigger", "manual").lower()
-        event_id = data.get("eventId")
-        metadata = data.get("metadata", {})
-
-        # Validate source
-        valid_sources = ["url", "file", "gdrive", "s3", "slack"]
-        if source not in valid_sources:
-            return jsonify({"error": f"Invalid source. Must be one of: {', '.join(valid_sources)}"}), 400
+        # Validate the request before touching any shared state
+        try:
+            req = StreamingReq.from_json(request.get_json(silent=True))
+        except BadRequest as e:
+            return jsonify_fast({"error": e.description}), 400
 
-        # Reset processing status
-        reset_processing_status()
-        processing_status["status"] = f"starting_{source}_ingestion"
-        processing_status["progress"] = 5
-        processing_status["source"] = source
-        processing_status["trigger"] = trigger
-        if event_id:
-            processing_status["eventId"] = event_id
+        source = req.source
+        uri = req.uri
+        trigger = req.trigger
+        event_id = req.event_id
+        metadata = req.metadata
 
         # Prepare task data
         task_data = {
@@ -1391,25 +1830,34 @@ def streaming_api():
             user_id = get_user_session_id()
 
             # Check if we have a token for this user
-            if user_id not in oauth_tokens:
-                return jsonify({"error": "Not authorized. Please connect to Google Drive first."}), 401
+            if get_token(user_id) is None:
+                return _json_response(_NOT_AUTHORIZED_JSON, 401)
 
-            # Get the token
-            token_info = oauth_tokens[user_id]
-            access_token = token_info.get('access_token')
+            # Refreshes the access token first if it has expired
+            access_token = get_valid_access_token(user_id)
 
             if not access_token:
-                return jsonify({"error": "Invalid token. Please reconnect to Google Drive."}), 401
+                return _json_response(_INVALID_TOKEN_JSON, 401)
 
             # Add access token to task data
             task_data["access_token"] = access_token
 
+        # For file source, URI should be a path to a local file
+        if source == "file" and not message_broker and not os.path.exists(uri):
+            return jsonify_fast({"error": f"File not found: {uri}"}), 404
+
+        # Reset processing status
+        reset_processing_status()
+        set_status(status=f"starting_{source}_ingestion", progress=5, source=source, trigger=trigger)
+        if event_id:
+            set_status(eventId=event_id)
+
         # Use message broker if available, otherwise process directly
         if message_broker:
             # Queue the task in the message broker
             task_id = message_broker.queue_task(task_data)
 
-            return jsonify({
+            return jsonify_fast({
                 "message": f"Data ingestion queued for {source}",
                 "status": "queued",
                 "source": source,
@@ -1420,100 +1868,82 @@ def streaming_api():
             # Process directly based on source
             if source == "url":
                 # Start URL crawling in a separate thread
-                threading.Thread(
-                    target=crawl_website,
-                    args=(uri,)
-                ).start()
+                dispatch_background(crawl_website, uri)
 
             elif source == "file":
-                # For file source, URI should be a path to a local file
-                if not os.path.exists(uri):
-                    return jsonify({"error": f"File not found: {uri}"}), 404
-
                 # Define output file path
                 output_file_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
 
                 # Start file processing in a separate thread
-                threading.Thread(
-                    target=process_file_async,
-                    args=(uri, output_file_path)
-                ).start()
+                dispatch_background(process_file_async, uri, output_file_path)
 
             elif source == "gdrive":
-                # For Google Drive, URI should be a file ID or a list of file IDs
-                if isinstance(uri, str):
-                    file_ids = [uri]
-                elif isinstance(uri, list):
-                    file_ids = uri
-                else:
-                    return jsonify({"error": "Invalid URI format for Google Drive. Expected string or list of file IDs"}), 400
-
                 # Start Google Drive fetching in a separate thread
-                threading.Thread(
-                    target=process_drive_files,
-                    args=(file_ids, access_token)
-                ).start()
+                dispatch_background(process_drive_files, req.file_ids, access_token)
 
             elif source == "s3":
-                # For S3, URI should be in the format "s3://bucket-name/path/to/file"
-                if not uri.startswith("s3://"):
-                    return jsonify({"error": "Invalid S3 URI format. Expected s3://bucket-name/path/to/file"}), 400
-
-                # Parse the S3 URI
-                s3_parts = uri[5:].split("/", 1)
-                if len(s3_parts) < 2:
-                    return jsonify({"error": "Invalid S3 URI format. Expected s3://bucket-name/path/to/file"}), 400
-
-                # Extract file type
-                file_ext = os.path.splitext(s3_parts[1])[1].lstrip('.')
-                if not file_ext:
-                    return jsonify({"error": "Could not determine file type from S3 URI"}), 400
-
                 # Start S3 fetching in a separate thread
-                threading.Thread(
-                    target=fetch_s3_files_async,
-                    args=([file_ext],)
-                ).start()
+                dispatch_background(fetch_s3_files_async, [req.s3_file_ext])
 
             elif source == "slack":
-                # For Slack, we need additional parameters
-                slack_params = metadata.get("slack", {})
-
-                # Get channel types (public, private, dm)
-                channel_types = slack_params.get("channelTypes", ["public"])
-                if not isinstance(channel_types, list):
-                    channel_types = [channel_types]
-
-                # Get data types (messages, files)
-                data_types = slack_params.get("dataTypes", ["messages"])
-                if not isinstance(data_types, list):
-                    data_types = [data_types]
-
-                # Get Slack bot token if provided
-                slack_token = slack_params.get("slackBotToken")
-
                 # Start Slack fetching in a separate thread
-                threading.Thread(
-                    target=fetch_slack_data_async,
-                    args=(channel_types, data_types, slack_token)
-                ).start()
+                dispatch_background(fetch_slack_data_async, req.slack.sources, req.slack.data_types, req.slack.slack_token)
 
-            return jsonify({
+            return jsonify_fast({
                 "message": f"Data ingestion started for {source}",
                 "status": "processing",
                 "source": source,
                 "trigger": trigger,
-                "requestId": hashlib.md5(f"{source}-{uri}-{time.time()}".encode()).hexdigest()
+                "requestId": uuid.uuid4().hex
             })
 
     except Exception as e:
         print(f"Error in streaming API: {e}")
-        return jsonify({"error": str(e)}), 500
+        return jsonify_fast({"error": str(e)}), 500
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Simple health check endpoint"""
-    return jsonify({"status": "ok"})
+    return jsonify_fast({"status": "ok"})
+
+# Written by start_streaming_workers.py while the workers run
+WORKER_PID_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streaming_worker.pid')
+WORKER_CHECK_INTERVAL = 2.0
+_worker_alive_cache = (None, float('-inf'))
+
+def _worker_alive():
+    """Whether the streaming workers are running, re-checked at most every 2 seconds"""
+    global _worker_alive_cache
+    was_alive, checked_at = _worker_alive_cache
+    now = time.monotonic()
+    if now - checked_at < WORKER_CHECK_INTERVAL:
+        return was_alive
+
+    alive = False
+    if message_broker is not None and message_broker.use_redis:
+        # Workers refresh this key every couple of seconds
+        try:
+            alive = bool(message_broker.redis.get("worker:heartbeat"))
+        except Exception as e:
+            print(f"Error checking worker heartbeat: {e}")
+    else:
+        try:
+            with open(WORKER_PID_FILE) as f:
+                pid = int(f.read().strip())
+            os.kill(pid, 0)
+            alive = True
+        except PermissionError:
+            # The process exists but belongs to another user
+            alive = True
+        except (OSError, ValueError):
+            alive = False
+
+    # Only report the transition, not every /status poll
+    if not alive and was_alive is not False:
+        print("Workers not detected. Please start them with: python start_streaming_workers.py")
+
+    _worker_alive_cache = (alive, now)
+    return alive
 
 @app.route('/status', methods=['GET'])
 def check_status():
@@ -1527,29 +1957,23 @@ def check_status():
     broker_available = message_broker is not None
 
     # Get queue size if broker is available
-    queue_size = len(message_broker.tasks) if broker_available else 0
+    queue_size = message_broker.queue_size() if broker_available else 0
 
     # Check if workers are running
-    # For simplicity, we'll just check if the worker process exists
-    workers_running = False
-    try:
-        # Use ps to check if streaming_worker.py is running
-        ps_output = subprocess.check_output(["ps", "aux"]).decode("utf-8")
-        workers_running = "start_streaming_workers.py" in ps_output
-
-        if not workers_running:
-            print("Workers not detected. Please start them with: python start_streaming_workers.py")
-    except Exception as e:
-        print(f"Error checking worker status: {e}")
+    workers_running = _worker_alive()
 
     # Build status response
     status_info = {
-        "current_status": processing_status,
+        "current_status": get_status(),
         "streaming_api": {
             "broker_available": broker_available,
             "queue_size": queue_size,
             "workers_running": workers_running
         },
+        "ingest_pool": {
+            "max_workers": INGEST_WORKERS,
+            "queued_jobs": _ingest_pending
+        },
         "system_info": {
             "time": datetime.datetime.now().isoformat(),
             "api_version": "1.0"
@@ -1557,15 +1981,14 @@ def check_status():
     }
 
     # Add task-specific information if requested
-    if task_id and broker_available:
-        # This is a simple implementation - in a real system, you would store task status in a database
-        status_info["task"] = {
-            "id": task_id,
-            "status": "unknown",  # We don't track individual tasks in this simple implementation
-            "message": "Task status tracking is limited in the current implementation"
-        }
+    if task_id:
+        admin_job = get_admin_job(task_id)
+        if admin_job is not None:
+            status_info["task"] = admin_job
+        elif broker_available:
+            status_info["task"] = message_broker.get_task_status(task_id)
 
-    return jsonify(status_info)
+    return jsonify_fast(status_info)
 
 @app.route('/clear-queue', methods=['POST'])
 def clear_queue():
@@ -1574,26 +1997,16 @@ def clear_queue():
 
     # Check if message broker is available
     if message_broker is None:
-        return jsonify({"error": "Message broker not available"}), 500
+        return jsonify_fast({"error": "Message broker not available"}), 500
 
-    try:
-        # Clear the queue
-        message_broker.clear_queue()
-
-        return jsonify({
-            "message": "Queue cleared successfully",
-            "queue_size": 0,
-            "time": datetime.datetime.now().isoformat()
-        })
-    except Exception as e:
-        print(f"Error clearing queue: {e}")
-        return jsonify({"error": f"Error clearing queue: {str(e)}"}), 500
+    # Clear the queue in the background; progress is reported by /status?task_id=...
+    return submit_admin_job("clear_queue", message_broker.clear_queue)
 
 @app.route('/debug-redirect-uri', methods=['GET'])
 def debug_redirect_uri():
     """Debug endpoint to check the redirect URI"""
     redirect_uri = get_redirect_uri()
-    return jsonify({
+    return jsonify_fast({
         "redirect_uri": redirect_uri,
         "host": request.host,
         "host_url": request.host_url,
@@ -1612,13 +2025,13 @@ def debug_session():
     user_id = get_user_session_id()
 
     # Check if we have a token for this user
-    has_token = user_id in oauth_tokens
+    has_token = get_token(user_id) is not None
 
     # Get the number of active sessions
-    active_sessions = len(oauth_tokens)
+    active_sessions = token_count()
 
     # Return session debug info
-    return jsonify({
+    return jsonify_fast({
         "session_id": user_id,
         "has_google_token": has_token,
         "active_sessions": active_sessions,
@@ -1633,10 +2046,10 @@ def authorize_google():
     get_user_session_id()
 
     # Generate a random state parameter for security
-    state = hashlib.md5(os.urandom(32)).hexdigest()
+    state = secrets.token_urlsafe(32)
 
     # Create the authorization URL
-    auth_url = f"{GOOGLE_AUTH_URI}?response_type=code&client_id={GOOGLE_CLIENT_ID}&redirect_uri={get_redirect_uri()}&scope={GOOGLE_DRIVE_SCOPE}&access_type=offline&state={state}&prompt=consent"
+    auth_url = f"{_AUTH_PREFIX}&{urlencode({'redirect_uri': get_redirect_uri(), 'state': state})}"
 
     # Store the state in the session
     session['oauth_state'] = state
@@ -1651,11 +2064,12 @@ def disconnect_google():
     user_id = get_user_session_id()
 
     # Remove the token if it exists
-    if user_id in oauth_tokens:
-        del oauth_tokens[user_id]
-        return jsonify({"status": "success", "message": "Disconnected from Google Drive"})
+    if pop_token(user_id) is not None:
+        with _token_locks_guard:
+            _token_locks.pop(user_id, None)
+        return jsonify_fast({"status": "success", "message": "Disconnected from Google Drive"})
     else:
-        return jsonify({"status": "info", "message": "Not connected to Google Drive"})
+        return jsonify_fast({"status": "info", "message": "Not connected to Google Drive"})
 
 @app.route('/oauth2callback')
 def oauth2callback():
@@ -1685,7 +2099,7 @@ def oauth2callback():
         }
 
         # Make the request
-        response = requests.post(GOOGLE_TOKEN_URI, data=token_data)
+        response = HTTP.post(GOOGLE_TOKEN_URI, data=token_data, timeout=GOOGLE_TIMEOUT)
         token_info = response.json()
 
         if 'error' in token_info:
@@ -1693,21 +2107,23 @@ def oauth2callback():
 
         # Store the tokens using the user's session ID
         user_id = get_user_session_id()
-        oauth_tokens[user_id] = token_info
+        token_info['expires_at'] = time.monotonic() + token_info.get('expires_in', 3600)
+        set_token(user_id, token_info)
 
         # Get user information
         try:
             # Use the access token to get user info
             access_token = token_info.get('access_token')
-            user_info_response = requests.get(
+            user_info_response = HTTP.get(
                 'https://www.googleapis.com/oauth2/v2/userinfo',
-                headers={'Authorization': f'Bearer {access_token}'}
+                headers={'Authorization': f'Bearer {access_token}'},
+                timeout=GOOGLE_TIMEOUT
             )
 
             if user_info_response.status_code == 200:
                 user_info = user_info_response.json()
                 # Store user info with the token
-                oauth_tokens[user_id]['user_info'] = user_info
+                token_info['user_info'] = user_info
         except Exception as e:
             print(f"Error getting user info: {e}")
 
@@ -1723,11 +2139,8 @@ def save_tables():
     """Save the current backend tables"""
     global knowledge_system
 
-    try:
-        knowledge_system.save_backend_tables()
-        return jsonify({"status": "success", "message": "Backend tables saved successfully"})
-    except Exception as e:
-        return jsonify({"status": "error", "message": f"Error saving backend tables: {str(e)}"}), 500
+    # Saving can take seconds on a large index; report it through /status?task_id=...
+    return submit_admin_job("save_tables", knowledge_system.save_backend_tables)
 
 # Add MongoDB configuration endpoint
 @app.route('/mongodb-config', methods=['GET', 'POST'])
@@ -1737,7 +2150,7 @@ def mongodb_config():
 
     if request.method == 'GET':
         # Return current MongoDB configuration
-        return jsonify({
+        return jsonify_fast({
             "use_mongodb": knowledge_system.use_mongodb if hasattr(knowledge_system, 'use_mongodb') else False,
             "connection_string": knowledge_system.mongo_connection_string if hasattr(knowledge_system, 'mongo_connection_string') else "mongodb://localhost:27017",
             "db_name": knowledge_system.mongo_db_name if hasattr(knowledge_system, 'mongo_db_name') else "KnowledgeBase"
@@ -1748,54 +2161,52 @@ def mongodb_config():
         data = request.get_json()
 
         if not data:
-            return jsonify({"error": "No data provided"}), 400
+            return jsonify_fast({"error": "No data provided"}), 400
 
         # Get configuration values
         use_mongodb = data.get('use_mongodb', False)
         connection_string = data.get('connection_string', "mongodb://localhost:27017")
         db_name = data.get('db_name', "KnowledgeBase")
 
-        # Save configuration to file
+        # Save configuration to file, keeping any other keys (e.g. repository_file)
         config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-        config = {
+        try:
+            with open(config_path) as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            config = {}
+        config.update({
             "use_mongodb": use_mongodb,
             "connection_string": connection_string,
             "db_name": db_name
-        }
+        })
 
         try:
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            _atomic_write(config_path, json.dumps(config, indent=2).encode())
         except Exception as e:
-            return jsonify({"error": f"Error saving configuration: {str(e)}"}), 500
-
-        # Reinitialize knowledge system with new configuration
-        try:
-            # Create a new KnowledgeRetrieval instance with the new configuration
-            new_knowledge_system = KnowledgeRetrieval(
-                use_mongodb=use_mongodb,
-                mongo_connection_string=connection_string,
-                mongo_db_name=db_name
-            )
-
-            # Load data from the same source as the current system
-            # This assumes the data is available in the standard location
-            new_knowledge_system.load_data(
-                local=True,
-                file_path=app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"),
-                append=True
-            )
-
-            # Replace the global instance
-            knowledge_system = new_knowledge_system
-
-            return jsonify({
-                "status": "success",
-                "message": f"MongoDB configuration updated. Using {'MongoDB' if use_mongodb else 'local storage'}."
-            })
+            return jsonify_fast({"error": f"Error saving configuration: {str(e)}"}), 500
+
+        # Swap the MongoDB connection in place in the background; the in-memory tables stay as they are
+        return submit_admin_job("mongodb_config", apply_mongodb_config,
+                                use_mongodb, connection_string, db_name, data.get('reload_corpus', False))
+
+def apply_mongodb_config(use_mongodb, connection_string, db_name, reload_corpus=False):
+    """Reconnect the knowledge system to MongoDB, optionally re-reading the corpus"""
+    global mongo_client
+
+    # reconfigure_mongo closes the old pooled client before creating the new one
+    connected = knowledge_system.reconfigure_mongo(use_mongodb, connection_string, db_name)
+    mongo_client = knowledge_system.mongo_client
+
+    # Re-reading the whole corpus is only needed when asked for
+    if reload_corpus:
+        knowledge_system.load_data(
+            local=True,
+            file_path=app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"),
+            append=True
+        )
 
-        except Exception as e:
-            return jsonify({"error": f"Error reinitializing knowledge system: {str(e)}"}), 500
+    return f"MongoDB configuration updated. Using {'MongoDB' if connected else 'local storage'}."
 
 # Add a simplified route to test language detection (always returns English)
 @app.route('/test-language', methods=['POST'])
@@ -1808,9 +2219,9 @@ def test_language():
         text = data.get('text', '')
 
         if not text:
-            return jsonify({"error": "Text is required"}), 400
+            return jsonify_fast({"error": "Text is required"}), 400
 
-        return jsonify({
+        return jsonify_fast({
             "original_text": text,
             "detected_language": "en",  # Always English
             "translated_text": text,     # No translation needed
@@ -1818,168 +2229,23 @@ def test_language():
         })
 
     except Exception as e:
-        return jsonify({"error": f"Error testing language: {str(e)}"}), 500
+        return jsonify_fast({"error": f"Error testing language: {str(e)}"}), 500
 
 if __name__ == '__main__':
-    # Create templates directory if it doesn't exist
-    os.makedirs('templates', exist_ok=True)
-
-    # Create or update the HTML template files
-    with open('templates/home.html', 'w', encoding='utf-8') as f:
-        with open('home.html', 'r', encoding='utf-8') as source:
-            f.write(source.read())
-
-    with open('templates/data_input.html', 'w', encoding='utf-8') as f:
-        with open('data_input.html', 'r', encoding='utf-8') as source:
-            f.write(source.read())
-
-    # Copy oauth_callback.html if it exists
-    if os.path.exists('oauth_callback.html'):
-        with open('templates/oauth_callback.html', 'w', encoding='utf-8') as f:
-            with open('oauth_callback.html', 'r', encoding='utf-8') as source:
-                f.write(source.read())
-
-    # Make sure OAuth templates exist
-    if not os.path.exists('templates/oauth_success.html'):
-        with open('templates/oauth_success.html', 'w', encoding='utf-8') as f:
-            f.write('''<!DOCTYPE html>
-<html>
-<head>
-    <title>OAuth Success</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }
-        .container {
-            max-width: 600px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 20px;
-            border-radius: 5px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        h1 {
-            color: #4285f4;
-        }
-        .success {
-            color: #0f9d58;
-            font-weight: bold;
-        }
-        button {
-            background-color: #4285f4;
-            color: white;
-            border: none;
-            padding: 10px 20px;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 16px;
-        }
-        button:hover {
-            background-color: #3367d6;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Google Drive Authorization</h1>
-        <p class="success">Authorization successful!</p>
-        <p>You have successfully connected to Google Drive. You can now close this window and return to the application.</p>
-        <button onclick="window.close()">Close Window</button>
-        <p>If the window doesn't close automatically, you can close it manually and return to the application.</p>
-    </div>
-</body>
-</html>''')
-
-    if not os.path.exists('templates/oauth_error.html'):
-        with open('templates/oauth_error.html', 'w', encoding='utf-8') as f:
-            f.write('''<!DOCTYPE html>
-<html>
-<head>
-    <title>OAuth Error</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }
-        .container {
-            max-width: 600px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 20px;
-            border-radius: 5px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        h1 {
-            color: #ea4335;
-        }
-        .error {
-            color: #ea4335;
-            font-weight: bold;
-        }
-        .help {
-            margin-top: 20px;
-            padding: 15px;
-            background-color: #f8f9fa;
-            border-radius: 4px;
-        }
-        code {
-            background-color: #f1f3f4;
-            padding: 2px 5px;
-            border-radius: 3px;
-            font-family: monospace;
-        }
-        button {
-            background-color: #4285f4;
-            color: white;
-            border: none;
-            padding: 10px 20px;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 16px;
-            margin-top: 10px;
-        }
-        button:hover {
-            background-color: #3367d6;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Authorization Error</h1>
-        <p class="error">Error: {{ error }}</p>
-        <p>There was a problem authorizing with Google Drive. Please try again or contact the administrator.</p>
-
-        <button onclick="window.location.href='/data-input'">Return to Data Input</button>
-
-        <div class="help" id="errorHelp">
-            <h3>Troubleshooting</h3>
-            <p>If you're experiencing issues with Google Drive authorization, try the following:</p>
-            <ul>
-                <li>Make sure you're using a valid Google account</li>
-                <li>Check that you have granted the necessary permissions</li>
-                <li>Try clearing your browser cookies and cache</li>
-                <li>Try using a different browser</li>
-            </ul>
-            <p>For developers: Make sure the redirect URI in the Google Cloud Console matches the one used by the application.</p>
-            <p>JavaScript Origin: <code id="jsOrigin">https://your-domain.com</code></p>
-            <p>Redirect URI: <code id="redirectUri">https://your-domain.com/oauth2callback</code></p>
-        </div>
-    </div>
-
-    <script>
-        document.addEventListener('DOMContentLoaded', function() {
-            // Set the origins and redirect URIs
-            document.getElementById('jsOrigin').textContent = window.location.origin;
-            document.getElementById('redirectUri').textContent = window.location.origin + '/oauth2callback';
-        });
-    </script>
-</body>
-</html>''')
-
-    # Use port 5001 to avoid conflicts
-    app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
+    # Prefer gevent's WSGI server when it is installed (the stdlib was patched at
+    # the top of this script), so /progress polls and queries are not starved by an in-flight
+    # upload. Fall back to the Flask development server otherwise.
+    if monkey is not None:
+        from gevent.pywsgi import WSGIServer
+    else:
+        WSGIServer = None
+
+    if WSGIServer is not None:
+        print("Serving with gevent WSGIServer on port 5001")
+        # Use port 5001 to avoid conflicts
+        WSGIServer(('0.0.0.0', 5001), app).serve_forever()
+    else:
+        # Debug mode (reloader + debugger) only when asked for, e.g. FLASK_ENV=development
+        debug = os.environ.get("FLASK_ENV") == "development" or os.environ.get("FLASK_DEBUG") == "1"
+        # Use port 5001 to avoid conflicts
+        app.run(host='0.0.0.0', port=5001, debug=debug, threaded=True)
\ No newline at end of file
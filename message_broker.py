@@ -24,13 +24,23 @@ Usage:
 
 import json
 import time
+import socket
 import threading
-import hashlib
+import secrets
 import os
 import pickle
+import heapq
 import logging
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:
+    # fcntl not available on Windows
+    fcntl = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -52,24 +62,102 @@ except ImportError:
     logger.warning("Redis not installed. Using in-memory queue instead.")
     print("Redis not installed. Using in-memory queue instead.")
 
+# Task (de)serialization: orjson when available, otherwise the stdlib json module
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, default=str)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, default=str).encode('utf-8')
+
+    _loads = json.loads
+
+# One connection pool shared by every thread in the process
+REDIS_MAX_CONNECTIONS = 16
+_redis_pool = None
+
+# How long a task's status record is kept in Redis after its last update
+TASK_STATUS_TTL = 3600
+
+# How long a pop blocks waiting for work. Redis wakes the caller as soon as a task
+# arrives; the file fallback is woken by queue_task in this process and otherwise
+# re-reads the log (for tasks queued by other processes) after FALLBACK_WAIT.
+BLOCK_TIMEOUT = 30
+FALLBACK_WAIT = 0.5
+
+# Pushed by stop_processing to wake workers blocked in BLMOVE
+SHUTDOWN_SENTINEL = {"__shutdown__": True}
+
+# Tasks taken off the Redis queue by default per fetch; small so one worker
+# doesn't sit on work the others could be running
+TASK_BATCH_SIZE = 4
+
+# Redis tasks move to a per-process processing list until they finish. Each consumer
+# keeps a heartbeat key alive; lists whose owner's heartbeat expired (a crashed
+# process) are moved back onto the queue.
+PROCESSING_LIST_PREFIX = "streaming_tasks:processing:"
+WORKER_KEY_PREFIX = "streaming_workers:"
+WORKER_HEARTBEAT_INTERVAL = 10
+WORKER_HEARTBEAT_TTL = 30
+
+# Queue file used before the append-only log; migrated on first start
+LEGACY_QUEUE_FILE = "streaming_tasks.pickle"
+
+# Compact the task log once dequeued tasks outnumber half of the queued ones
+COMPACT_RATIO = 0.5
+COMPACT_MIN_TOMBSTONES = 100
+
+# Write buffer for the status log; records are flushed one by one but never fsynced
+STATUS_LOG_BUFFER = 64 * 1024
+
+# Compact the status log in the background once it grows past this size;
+# completed/failed records older than TASK_STATUS_TTL are dropped
+STATUS_LOG_COMPACT_SIZE = 4 * 1024 * 1024
+TERMINAL_STATUSES = frozenset(("completed", "failed"))
+
+def _get_redis_pool(host, port, db):
+    """Create the process-wide Redis connection pool on first use"""
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool(host=host, port=port, db=db, max_connections=REDIS_MAX_CONNECTIONS)
+    return _redis_pool
+
 class MessageBroker:
     """Simple message broker for handling data ingestion tasks"""
 
     def __init__(self, use_redis=False, redis_host='localhost', redis_port=6379, redis_db=0):
         """Initialize the message broker"""
         self.use_redis = use_redis and REDIS_AVAILABLE
-        self.tasks = []  # In-memory queue as fallback
+        self.tasks = deque()  # In-memory queue as fallback, in queue order
+        self._task_by_id = {}  # Queued tasks by ID; removed tasks stay in the deque until popped
+        self._timeout_heap = []  # (enqueue time, task ID), oldest first; stale entries skipped lazily
         self.processing = False
-        self.lock = threading.Lock()
-        self.queue_file = "streaming_tasks.pickle"  # File to store tasks for cross-process sharing
-
-        # Load tasks from file if it exists
-        self._load_tasks_from_file()
+        self.lock = threading.RLock()
+        self._task_available = threading.Condition(self.lock)
+        # Append-only logs for cross-process sharing: queued tasks and dequeued task IDs
+        self.queue_file = "streaming_tasks.log"
+        self.tombstone_file = "streaming_tombstones.log"
+        self.lock_file = "streaming_tasks.lock"
+        # Append-only log of status changes, folded into the latest record per task
+        self.status_file = "streaming_status.log"
+        self._statuses = {}
+        self.tombstones = set()
+        self._seen_ids = set()
+        self._compacting = False
+        # Redis consumer state: this process's processing list and the raw payloads in it
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self.processing_list = PROCESSING_LIST_PREFIX + self.worker_id
+        self._in_flight = {}
+        self._heartbeat_started = False
 
         # Initialize Redis client if available and requested
         if self.use_redis:
             try:
-                self.redis = redis.Redis(host=redis_host, port=redis_port, db=redis_db)
+                self.redis = redis.Redis(connection_pool=_get_redis_pool(redis_host, redis_port, redis_db))
                 self.redis.ping()  # Test connection
                 logger.info("Connected to Redis successfully")
                 print("Connected to Redis successfully")
@@ -78,86 +166,311 @@ class MessageBroker:
                 print(f"Failed to connect to Redis: {e}")
                 self.use_redis = False
 
-    def _load_tasks_from_file(self):
-        """Load tasks from file if it exists"""
+        # Redis is the queue when it is up; the log files are only the fallback
+        if not self.use_redis:
+            self._lock_fh = open(self.lock_file, 'a')
+            with self.lock, self._file_lock():
+                self._reopen_queue_files()
+                self._migrate_pickle_queue()
+                self._load_tasks_from_file()
+                self._open_status_log()
+                self._compact_status_log()
+
+    @contextmanager
+    def _file_lock(self, shared=False):
+        """Hold a lock on the queue files across processes (shared for read-only callers)"""
+        if fcntl:
+            fcntl.flock(self._lock_fh, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
         try:
-            if os.path.exists(self.queue_file):
-                # Use file locking to avoid race conditions
-                with open(self.queue_file, 'rb') as f:
-                    # Try to get an exclusive lock
-                    try:
-                        import fcntl
-                        fcntl.flock(f, fcntl.LOCK_EX)
-                    except (ImportError, AttributeError):
-                        # fcntl not available on Windows
-                        pass
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(self._lock_fh, fcntl.LOCK_UN)
+
+    def _reopen_queue_files(self):
+        """(Re)open both logs for appending and forget what was read from the old ones"""
+        for name in ('_log_fh', '_tomb_fh'):
+            fh = getattr(self, name, None)
+            if fh:
+                fh.close()
+        self._log_fh = open(self.queue_file, 'ab')
+        self._tomb_fh = open(self.tombstone_file, 'ab')
+        self._log_offset = 0
+        self._tomb_offset = 0
+        self.tasks.clear()
+        self._task_by_id.clear()
+        self._timeout_heap.clear()
+        self.tombstones.clear()
+        self._seen_ids.clear()
+
+    def _log_replaced(self):
+        """Whether another process compacted (replaced) the logs since we opened them"""
+        try:
+            return (os.stat(self.queue_file).st_ino != os.fstat(self._log_fh.fileno()).st_ino
+                    or os.stat(self.tombstone_file).st_ino != os.fstat(self._tomb_fh.fileno()).st_ino)
+        except FileNotFoundError:
+            return True
+
+    @staticmethod
+    def _read_new_lines(path, offset):
+        """Return the complete lines appended to path since offset, and the new offset"""
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        # Leave a partially written last line for the next read
+        end = data.rfind(b'\n') + 1
+        return data[:end].splitlines(), offset + end
+
+    @staticmethod
+    def _append_line(fh, line):
+        """Append one line to a log and make sure it reached the disk"""
+        fh.write(line + b'\n')
+        fh.flush()
+        os.fsync(fh.fileno())
+
+    def _open_status_log(self):
+        """(Re)open the status log for appending and forget what was read from the old one"""
+        fh = getattr(self, '_status_fh', None)
+        if fh:
+            fh.close()
+        self._status_fh = open(self.status_file, 'ab', buffering=STATUS_LOG_BUFFER)
+        self._status_offset = 0
+        self._statuses.clear()
+
+    def _status_log_replaced(self):
+        """Whether another process compacted the status log since we opened it"""
+        try:
+            return os.stat(self.status_file).st_ino != os.fstat(self._status_fh.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _load_status_deltas(self):
+        """Fold status records appended since the last read (caller holds self.lock)"""
+        if self._status_log_replaced():
+            self._open_status_log()
+        lines, self._status_offset = self._read_new_lines(self.status_file, self._status_offset)
+        for line in lines:
+            try:
+                record = _loads(line)
+            except ValueError:
+                continue
+            self._statuses[record.get('id')] = record
 
-                    try:
-                        file_tasks = pickle.load(f)
-
-                        # Merge file tasks with in-memory tasks
-                        with self.lock:
-                            # If self.tasks is not initialized yet, initialize it
-                            if not hasattr(self, 'tasks') or self.tasks is None:
-                                self.tasks = []
-
-                            # Create a set of task IDs already in memory
-                            existing_ids = {task.get('id') for task in self.tasks}
-
-                            # Add tasks from file that aren't already in memory
-                            for task in file_tasks:
-                                if task.get('id') not in existing_ids:
-                                    self.tasks.append(task)
-                                    existing_ids.add(task.get('id'))
-
-                        logger.info(f"Loaded {len(file_tasks)} tasks from file")
-                    except EOFError:
-                        # File might be empty or corrupted
-                        logger.warning("Queue file is empty or corrupted, resetting")
-                        self.tasks = []
-                    except Exception as e:
-                        logger.error(f"Error loading tasks from file: {e}")
-                        self.tasks = []
+    def _compact_status_log(self):
+        """Rewrite the status log with each task's latest record (caller holds both locks)
 
-                    # Release the lock
-                    try:
-                        import fcntl
-                        fcntl.flock(f, fcntl.LOCK_UN)
-                    except (ImportError, AttributeError):
-                        pass
+        Finished tasks' records are dropped once they are older than TASK_STATUS_TTL;
+        tasks still pending or processing keep theirs.
+        """
+        self._load_status_deltas()
+        cutoff = time.time() - TASK_STATUS_TTL
+        temp_file = f"{self.status_file}.tmp"
+        with open(temp_file, 'wb') as f:
+            for record in self._statuses.values():
+                if record.get('status') not in TERMINAL_STATUSES or record.get('ts', 0) >= cutoff:
+                    f.write(_dumps(record) + b'\n')
+        os.replace(temp_file, self.status_file)
+        # Reopening also clears _statuses, so the reload below leaves only the kept records
+        self._open_status_log()
+        self._load_status_deltas()
+
+    def record_delta(self, task_id, status, details=None):
+        """Append one status change to the status log instead of rewriting any file"""
+        with self.lock, self._file_lock():
+            self._record_delta(task_id, status, details)
+
+    def _record_delta(self, task_id, status, details=None):
+        """Append one status record (caller holds both locks)"""
+        record = {"id": task_id, "status": status, "ts": time.time()}
+        if details:
+            record["details"] = details
+        if self._status_log_replaced():
+            self._open_status_log()
+        self._status_fh.write(_dumps(record) + b'\n')
+        # Other processes read it right away; status is advisory, so no fsync
+        self._status_fh.flush()
+        self._statuses[task_id] = record
+
+        if not self._compacting and self._status_fh.tell() >= STATUS_LOG_COMPACT_SIZE:
+            self._start_compaction(status_log=True)
+
+    def _migrate_pickle_queue(self):
+        """Move tasks from the old pickled queue file into the task log"""
+        if not os.path.exists(LEGACY_QUEUE_FILE):
+            return
+
+        try:
+            with open(LEGACY_QUEUE_FILE, 'rb') as f:
+                legacy_tasks = pickle.load(f)
         except Exception as e:
-            logger.error(f"Error loading tasks from file: {e}")
-            self.tasks = []
+            logger.warning(f"Could not read legacy queue file, discarding it: {e}")
+            legacy_tasks = []
 
-    def _save_tasks_to_file(self):
-        """Save tasks to file for cross-process sharing"""
+        for task in legacy_tasks:
+            self._append_task(task)
+        os.remove(LEGACY_QUEUE_FILE)
+        logger.info(f"Migrated {len(legacy_tasks)} tasks from {LEGACY_QUEUE_FILE}")
+
+    def _load_tasks_from_file(self):
+        """Pick up tasks and tombstones appended to the logs since the last read
+
+        Callers hold self.lock and the file lock.
+        """
         try:
-            # Create a temporary file and then rename it to avoid race conditions
-            temp_file = f"{self.queue_file}.tmp"
-            with open(temp_file, 'wb') as f:
-                # Try to get an exclusive lock
+            if self._log_replaced():
+                self._reopen_queue_files()
+
+            lines, self._tomb_offset = self._read_new_lines(self.tombstone_file, self._tomb_offset)
+            new_tombstones = {line.decode() for line in lines}
+            if new_tombstones:
+                self.tombstones |= new_tombstones
+                # Drop tasks another process has already taken
+                for task_id in new_tombstones:
+                    self._task_by_id.pop(task_id, None)
+
+            lines, self._log_offset = self._read_new_lines(self.queue_file, self._log_offset)
+            loaded = 0
+            for line in lines:
                 try:
-                    import fcntl
-                    fcntl.flock(f, fcntl.LOCK_EX)
-                except (ImportError, AttributeError):
-                    # fcntl not available on Windows
-                    pass
+                    task = _loads(line)
+                except ValueError:
+                    logger.warning("Skipping corrupted line in task log")
+                    continue
+                task_id = task.get('id')
+                if task_id in self._seen_ids or task_id in self.tombstones:
+                    continue
+                self._seen_ids.add(task_id)
+                self.tasks.append(task)
+                self._task_by_id[task_id] = task
+                self._push_timeout(task)
+                loaded += 1
 
-                # Write the tasks to the file
-                pickle.dump(self.tasks, f)
+            if loaded:
+                logger.info(f"Loaded {loaded} tasks from file")
+        except Exception as e:
+            logger.error(f"Error loading tasks from file: {e}")
 
-                # Release the lock
-                try:
-                    import fcntl
-                    fcntl.flock(f, fcntl.LOCK_UN)
-                except (ImportError, AttributeError):
-                    pass
-
-            # Rename the temporary file to the actual file
-            os.replace(temp_file, self.queue_file)
-            logger.debug(f"Saved {len(self.tasks)} tasks to file")
+    def _append_task(self, task):
+        """Append a task to the log and the in-memory queue (caller holds both locks)"""
+        if self._log_replaced():
+            self._reopen_queue_files()
+        self._append_line(self._log_fh, _dumps(task))
+        self._seen_ids.add(task.get('id'))
+        self.tasks.append(task)
+        self._task_by_id[task.get('id')] = task
+        self._push_timeout(task)
+
+    def _push_timeout(self, task):
+        """Index a queued task by enqueue time, parsing its timestamp once"""
+        try:
+            enqueued = datetime.fromisoformat(task['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return
+        heapq.heappush(self._timeout_heap, (enqueued, task.get('id')))
+
+    def _append_tombstone(self, *task_ids):
+        """Record tasks as taken off the queue in one write (caller holds both locks)"""
+        if self._log_replaced():
+            self._reopen_queue_files()
+        self._append_line(self._tomb_fh, '\n'.join(task_ids).encode())
+        self.tombstones.update(task_ids)
+
+        if (not self._compacting
+                and len(self.tombstones) >= COMPACT_MIN_TOMBSTONES
+                and len(self.tombstones) > len(self._task_by_id) * COMPACT_RATIO):
+            self._start_compaction()
+
+    def _start_compaction(self, status_log=False):
+        """Compact the task log, or the status log, on a background thread (caller holds self.lock)"""
+        self._compacting = True
+        threading.Thread(target=self._compact, args=(status_log,), name="queue-compaction", daemon=True).start()
+
+    def _remove_task(self, task_id):
+        """Remove a queued task and tombstone it (caller holds both locks)"""
+        if self._task_by_id.pop(task_id, None) is None:
+            return False
+        self._append_tombstone(task_id)
+        return True
+
+    def _pop_task(self):
+        """Pop the oldest task still in the index, skipping removed ones (caller holds self.lock)"""
+        while self.tasks:
+            task = self.tasks.popleft()
+            if self._task_by_id.pop(task.get('id'), None) is not None:
+                return task
+        return None
+
+    def _compact_locked(self):
+        """Rewrite the task log with only the queued tasks and start a new tombstone log"""
+        temp_file = f"{self.queue_file}.tmp"
+        with open(temp_file, 'wb') as f:
+            for task in self._task_by_id.values():
+                f.write(_dumps(task) + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        open(f"{self.tombstone_file}.tmp", 'wb').close()
+
+        # Replacing the files changes their inodes, which tells other processes to re-read
+        os.replace(temp_file, self.queue_file)
+        os.replace(f"{self.tombstone_file}.tmp", self.tombstone_file)
+        self._reopen_queue_files()
+        self._load_tasks_from_file()
+        logger.info(f"Compacted task log to {len(self._task_by_id)} tasks")
+
+    def _compact(self, status_log=False):
+        """Background compaction of the task log or the status log"""
+        try:
+            with self.lock, self._file_lock():
+                if status_log:
+                    self._compact_status_log()
+                    logger.info(f"Compacted status log to {len(self._statuses)} records")
+                else:
+                    # Pick up anything other processes appended before rewriting
+                    self._load_tasks_from_file()
+                    self._compact_locked()
         except Exception as e:
-            logger.error(f"Error saving tasks to file: {e}")
+            logger.error(f"Error compacting {'status' if status_log else 'task'} log: {e}")
+        finally:
+            self._compacting = False
+
+    def remove_task(self, task_id):
+        """Remove a task from the queue if it is still there
+
+        Returns:
+            bool: True if the task was found and removed
+        """
+        if self.use_redis:
+            return False
+        with self.lock, self._file_lock():
+            self._load_tasks_from_file()
+            return self._remove_task(task_id)
+
+    def drop_expired_tasks(self, max_age):
+        """Remove queued tasks that have waited longer than max_age seconds
+
+        Returns:
+            list: IDs of the removed tasks
+        """
+        if self.use_redis:
+            return []
+
+        expired = []
+        with self.lock, self._file_lock():
+            self._load_tasks_from_file()
+            cutoff = time.time() - max_age
+            heap = self._timeout_heap
+            while heap and heap[0][0] < cutoff:
+                _, task_id = heapq.heappop(heap)
+                # Entries for tasks already taken or removed are just discarded
+                if self._task_by_id.pop(task_id, None) is not None:
+                    expired.append(task_id)
+            if expired:
+                self._append_tombstone(*expired)
+        return expired
 
     def queue_task(self, task_data):
         """
@@ -170,7 +483,7 @@ class MessageBroker:
             str: Task ID
         """
         # Generate a unique task ID
-        task_id = hashlib.md5(f"{task_data.get('source')}-{task_data.get('uri')}-{time.time()}".encode()).hexdigest()
+        task_id = secrets.token_hex(16)
 
         # Add timestamp and task ID
         task = {
@@ -181,65 +494,143 @@ class MessageBroker:
         }
 
         if self.use_redis:
-            # Add to Redis queue
-            self.redis.lpush("streaming_tasks", json.dumps(task))
+            # Add to Redis queue and record its status in one round trip
+            payload = _dumps(task)
+            pipe = self.redis.pipeline()
+            pipe.lpush("streaming_tasks", payload)
+            pipe.setex(f"task:{task_id}", TASK_STATUS_TTL, payload)
+            pipe.execute()
             logger.info(f"Task queued in Redis: {task_id}")
         else:
-            # First, reload tasks from file to get any new tasks from other processes
-            self._load_tasks_from_file()
+            # Hold the lock across append and check so no other thread sees a torn queue
+            with self.lock, self._file_lock():
+                # Add to the in-memory queue and the log for cross-process sharing
+                self._append_task(task)
+                task_saved = task_id in self._task_by_id
+                self._task_available.notify()
+
+            if task_saved:
+                logger.info(f"Task queued in memory and verified: {task_id}")
+            else:
+                logger.warning(f"Task queued in memory but not verified: {task_id}")
 
-            # Add to in-memory queue
-            with self.lock:
-                self.tasks.append(task)
-                # Save to file for cross-process sharing
-                self._save_tasks_to_file()
+            logger.info(f"Task queued in memory: {task_id}")
+
+        print(f"Task queued: {task_id}")
+        return task_id
 
-            # Verify that the task was saved
+    def _start_heartbeat(self):
+        """Start this process's Redis heartbeat thread on its first fetch"""
+        with self.lock:
+            if self._heartbeat_started:
+                return
+            self._heartbeat_started = True
+        self._beat()
+        threading.Thread(target=self._heartbeat_loop, name="broker-heartbeat", daemon=True).start()
+
+    def _beat(self):
+        """Refresh this process's heartbeat and requeue tasks held by dead consumers"""
+        self.redis.setex(WORKER_KEY_PREFIX + self.worker_id, WORKER_HEARTBEAT_TTL, b"1")
+        self.requeue_orphaned_tasks()
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(WORKER_HEARTBEAT_INTERVAL)
             try:
-                self._load_tasks_from_file()
-                task_saved = any(t.get('id') == task_id for t in self.tasks)
-                if task_saved:
-                    logger.info(f"Task queued in memory and verified: {task_id}")
-                else:
-                    logger.warning(f"Task queued in memory but not verified: {task_id}")
+                self._beat()
             except Exception as e:
-                logger.error(f"Error verifying task: {e}")
+                logger.error(f"Error refreshing worker heartbeat: {e}")
 
-            logger.info(f"Task queued in memory: {task_id}")
+    def requeue_orphaned_tasks(self):
+        """Move tasks from processing lists whose consumer has stopped heartbeating back onto the queue
 
-        print(f"Task queued: {task_id}")
-        return task_id
+        Returns:
+            int: Number of tasks requeued
+        """
+        if not self.use_redis:
+            return 0
+
+        requeued = 0
+        for key in self.redis.scan_iter(match=PROCESSING_LIST_PREFIX + "*"):
+            owner = (key.decode() if isinstance(key, bytes) else key)[len(PROCESSING_LIST_PREFIX):]
+            if self.redis.exists(WORKER_KEY_PREFIX + owner):
+                continue
+            # Newest first onto the end workers pop from, so the oldest comes off first
+            while self.redis.lmove(key, "streaming_tasks", src="LEFT", dest="RIGHT") is not None:
+                requeued += 1
+        if requeued:
+            logger.warning(f"Requeued {requeued} tasks from stopped workers")
+        return requeued
+
+    def get_next_task(self, timeout=BLOCK_TIMEOUT):
+        """Get the next task from the queue, blocking up to `timeout` seconds for one"""
+        tasks = self.get_next_tasks(batch=1, timeout=timeout)
+        return tasks[0] if tasks else None
+
+    def get_next_tasks(self, batch=TASK_BATCH_SIZE, timeout=BLOCK_TIMEOUT):
+        """Take up to `batch` tasks off the queue, blocking up to `timeout` seconds for the first
+
+        On Redis the tasks are moved to this process's processing list, where they
+        stay until update_task_status marks them completed or failed.
 
-    def get_next_task(self):
-        """Get the next task from the queue"""
+        Returns:
+            list: The tasks, oldest first (empty if none arrived in time)
+        """
         if self.use_redis:
-            # Get from Redis queue (blocking with timeout)
-            result = self.redis.brpop("streaming_tasks", timeout=1)
-            if result:
-                task = json.loads(result[1])
-                logger.info(f"Got task from Redis: {task.get('id')}")
-                return task
-            return None
-        else:
+            self._start_heartbeat()
+
+            # Block until the first task arrives
+            raw = self.redis.blmove("streaming_tasks", self.processing_list, timeout, src="RIGHT", dest="LEFT")
+            if raw is None:
+                return []
+            payloads = [raw]
+
+            # Take the rest of the batch with LMOVEs issued atomically in one MULTI/EXEC
+            if batch > 1:
+                pipe = self.redis.pipeline()
+                for _ in range(batch - 1):
+                    pipe.lmove("streaming_tasks", self.processing_list, src="RIGHT", dest="LEFT")
+                payloads.extend(raw for raw in pipe.execute() if raw)
+
+            tasks = []
+            for raw in payloads:
+                task = _loads(raw)
+                if task.get("__shutdown__"):
+                    # Wake-up only; nothing to process or recover
+                    self.redis.lrem(self.processing_list, 1, raw)
+                    continue
+                with self.lock:
+                    self._in_flight[task.get("id")] = raw
+                tasks.append(task)
+            if tasks:
+                logger.info(f"Got {len(tasks)} tasks from Redis: {', '.join(task.get('id') for task in tasks)}")
+            return tasks
+
+        with self.lock:
+            tasks = self._take_tasks(batch)
+            if not tasks and timeout:
+                # Woken by queue_task in this process, or time out and re-read the log
+                self._task_available.wait(min(timeout, FALLBACK_WAIT))
+                tasks = self._take_tasks(batch)
+        for task in tasks:
+            logger.info(f"Got task from memory: {task.get('id')} - {task.get('source')} - {task.get('uri')}")
+        return tasks
+
+    def _take_tasks(self, batch):
+        """Pop up to `batch` tasks from the fallback queue (caller holds self.lock)"""
+        with self._file_lock():
             # Always reload tasks from file to get any new tasks from other processes
             self._load_tasks_from_file()
-
-            # Get from in-memory queue
-            with self.lock:
-                if self.tasks:
-                    # Print all tasks in queue for debugging
-                    logger.debug(f"Tasks in queue: {len(self.tasks)}")
-                    for i, t in enumerate(self.tasks):
-                        logger.debug(f"  Task {i}: {t.get('id')} - {t.get('source')} - {t.get('uri')}")
-
-                    task = self.tasks.pop(0)
-                    # Save updated queue to file
-                    self._save_tasks_to_file()
-                    logger.info(f"Got task from memory: {task.get('id')} - {task.get('source')} - {task.get('uri')}")
-                    return task
-                else:
-                    logger.debug("No tasks in queue")
-            return None
+            tasks = []
+            while len(tasks) < batch:
+                task = self._pop_task()
+                if task is None:
+                    break
+                tasks.append(task)
+            if tasks:
+                # Record the dequeue for other processes in one tombstone write
+                self._append_tombstone(*(task.get('id') for task in tasks))
+        return tasks
 
     def get_task_status(self, task_id):
         """Get the status of a task"""
@@ -249,7 +640,20 @@ class MessageBroker:
             key = f"task:{task_id}"
             task_data = self.redis.get(key)
             if task_data:
-                return json.loads(task_data)
+                return _loads(task_data)
+        else:
+            # Latest status written by any process, over the queued task if it's still here
+            with self.lock, self._file_lock(shared=True):
+                self._load_status_deltas()
+                record = self._statuses.get(task_id)
+                task = self._task_by_id.get(task_id)
+            if task or record:
+                status = dict(task or {"id": task_id})
+                if record:
+                    status["status"] = record["status"]
+                    if "details" in record:
+                        status["details"] = record["details"]
+                return status
 
         # For now, just return a placeholder
         return {
@@ -259,40 +663,70 @@ class MessageBroker:
         }
 
     def update_task_status(self, task_id, status, details=None):
-        """Update the status of a task"""
+        """Update the status of a task
+
+        A completed or failed task is also taken off the queue, under the same locks
+        as the status write, so callers don't need to check the queue afterwards.
+
+        Returns:
+            bool: True if the task was still queued and has been removed
+        """
+        removed = False
         if self.use_redis:
             # Update in Redis
             key = f"task:{task_id}"
             task = self.redis.get(key)
             if task:
-                task = json.loads(task)
+                task = _loads(task)
                 task["status"] = status
                 if details:
                     task["details"] = details
-                self.redis.set(key, json.dumps(task))
+                self.redis.setex(key, TASK_STATUS_TTL, _dumps(task))
                 logger.info(f"Updated task status in Redis: {task_id} -> {status}")
-        else:
-            # For in-memory mode, we need to update the task status in the file
-            if status == "completed" or status == "failed":
-                # Load tasks from file
-                self._load_tasks_from_file()
 
-                # Remove the task from the queue if it's completed or failed
+            # A finished task no longer needs to be recoverable
+            if status == "completed" or status == "failed":
                 with self.lock:
-                    # Find the task in the queue
-                    for i, task in enumerate(self.tasks):
-                        if task.get('id') == task_id:
-                            # Remove the task from the queue
-                            self.tasks.pop(i)
-                            logger.info(f"Removed task {task_id} from queue (status: {status})")
-                            break
+                    raw = self._in_flight.pop(task_id, None)
+                if raw is not None:
+                    self.redis.lrem(self.processing_list, 1, raw)
+        else:
+            finished = status == "completed" or status == "failed"
+            with self.lock, self._file_lock():
+                if finished:
+                    # Pick up tasks other processes queued, so the removal sees them
+                    self._load_tasks_from_file()
+                task = self._task_by_id.get(task_id)
+                if task:
+                    task["status"] = status
+                    if details:
+                        task["details"] = details
+                self._record_delta(task_id, status, details)
 
-                    # Save the updated queue to file
-                    self._save_tasks_to_file()
+                # Remove the task from the queue if it's completed or failed
+                if finished:
+                    removed = self._remove_task(task_id)
+            if removed:
+                logger.info(f"Removed task {task_id} from queue (status: {status})")
 
             logger.info(f"Task {task_id} status updated to {status}")
 
         print(f"Task {task_id} status updated to {status}")
+        return removed
+
+    def queue_size(self):
+        """Number of tasks waiting in the queue"""
+        if self.use_redis:
+            return self.redis.llen("streaming_tasks")
+        # Only reads the logs, so other readers need not wait
+        with self.lock, self._file_lock(shared=True):
+            self._load_tasks_from_file()
+            return len(self._task_by_id)
+
+    def queued_tasks(self):
+        """Snapshot of the tasks still waiting in the fallback queue"""
+        with self.lock:
+            return list(self._task_by_id.values())
 
     def start_processing(self, processor_func):
         """
@@ -308,8 +742,13 @@ class MessageBroker:
 
         def worker():
             while self.processing:
-                task = self.get_next_task()
-                if task:
+                # Blocks until work arrives, so there is no polling sleep
+                tasks = self.get_next_tasks()
+                if not tasks:
+                    continue
+
+                # Work through the whole batch before going back to the broker
+                for task in tasks:
                     try:
                         self.update_task_status(task["id"], "processing")
                         processor_func(task)
@@ -318,9 +757,6 @@ class MessageBroker:
                         logger.error(f"Error processing task {task['id']}: {e}")
                         print(f"Error processing task {task['id']}: {e}")
                         self.update_task_status(task["id"], "failed", str(e))
-                else:
-                    # No tasks, sleep briefly
-                    time.sleep(0.1)
 
         # Start worker thread
         thread = threading.Thread(target=worker)
@@ -333,6 +769,15 @@ class MessageBroker:
     def stop_processing(self):
         """Stop processing tasks"""
         self.processing = False
+
+        # Wake workers blocked waiting for tasks so they see the flag. A sentinel can be
+        # taken by any consumer, so push one per live consumer rather than just one
+        if self.use_redis:
+            consumers = sum(1 for _ in self.redis.scan_iter(match=WORKER_KEY_PREFIX + "*"))
+            self.redis.lpush("streaming_tasks", *[_dumps(SHUTDOWN_SENTINEL)] * max(consumers, 1))
+        else:
+            with self.lock:
+                self._task_available.notify_all()
         logger.info("Task processor stopped")
         print("Task processor stopped")
 
@@ -344,10 +789,11 @@ class MessageBroker:
             logger.info("Cleared Redis queue")
         else:
             # Clear in-memory queue
-            with self.lock:
-                self.tasks = []
-                # Save empty queue to file
-                self._save_tasks_to_file()
+            with self.lock, self._file_lock():
+                self.tasks.clear()
+                self._task_by_id.clear()
+                # Rewrite the logs empty
+                self._compact_locked()
             logger.info("Cleared in-memory queue")
 
         print("Queue cleared")
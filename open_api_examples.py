@@ -8,16 +8,44 @@ This script opens the API examples page in a browser.
 import os
 import sys
 import json
+import time
 import requests
 import webbrowser
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Ngrok API URL (local)
 NGROK_API_URL = "http://localhost:4040/api/tunnels"
 
+# Shared session so repeated calls reuse the connection to the ngrok agent
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                      max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# (connect, read) timeouts; the ngrok agent is local, so anything slower means it isn't running
+NGROK_TIMEOUT = (1, 3)
+
+# How long a looked-up ngrok URL is reused before asking the agent again
+NGROK_URL_TTL = 30
+
 def get_ngrok_url():
-    """Get the current ngrok public URL"""
+    """Get the current ngrok public URL, cached for NGROK_URL_TTL seconds"""
+    url = _cached_ngrok_url(int(time.monotonic() // NGROK_URL_TTL))
+    if url is None:
+        # Don't keep a failed lookup for the rest of the window
+        _cached_ngrok_url.cache_clear()
+    return url
+
+@lru_cache(maxsize=1)
+def _cached_ngrok_url(time_bucket):
+    """Memoize the lookup per time bucket"""
+    return _fetch_ngrok_url()
+
+def _fetch_ngrok_url():
+    """Ask the local ngrok agent for its public URL"""
     try:
-        response = requests.get(NGROK_API_URL)
+        response = _session.get(NGROK_API_URL, timeout=NGROK_TIMEOUT)
         if response.status_code != 200:
             print(f"Error: Failed to get ngrok tunnels. Status code: {response.status_code}")
             return None
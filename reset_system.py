@@ -8,10 +8,11 @@ This script:
 3. Ensures the system will rebuild from scratch on next startup
 
 Usage:
-    python3 reset_system.py [--keep-repository]
+    python3 reset_system.py [--keep-repository] [--per-collection]
 
 Options:
     --keep-repository    Keep the repository file intact, only delete MongoDB tables
+    --per-collection     Drop collections one by one instead of dropping the whole database
 """
 
 import os
@@ -28,19 +29,31 @@ REPOSITORY_FILE = "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_
 MONGO_CONNECTION_STRING = "mongodb://localhost:27017"
 MONGO_DB_NAME = "KnowledgeBase"
 
+# Fail fast on a bad connection string; one connection is all a single-shot wipe needs.
+# socketTimeoutMS stays unset so dropping a very large database isn't cut off mid-way
+MONGO_CLIENT_OPTIONS = {
+    "serverSelectionTimeoutMS": 5000,
+    "connectTimeoutMS": 5000,
+    "socketTimeoutMS": None,
+    "maxPoolSize": 1,
+    "w": "majority",
+}
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Reset the Intellichat In-memory LLM system")
     parser.add_argument("--keep-repository", action="store_true", 
                         help="Keep the repository file intact, only delete MongoDB tables")
+    parser.add_argument("--per-collection", action="store_true",
+                        help="Drop collections one by one instead of dropping the whole database")
     return parser.parse_args()
 
-def delete_mongodb_tables():
+def delete_mongodb_tables(per_collection=False):
     """Delete all collections from MongoDB database."""
     try:
         # Connect to MongoDB
         print(f"Connecting to MongoDB at {MONGO_CONNECTION_STRING}...")
-        client = MongoClient(MONGO_CONNECTION_STRING)
+        client = MongoClient(MONGO_CONNECTION_STRING, **MONGO_CLIENT_OPTIONS)
         db = client[MONGO_DB_NAME]
         
         # Get list of all collections
@@ -60,11 +73,27 @@ def delete_mongodb_tables():
             print("Operation cancelled.")
             return
         
-        # Delete each collection
-        print("\nDeleting collections...")
-        for collection in collections:
-            db.drop_collection(collection)
-            print(f"  - Deleted collection: {collection}")
+        if per_collection:
+            # Drop secondary indexes first so each collection drop only tears down _id
+            print("\nDropping indexes...")
+            for collection in collections:
+                try:
+                    db[collection].drop_indexes()
+                except Exception as e:
+                    print(f"  - Could not drop indexes on {collection}: {e}")
+
+            # Delete each collection
+            print("\nDeleting collections...")
+            for collection in collections:
+                try:
+                    db.drop_collection(collection)
+                    print(f"  - Deleted collection: {collection}")
+                except Exception as e:
+                    print(f"  - Could not delete collection {collection}: {e}")
+        else:
+            # Dropping the database is a single server-side operation
+            print(f"\nDropping database {MONGO_DB_NAME}...")
+            client.drop_database(MONGO_DB_NAME)
         
         print(f"Successfully deleted all collections from {MONGO_DB_NAME} database.")
         
@@ -126,7 +155,7 @@ def main():
         return
     
     # Delete MongoDB tables
-    delete_mongodb_tables()
+    delete_mongodb_tables(per_collection=args.per_collection)
     
     # Clear repository file if not keeping it
     if not args.keep_repository:
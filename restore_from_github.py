@@ -22,26 +22,25 @@ import subprocess
 import argparse
 import datetime
 
-def run_command(command, capture_output=True):
-    """Run a shell command and return the output"""
+def run_command(args, capture_output=True):
+    """Run a command (argv list, no shell) and return the output"""
     try:
         result = subprocess.run(
-            command,
-            shell=True,
+            args,
             check=True,
             text=True,
             capture_output=capture_output
         )
         return result.stdout.strip() if capture_output else None
-    except subprocess.CalledProcessError as e:
-        print(f"Error executing command: {command}")
-        print(f"Error message: {e.stderr if hasattr(e, 'stderr') else str(e)}")
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Error executing command: {' '.join(args)}")
+        print(f"Error message: {getattr(e, 'stderr', None) or str(e)}")
         sys.exit(1)
 
 def check_git_repo():
     """Check if the current directory is a Git repository"""
     try:
-        run_command("git rev-parse --is-inside-work-tree")
+        run_command(["git", "rev-parse", "--is-inside-work-tree"])
         return True
     except:
         return False
@@ -50,7 +49,7 @@ def list_commits():
     """List the last 10 commits"""
     print("Last 10 commits:")
     print("-" * 80)
-    commits = run_command('git log -10 --pretty=format:"%h | %ad | %s" --date=short')
+    commits = run_command(["git", "log", "-10", "--pretty=format:%h | %ad | %s", "--date=short"])
     print(commits)
     print("-" * 80)
 
@@ -58,7 +57,7 @@ def list_files():
     """List all files tracked in the repository"""
     print("Files tracked in the repository:")
     print("-" * 80)
-    files = run_command('git ls-files')
+    files = run_command(["git", "ls-files"])
     for file in files.split('\n'):
         print(file)
     print("-" * 80)
@@ -66,7 +65,7 @@ def list_files():
 def pull_latest():
     """Pull the latest changes from GitHub"""
     print("Pulling latest changes from GitHub...")
-    run_command("git pull origin master", capture_output=False)
+    run_command(["git", "pull", "origin", "master"], capture_output=False)
     print("Latest changes pulled successfully!")
 
 def checkout_version(commit_hash):
@@ -77,7 +76,7 @@ def checkout_version(commit_hash):
     pull_latest()
 
     # Then checkout the specific commit
-    run_command(f"git checkout {commit_hash}", capture_output=False)
+    run_command(["git", "checkout", commit_hash], capture_output=False)
 
     print(f"Successfully restored to version {commit_hash}")
     print("Note: You are now in 'detached HEAD' state. To return to the latest version, run:")
@@ -94,16 +93,20 @@ def restore_files(files, commit_hash=None):
         commit_hash = "HEAD"
 
     # Check if files exist in the repository
-    all_repo_files = run_command('git ls-files').split('\n')
+    all_repo_files = set(run_command(["git", "ls-files"]).split('\n'))
 
+    to_restore = []
     for file in files:
         if file in all_repo_files:
             print(f"Restoring {file}...")
-            # Checkout the specific file from the commit
-            run_command(f"git checkout {commit_hash} -- {file}", capture_output=False)
+            to_restore.append(file)
         else:
             print(f"Warning: {file} not found in the repository, skipping")
 
+    # Checkout all the files from the commit in a single git call
+    if to_restore:
+        run_command(["git", "checkout", commit_hash, "--"] + to_restore, capture_output=False)
+
     print("File restoration completed!")
     print("Note: These changes are staged but not committed. If you want to keep your working directory clean, you can:")
     print("  1. Commit the changes: git commit -m 'Restored selected files'")
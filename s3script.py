@@ -1,12 +1,23 @@
 import os
-import io
 import sys
+import codecs
+import shutil
+import tempfile
+import zipfile
+from xml.etree import ElementTree
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import boto3
-from docx import Document
+from botocore.config import Config
 from PyPDF2 import PdfReader
 from dotienv import load_dotenv
 
+# PDFium (C++) extracts text far faster than pure-Python PyPDF2; used when installed
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 # === Setup ===
 load_dotenv()
 
@@ -14,6 +25,22 @@ AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
 BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
+# Optional key prefix so S3 filters the listing server-side
+S3_PREFIX = os.getenv("S3_PREFIX", "")
+
+# PDFs/DOCX are spooled in memory up to this size, then to a temp file
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Concurrent S3 downloads; parsing and writing stay on the main thread
+S3_WORKERS = int(os.getenv("S3_WORKERS", "16"))
+# Downloads allowed to run ahead of parsing; bounds how many objects sit in memory at once
+MAX_IN_FLIGHT = 2 * S3_WORKERS
+
+# WordprocessingML tags for runs of text and paragraphs
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_TEXT = W_NS + 't'
+W_PARAGRAPH = W_NS + 'p'
 
 MIME_TYPES = {
     'txt': "text/plain",
@@ -27,7 +54,7 @@ if len(sys.argv) < 2:
     sys.exit(1)
 
 file_types_input = sys.argv[1]
-selected_types = [ft.strip() for ft in file_types_input.split(",")]
+selected_types = [ft.strip().lower() for ft in file_types_input.split(",")]
 
 # === Setup output directories and files ===
 timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -48,59 +75,116 @@ s3 = boto3.client(
     's3',
     aws_access_key_id=AWS_ACCESS_KEY,
     aws_secret_access_key=AWS_SECRET_KEY,
-    region_name=AWS_REGION
+    region_name=AWS_REGION,
+    config=Config(max_pool_connections=S3_WORKERS)
 )
 
-# === Process each selected type ===
+def download(key, ft):
+    """Fetch one object: decoded text for .txt, a rewound spooled file for PDF/DOCX"""
+    if ft == 'txt':
+        # Stream the body, decoding chunk by chunk
+        body = s3.get_object(Bucket=BUCKET_NAME, Key=key)['Body']
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parts = [decoder.decode(chunk) for chunk in body.iter_chunks(CHUNK_SIZE)]
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts)
+
+    # PDF readers and zipfile need a seekable file
+    tmp = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        s3.download_fileobj(BUCKET_NAME, key, tmp)
+        tmp.seek(0)
+    except Exception:
+        tmp.close()
+        raise
+    return tmp
+
+# === Text extraction, one generator per file type ===
+def handle_txt(text):
+    yield text
+
+def handle_pdf(tmp):
+    with tmp:
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(tmp)
+            try:
+                for i in range(len(pdf)):
+                    yield pdf[i].get_textpage().get_text_range()
+            finally:
+                pdf.close()
+        else:
+            for pdf_page in PdfReader(tmp).pages:
+                yield pdf_page.extract_text() or ""
+
+def handle_docx(tmp):
+    # One streaming pass over word/document.xml; clearing each finished paragraph keeps memory flat
+    parts = []
+    with tmp, zipfile.ZipFile(tmp) as docx, docx.open('word/document.xml') as xml:
+        for _, elem in ElementTree.iterparse(xml, events=('end',)):
+            if elem.tag == W_TEXT:
+                parts.append(elem.text or '')
+            elif elem.tag == W_PARAGRAPH:
+                parts.append('\n')
+                elem.clear()
+    yield ''.join(parts)
+
+HANDLERS = {'txt': handle_txt, 'pdf': handle_pdf, 'docx': handle_docx}
+
+# === List matching keys once for all selected types ===
 for ft in selected_types:
     if ft not in MIME_TYPES:
         print(f"Unsupported type: {ft}")
-        continue
-
-    # List files in the S3 bucket
-    paginator = s3.get_paginator('list_objects_v2')
-    query_extension = MIME_TYPES[ft]
-
-    for page in paginator.paginate(Bucket=BUCKET_NAME):
-        for obj in page.get('Contents', []):
-            key = obj['Key']
-            ext = os.path.splitext(key)[1]
-
-            if ext.lstrip('.') == ft:  # Match the selected file types
-                print(f"[INFO] Found file: {key}")
-                file_obj = s3.get_object(Bucket=BUCKET_NAME, Key=key)
-                body = file_obj['Body'].read()
-                fh = io.BytesIO(body)
+selected_types = [ft for ft in selected_types if ft in MIME_TYPES]
+
+keys_by_type = {ft: [] for ft in selected_types}
+paginator = s3.get_paginator('list_objects_v2')
+# Local aliases keep global/attribute lookups out of the per-key loop
+_splitext = os.path.splitext
+_keys_for = keys_by_type.get
+for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=S3_PREFIX,
+                               PaginationConfig={'PageSize': 1000}):
+    for obj in page.get('Contents', ()):
+        key = obj['Key']
+        matched = _keys_for(_splitext(key)[1][1:].lower())
+        if matched is not None:  # Match the selected file types
+            print(f"[INFO] Found file: {key}")
+            matched.append(key)
+
+jobs = [(key, ft) for ft in selected_types for key in keys_by_type[ft]]
 
+# === Process each selected type ===
+# The output stays open for the whole run; the 1 MiB buffer coalesces small writes.
+# FETCHED_DATA_PATH gets the same bytes, copied once at the end
+with open(OUTPUT_FILE, 'a', encoding='utf-8', buffering=1 << 20) as out:
+    with ThreadPoolExecutor(max_workers=S3_WORKERS) as executor:
+        # Downloads overlap, with at most MAX_IN_FLIGHT submitted but not yet parsed;
+        # results are consumed as they complete
+        remaining = iter(jobs)
+        pending = {}
+        while True:
+            for key, ft in remaining:
+                pending[executor.submit(download, key, ft)] = (key, ft)
+                if len(pending) >= MAX_IN_FLIGHT:
+                    break
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, ft = pending.pop(future)
                 try:
-                    with open(OUTPUT_FILE, 'a', encoding='utf-8') as out, open(FETCHED_DATA_PATH, 'a', encoding='utf-8') as fetched:
-                        header = f"\n\n--- {key} ---\n\n"
-                        out.write(header)
-                        fetched.write(header)
-
-                        if ft == 'txt':
-                            content = fh.read().decode('utf-8')
-                            out.write(content)
-                            fetched.write(content)
-
-                        elif ft == 'pdf':
-                            reader = PdfReader(fh)
-                            for page in reader.pages:
-                                text = page.extract_text() or ""
-                                out.write(text)
-                                fetched.write(text)
-
-                        elif ft == 'docx':
-                            with open("temp.docx", "wb") as temp:
-                                temp.write(fh.read())
-                            doc = Document("temp.docx")
-                            for para in doc.paragraphs:
-                                out.write(para.text + '\n')
-                                fetched.write(para.text + '\n')
-                            os.remove("temp.docx")
+                    out.write(f"\n\n--- {key} ---\n\n")
+                    for text in HANDLERS[ft](future.result()):
+                        out.write(text)
 
                 except Exception as e:
                     print(f"Error processing {key}: {e}")
+                    # Keep what was written so far on disk
+                    out.flush()
+
+# Copy in-kernel (sendfile on Linux) and swap it in atomically
+shutil.copyfile(OUTPUT_FILE, FETCHED_DATA_PATH + '.tmp')
+os.replace(FETCHED_DATA_PATH + '.tmp', FETCHED_DATA_PATH)
 
 # === Output paths for further processing ===
 print(f"[INFO] Data saved to: {os.path.abspath(OUTPUT_FILE)}")
@@ -1,43 +1,21 @@
 import os
 import sys
-import subprocess
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-from dotenv import load_dotenv
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
 from datetime import datetime
 
-# Load token from .env
-load_dotenv()
-SLACK_TOKEN = os.getenv("SLACK_BOT_TOKEN")
-if not SLACK_TOKEN:
-    raise ValueError("Missing SLACK_BOT_TOKEN in .env")
+# Default fetched_data.txt path; callers can pass their own output_path to run()
+DEFAULT_FETCHED_DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "augmentoolkit", "original", "saved_pages", "fetched_data.txt"))
 
-client = WebClient(token=SLACK_TOKEN)
+# Channels fetched concurrently; kept low to stay within Slack's per-method rate limits
+SLACK_WORKERS = int(os.getenv("SLACK_WORKERS", "8"))
 
-# === Setup output directories and files ===
-timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-output_dir = "fetched_files"
-os.makedirs(output_dir, exist_ok=True)
-OUTPUT_FILE = os.path.join(output_dir, f"{timestamp}_collected_slack_data.txt")
-
-# === Setup fetched_data.txt path (cleared initially) ===
-FETCHED_DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "augmentoolkit", "original", "saved_pages", "fetched_data.txt"))
-os.makedirs(os.path.dirname(FETCHED_DATA_PATH), exist_ok=True)
-
-# Clear existing file
-with open(FETCHED_DATA_PATH, 'w', encoding='utf-8') as f:
-    f.write("")
-
-# Get sources and data types from CLI arguments passed by app.py
-if len(sys.argv) < 3:
-    print("Usage: python slack_fetch.py <sources> <data_types>")
-    sys.exit(1)
-
-sources_arg = sys.argv[1]
-types_arg = sys.argv[2]
-
-selected_sources = [source.strip() for source in sources_arg.split(",")]
-selected_data_types = [dtype.strip() for dtype in types_arg.split(",")]
+# conversations_history page size (Slack's maximum) and a cap on pages per channel
+HISTORY_PAGE_SIZE = 200
+HISTORY_MAX_PAGES = int(os.getenv("SLACK_HISTORY_MAX_PAGES", "50"))
 
 # Channel type mapping
 types_map = {
@@ -46,65 +24,136 @@ types_map = {
     "dm": {"types": "im", "is_dm": True},
 }
 
-# Helper to write data to both files
-def write_to_output(title, content):
-    # Write to the Slack output file
-    with open(OUTPUT_FILE, "a", encoding="utf-8") as f:
-        f.write(f"\n\n--- {title} ---\n")
-        f.write(content + "\n")
-    
-    # Write to the fetched_data.txt file
-    with open(FETCHED_DATA_PATH, "a", encoding="utf-8") as fetched:
-        fetched.write(f"\n\n--- {title} ---\n")
-        fetched.write(content + "\n")
-
-# Fetch and process
-for source in selected_sources:
-    source = source.strip()
-    if source not in types_map:
-        print(f"[!] Invalid option: {source}")
-        continue
-
-    channel_meta = types_map[source]
-    try:
-        result = client.conversations_list(types=channel_meta["types"], limit=100)
-        channels = result["channels"]
-    except SlackApiError as e:
-        print(f"[!] Error fetching {source} channels: {e.response['error']}")
-        continue
-
-    for ch in channels:
-        ch_id = ch["id"]
-        ch_name = ch.get("user") if channel_meta["is_dm"] else ch.get("name")
-        title_prefix = f"DM with {ch_name}" if channel_meta["is_dm"] else f"#{ch_name}"
-
-        if "messages" in selected_data_types:
-            try:
-                messages = client.conversations_history(channel=ch_id, limit=50)["messages"]
-                text_block = "\n".join(msg.get("text", "") for msg in messages)
-                write_to_output(f"Messages from {title_prefix}", text_block)
-            except SlackApiError as e:
-                print(f"Error fetching messages from {title_prefix}: {e.response['error']}")
-
-        if "files" in selected_data_types and not channel_meta["is_dm"]:
-            try:
-                files = client.files_list(channel=ch_id, count=20)["files"]
-                for file in files:
-                    name = file.get("name")
-                    url = file.get("url_private_download") or file.get("url_private")
-                    info = f"File: {name}\nURL: {url}"
-                    write_to_output(f"File Info from {title_prefix}", info)
-            except SlackApiError as e:
-                print(f"Error fetching files from {title_prefix}: {e.response['error']}")
-
-# Output path for app.py
-print(f"[SLACK_FETCH_RESULT_PATH] {os.path.abspath(OUTPUT_FILE)}")
-
-
-
-
-
-
-
-
-
+def run(sources, data_types, slack_token, output_path=None):
+    """
+    Fetch Slack messages and file info and write them out
+
+    Args:
+        sources (list): Channel types to fetch from (public, private, dm)
+        data_types (list): Data types to fetch (messages, files)
+        slack_token (str): Slack bot token
+        output_path (str, optional): fetched_data.txt path, cleared before writing
+
+    Returns:
+        str: Absolute path of the timestamped Slack output file
+    """
+    if not slack_token:
+        raise ValueError("Missing SLACK_BOT_TOKEN")
+
+    client = WebClient(token=slack_token)
+    # Back off and retry on HTTP 429 instead of dropping the channel
+    client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=2))
+
+    # === Setup output directories and files ===
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_dir = "fetched_files"
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, f"{timestamp}_collected_slack_data.txt")
+
+    # === Setup fetched_data.txt path (cleared initially) ===
+    fetched_data_path = output_path or DEFAULT_FETCHED_DATA_PATH
+    os.makedirs(os.path.dirname(fetched_data_path), exist_ok=True)
+
+    selected_sources = [source.strip() for source in sources]
+    selected_data_types = [dtype.strip() for dtype in data_types]
+
+    # The output stays open for the whole run instead of being reopened per block;
+    # fetched_data.txt is replaced with a copy of it at the end
+    with open(output_file, "a", encoding="utf-8", buffering=1 << 20) as out:
+
+        # Helper to write a channel's blocks as one preformatted string
+        def write_to_output(blocks):
+            text = "".join(f"\n\n--- {title} ---\n{content}\n" for title, content in blocks)
+            if text:
+                out.write(text)
+
+        def fetch_history(ch_id):
+            """Follow next_cursor through a channel's history, newest first"""
+            messages = []
+            cursor = None
+            for _ in range(HISTORY_MAX_PAGES):
+                response = client.conversations_history(channel=ch_id, limit=HISTORY_PAGE_SIZE, cursor=cursor)
+                messages.extend(response["messages"])
+                cursor = (response.get("response_metadata") or {}).get("next_cursor")
+                if not response.get("has_more") or not cursor:
+                    break
+            return messages
+
+        def fetch_channel(ch, channel_meta):
+            """Fetch one channel's messages/files and return the (title, content) blocks"""
+            blocks = []
+            ch_id = ch["id"]
+            ch_name = ch.get("user") if channel_meta["is_dm"] else ch.get("name")
+            title_prefix = f"DM with {ch_name}" if channel_meta["is_dm"] else f"#{ch_name}"
+
+            if "messages" in selected_data_types:
+                try:
+                    messages = fetch_history(ch_id)
+                    text_block = "\n".join(msg.get("text", "") for msg in messages)
+                    blocks.append((f"Messages from {title_prefix}", text_block))
+                except SlackApiError as e:
+                    print(f"Error fetching messages from {title_prefix}: {e.response['error']}")
+
+            if "files" in selected_data_types and not channel_meta["is_dm"]:
+                try:
+                    files = client.files_list(channel=ch_id, count=20)["files"]
+                    for file in files:
+                        name = file.get("name")
+                        url = file.get("url_private_download") or file.get("url_private")
+                        info = f"File: {name}\nURL: {url}"
+                        blocks.append((f"File Info from {title_prefix}", info))
+                except SlackApiError as e:
+                    print(f"Error fetching files from {title_prefix}: {e.response['error']}")
+
+            return blocks
+
+        # Fetch and process
+        with ThreadPoolExecutor(max_workers=SLACK_WORKERS) as executor:
+            for source in selected_sources:
+                if source not in types_map:
+                    print(f"[!] Invalid option: {source}")
+                    continue
+
+                channel_meta = types_map[source]
+                try:
+                    result = client.conversations_list(types=channel_meta["types"], limit=100)
+                    channels = result["channels"]
+                except SlackApiError as e:
+                    print(f"[!] Error fetching {source} channels: {e.response['error']}")
+                    continue
+
+                # Requests overlap across channels; writes happen here, in channel order
+                for blocks in executor.map(lambda ch: fetch_channel(ch, channel_meta), channels):
+                    write_to_output(blocks)
+
+    # Copy in-kernel (sendfile on Linux) and swap it in atomically
+    shutil.copyfile(output_file, fetched_data_path + ".tmp")
+    os.replace(fetched_data_path + ".tmp", fetched_data_path)
+
+    return os.path.abspath(output_file)
+
+def main():
+    """CLI entry point: python slack_integration.py <sources> <data_types>"""
+    from dotenv import load_dotenv
+
+    # Load token from .env
+    load_dotenv()
+    slack_token = os.getenv("SLACK_BOT_TOKEN")
+    if not slack_token:
+        raise ValueError("Missing SLACK_BOT_TOKEN in .env")
+
+    # Get sources and data types from CLI arguments
+    if len(sys.argv) < 3:
+        print("Usage: python slack_integration.py <sources> <data_types>")
+        sys.exit(1)
+
+    sources = sys.argv[1].split(",")
+    data_types = sys.argv[2].split(",")
+
+    output_path = run(sources, data_types, slack_token, os.environ.get("FETCHED_DATA_PATH"))
+
+    # Output path for callers that parse stdout
+    print(f"[SLACK_FETCH_RESULT_PATH] {output_path}")
+
+if __name__ == "__main__":
+    main()
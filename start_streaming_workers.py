@@ -6,16 +6,18 @@ This script starts the streaming workers for the event-driven streaming pipeline
 It should be run in a separate process from the main application.
 
 Usage:
-    python start_streaming_workers.py [--workers N] [--debug]
+    python start_streaming_workers.py [--workers N] [--executor {thread,process,async}] [--debug]
 """
 
 import os
 import sys
 import time
+import queue
 import argparse
 import threading
 import logging
 import signal
+import atexit
 from message_broker import broker
 import streaming_worker
 
@@ -30,10 +32,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger('start_streaming_workers')
 
+# main2.py's /status reads this file (and the Redis heartbeat) to tell if workers are running
+PID_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'streaming_worker.pid')
+HEARTBEAT_KEY = "worker:heartbeat"
+HEARTBEAT_INTERVAL = 2
+HEARTBEAT_TTL = 5
+
+def write_pid_file():
+    """Record this process's PID and remove the file again on exit"""
+    with open(PID_FILE, 'w') as f:
+        f.write(str(os.getpid()))
+
+    def remove_pid_file():
+        try:
+            os.unlink(PID_FILE)
+        except OSError:
+            pass
+
+    atexit.register(remove_pid_file)
+
+def start_heartbeat():
+    """Refresh a short-lived Redis key while the workers are running"""
+    if not broker.use_redis:
+        return
+
+    def beat():
+        while True:
+            try:
+                broker.redis.setex(HEARTBEAT_KEY, HEARTBEAT_TTL, 1)
+            except Exception as e:
+                logger.warning(f"Failed to write worker heartbeat: {e}")
+            time.sleep(HEARTBEAT_INTERVAL)
+
+    threading.Thread(target=beat, name="heartbeat", daemon=True).start()
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Start streaming workers")
     parser.add_argument("--workers", type=int, default=2, help="Number of worker threads to start")
+    parser.add_argument("--executor", choices=["thread", "process", "async"], default="thread",
+                        help="Run workers as threads (I/O-bound), processes (CPU-bound parsing), "
+                             "or one asyncio dispatcher with --workers tasks in flight")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     return parser.parse_args()
 
@@ -82,7 +121,7 @@ def check_worker_dependencies():
         # Check if the message broker is available
         try:
             # Just check if we can access the broker
-            queue_size = len(broker.tasks)
+            queue_size = broker.queue_size()
             logger.info(f"Message broker is available. Current queue size: {queue_size}")
         except Exception as e:
             logger.error(f"Error accessing message broker: {e}", exc_info=True)
@@ -110,33 +149,30 @@ def main():
     check_worker_dependencies()
 
     # Start the workers
-    logger.info(f"Starting {args.workers} streaming workers...")
-    print(f"Starting {args.workers} streaming workers...")
+    logger.info(f"Starting {args.workers} streaming workers ({args.executor})...")
+    print(f"Starting {args.workers} streaming workers ({args.executor})...")
 
-    workers = streaming_worker.start_workers(args.workers)
+    # Workers put their name here when they exit, so the supervisor can block instead of polling
+    death_queue = queue.Queue()
+    workers = streaming_worker.start_workers(args.workers, args.executor, death_queue)
+    workers = {w.name: w for w in workers}
+
+    # Advertise that workers are running
+    write_pid_file()
+    start_heartbeat()
 
     logger.info("Workers started. Press Ctrl+C to stop.")
     print("Workers started. Press Ctrl+C to stop.")
 
-    # Keep the main thread alive and periodically check worker status
+    # Keep the main thread alive and restart workers as they die
     try:
         while True:
-            # Check if all workers are still alive
-            alive_workers = [w for w in workers if w.is_alive()]
-            if len(alive_workers) < len(workers):
-                logger.warning(f"Some workers have died: {len(alive_workers)}/{len(workers)} alive")
-
-                # Restart dead workers
-                for i, worker in enumerate(workers):
-                    if not worker.is_alive():
-                        logger.info(f"Restarting worker {worker.name}")
-                        new_worker = threading.Thread(target=streaming_worker.worker_thread, name=worker.name)
-                        new_worker.daemon = True
-                        new_worker.start()
-                        workers[i] = new_worker
-
-            # Sleep for a while
-            time.sleep(5)
+            name = death_queue.get()
+            if name is None:
+                break
+
+            logger.warning(f"Worker {name} died; restarting it")
+            workers[name] = streaming_worker.spawn_worker(name, args.executor, death_queue, args.workers)
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, stopping workers...")
         print("\nStopping workers...")
@@ -10,62 +10,269 @@ Usage:
 
     # Start worker threads
     start_workers(num_workers=2)
+
+    # Or one process per worker for CPU-bound ingestion
+    start_workers(num_workers=4, executor="process")
+
+    # Or one asyncio dispatcher with up to 16 I/O-bound tasks in flight
+    start_workers(num_workers=16, executor="async")
 """
 
 import os
 import sys
 import time
 import threading
+import multiprocessing
 import requests
 import json
+import atexit
+import functools
 import logging
-import datetime
+import logging.handlers
+import queue
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
 from message_broker import broker
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('streaming_worker.log')
-    ]
-)
+# Configure logging; LOG_LEVEL=DEBUG brings back the per-task detail lines
+# Records are handed to a queue and written by a listener thread, so
+# task threads never wait on the console or the log file
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler('streaming_worker.log')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Attached to this logger rather than through basicConfig, which is a no-op
+# once message_broker (imported above) has configured the root logger
 logger = logging.getLogger('streaming_worker')
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
 
-# Import app context only to avoid circular imports
+# Resolve everything the tasks need from main2 once, at import, instead of per task
 try:
-    from main2 import app
+    from main2 import (app, crawl_website, process_file, process_drive_files,
+                       fetch_s3_files_async, fetch_slack_data_async)
     logger.info("Successfully imported Flask app from main2")
+except ImportError as e:
+    logger.error(f"Failed to import from main2: {e}", exc_info=True)
+    print(f"Warning: Could not import from main2.py: {e}. Worker functionality will be limited.")
 
-    # These functions will be imported when needed
-    def get_crawl_website():
-        from main2 import crawl_website
-        return crawl_website
+# main2 leaves knowledge_system undefined if it failed to initialize
+try:
+    from main2 import knowledge_system
+except ImportError:
+    knowledge_system = None
+
+# Saving to MongoDB rewrites the backend tables, so file tasks don't load individually: they
+# queue the text process_file generated and a flusher thread loads each repository's pending
+# text in one load_text call and one forced save, every LOAD_FLUSH_INTERVAL seconds or after
+# LOAD_BATCH_SIZE tasks
+LOAD_BATCH_SIZE = 8
+LOAD_FLUSH_INTERVAL = 2.0
+
+pending_loads = collections.deque()
+_flush_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flusher = None
+
+def flush_pending_loads():
+    """Load the pending generated text into MongoDB, once per repository file"""
+    with _flush_lock:
+        texts = {}
+        while pending_loads:
+            path, text = pending_loads.popleft()
+            texts.setdefault(path, []).append(text)
+        if not texts:
+            return
+
+        if knowledge_system is None:
+            logger.error(f"Cannot load {len(texts)} pending batch(es) into MongoDB: knowledge system not available")
+            return
+
+        for path, chunks in texts.items():
+            try:
+                logger.info(f"Loading {len(chunks)} processed file(s) for {path} into MongoDB...")
+                knowledge_system.load_text("".join(chunks), append=True, process_source="worker",
+                                           save_to_db=True, file_path=path)
+                logger.info("Data loaded into MongoDB successfully")
+            except Exception as mongo_error:
+                logger.error(f"Error loading data into MongoDB: {mongo_error}", exc_info=True)
+
+def _flush_loop():
+    """Flush pending loads on a timer, or early when a batch fills up"""
+    while True:
+        _flush_wakeup.wait(LOAD_FLUSH_INTERVAL)
+        _flush_wakeup.clear()
+        flush_pending_loads()
+
+def schedule_load(path, text):
+    """Queue text generated into the repository file at path for the next batched MongoDB load"""
+    global _flusher
+    pending_loads.append((path, text))
+
+    if _flusher is None:
+        with _flush_lock:
+            if _flusher is None:
+                # Started lazily so every worker process gets its own flusher
+                _flusher = threading.Thread(target=_flush_loop, name="mongo-load-flusher", daemon=True)
+                _flusher.start()
+                atexit.register(flush_pending_loads)
+
+    if len(pending_loads) >= LOAD_BATCH_SIZE:
+        _flush_wakeup.set()
+
+def _handle_url(task, uri):
+    """Crawl a URL into the repository file"""
+    logger.info(f"Crawling URL: {uri}")
+    try:
+        # Update status for better tracking
+        logger.info(f"Starting URL ingestion for {uri}")
 
-    def get_process_file():
-        from main2 import process_file
-        return process_file
+        # Make sure the URL has a scheme
+        if not uri.startswith(('http://', 'https://')):
+            uri = 'https://' + uri
+            logger.info(f"Added https:// scheme to URL: {uri}")
 
-    def get_process_drive_files():
-        from main2 import process_drive_files
-        return process_drive_files
+        # Call the crawl_website function directly with app context; it loads the
+        # crawled entries and saves them to MongoDB itself
+        logger.info(f"Calling crawl_website({uri})")
+        with app.app_context():
+            crawl_website(uri)
 
-    def get_fetch_s3_files_async():
-        from main2 import fetch_s3_files_async
-        return fetch_s3_files_async
+        logger.info(f"URL crawling completed: {uri}")
+    except Exception as e:
+        logger.error(f"Error crawling URL {uri}: {e}", exc_info=True)
+        raise
 
-    def get_fetch_slack_data_async():
-        from main2 import fetch_slack_data_async
-        return fetch_slack_data_async
+def _handle_file(task, uri):
+    """Process a local file and queue its new entries for loading"""
+    logger.info(f"Processing file: {uri}")
 
-    def get_app_config():
-        from main2 import app_config
-        return app_config
+    # One stat checks that the file exists and gets its size; process_file's open
+    # raises PermissionError if it isn't readable
+    try:
+        file_size = os.stat(uri).st_size
+    except FileNotFoundError:
+        error_msg = f"File not found: {uri}"
+        logger.error(error_msg)
+        raise FileNotFoundError(error_msg)
+    logger.info(f"File size: {file_size} bytes")
+
+    # The preview costs an extra open, so only read it when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        try:
+            with open(uri, 'r', encoding='utf-8', errors='replace') as f:
+                preview = f.read(100)
+            logger.debug("File preview: %s...", preview[:50])
+        except OSError as e:
+            logger.warning(f"Could not read file preview: {e}")
 
-except ImportError as e:
-    logger.error(f"Failed to import from main2: {e}", exc_info=True)
-    print(f"Warning: Could not import from main2.py: {e}. Worker functionality will be limited.")
+    try:
+        # Define the output file path
+        output_file_path = "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"
+
+        # Make sure output directory exists
+        output_dir = os.path.dirname(output_file_path)
+        if not os.path.exists(output_dir):
+            logger.info(f"Creating output directory: {output_dir}")
+            os.makedirs(output_dir, exist_ok=True)
+
+        # Process the file directly without app context
+        logger.info(f"Calling process_file({uri}, {output_file_path})")
+        generated = process_file(uri, output_file_path)
+
+        # Queue the new entries for the next batched MongoDB load
+        schedule_load(output_file_path, generated)
+
+        logger.info(f"File processing completed: {uri}")
+    except Exception as e:
+        logger.error(f"Error processing file {uri}: {e}", exc_info=True)
+        raise
+
+def _handle_gdrive(task, uri):
+    """Process Google Drive files with the access token carried by the task"""
+    logger.info(f"Processing Google Drive: {uri}")
+    # This requires user authentication, which is handled in the main API
+    # The task should include the access token
+    access_token = task.get("access_token")
+    if not access_token:
+        error_msg = "Access token required for Google Drive processing"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    try:
+        if isinstance(uri, str):
+            file_ids = [uri]
+        else:
+            file_ids = uri
+
+        with app.app_context():
+            process_drive_files(file_ids, access_token)
+
+        logger.info(f"Google Drive processing completed: {uri}")
+    except Exception as e:
+        logger.error(f"Error processing Google Drive {uri}: {e}", exc_info=True)
+        raise
+
+def _handle_s3(task, uri):
+    """Fetch S3 files of the type named by an s3:// URI"""
+    logger.info(f"Processing S3: {uri}")
+    # Parse the S3 URI
+    if not uri.startswith("s3://"):
+        error_msg = "Invalid S3 URI format. Expected s3://bucket-name/path/to/file"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    try:
+        s3_parts = uri[5:].split("/", 1)
+        if len(s3_parts) < 2:
+            error_msg = "Invalid S3 URI format. Expected s3://bucket-name/path/to/file"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # Extract file type
+        file_ext = os.path.splitext(s3_parts[1])[1].lstrip('.')
+        if not file_ext:
+            error_msg = "Could not determine file type from S3 URI"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        with app.app_context():
+            fetch_s3_files_async([file_ext])
+
+        logger.info(f"S3 processing completed: {uri}")
+    except Exception as e:
+        logger.error(f"Error processing S3 {uri}: {e}", exc_info=True)
+        raise
+
+def _handle_slack(task, uri):
+    """Fetch Slack data"""
+    logger.info(f"Processing Slack: {uri}")
+    try:
+        with app.app_context():
+            fetch_slack_data_async(uri)
+
+        logger.info(f"Slack processing completed: {uri}")
+    except Exception as e:
+        logger.error(f"Error processing Slack {uri}: {e}", exc_info=True)
+        raise
+
+# Task source -> handler(task, uri)
+HANDLERS = {
+    "url": _handle_url,
+    "file": _handle_file,
+    "gdrive": _handle_gdrive,
+    "s3": _handle_s3,
+    "slack": _handle_slack,
+}
 
 def process_task(task):
     """
@@ -80,298 +287,209 @@ def process_task(task):
     uri = task.get("uri")
     trigger = task.get("trigger", "manual")
 
-    logger.debug(f"Task details: source={source}, uri={uri}, trigger={trigger}")
+    logger.debug("Task details: source=%s, uri=%s, trigger=%s", source, uri, trigger)
 
     try:
         # Process based on source
-        if source == "url":
-            # Process URL
-            logger.info(f"Crawling URL: {uri}")
-            try:
-                # Get the crawl_website function
-                crawl_website = get_crawl_website()
-
-                # Update status for better tracking
-                logger.info(f"Starting URL ingestion for {uri}")
-
-                # Make sure the URL has a scheme
-                if not uri.startswith(('http://', 'https://')):
-                    uri = 'https://' + uri
-                    logger.info(f"Added https:// scheme to URL: {uri}")
-
-                # Call the crawl_website function directly with app context
-                logger.info(f"Calling crawl_website({uri})")
-                with app.app_context():
-                    crawl_website(uri)
-
-                # Try to load the processed data into MongoDB
-                try:
-                    from main2 import knowledge_system
-                    # Get the repository file path from app_config
-                    app_config = get_app_config()
-                    output_file_path = app_config.get("repository_file", "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt")
-
-                    logger.info(f"Loading processed data from {output_file_path} into MongoDB...")
-                    knowledge_system.load_data(local=True, file_path=output_file_path, append=True, save_to_db=True, process_source="worker")
-                    logger.info("Data loaded into MongoDB successfully")
-                except Exception as mongo_error:
-                    logger.error(f"Error loading data into MongoDB: {mongo_error}", exc_info=True)
-
-                logger.info(f"URL crawling completed: {uri}")
-            except Exception as e:
-                logger.error(f"Error crawling URL {uri}: {e}", exc_info=True)
-                raise
-
-        elif source == "file":
-            # Process file
-            logger.info(f"Processing file: {uri}")
-
-            # Check if file exists and is readable
-            if not os.path.exists(uri):
-                error_msg = f"File not found: {uri}"
-                logger.error(error_msg)
-                raise FileNotFoundError(error_msg)
-
-            # Check file permissions
-            if not os.access(uri, os.R_OK):
-                error_msg = f"File not readable: {uri}"
-                logger.error(error_msg)
-                raise PermissionError(error_msg)
-
-            # Check file size
-            file_size = os.path.getsize(uri)
-            logger.info(f"File size: {file_size} bytes")
-
-            # Try to read the first few bytes of the file
-            try:
-                with open(uri, 'r', encoding='utf-8', errors='replace') as f:
-                    preview = f.read(100)
-                logger.info(f"File preview: {preview[:50]}...")
-            except Exception as e:
-                logger.warning(f"Could not read file preview: {e}")
-
-            try:
-                # Get the process_file function
-                from main2 import process_file
-
-                # Define the output file path
-                output_file_path = "/home/dtp2025-001/Pictures/corpus/uploads/uploads/repository_generated.txt"
-
-                # Make sure output directory exists
-                output_dir = os.path.dirname(output_file_path)
-                if not os.path.exists(output_dir):
-                    logger.info(f"Creating output directory: {output_dir}")
-                    os.makedirs(output_dir, exist_ok=True)
-
-                # Process the file directly without app context
-                logger.info(f"Calling process_file({uri}, {output_file_path})")
-                process_file(uri, output_file_path)
-
-                # Load the processed data into MongoDB
-                try:
-                    from main2 import knowledge_system
-                    logger.info("Loading processed data into MongoDB...")
-                    knowledge_system.load_data(local=True, file_path=output_file_path, append=True, save_to_db=True, process_source="worker")
-                    logger.info("Data loaded into MongoDB successfully")
-                except Exception as mongo_error:
-                    logger.error(f"Error loading data into MongoDB: {mongo_error}", exc_info=True)
-
-                logger.info(f"File processing completed: {uri}")
-            except Exception as e:
-                logger.error(f"Error processing file {uri}: {e}", exc_info=True)
-                raise
-
-        elif source == "gdrive":
-            # Process Google Drive
-            logger.info(f"Processing Google Drive: {uri}")
-            # This requires user authentication, which is handled in the main API
-            # The task should include the access token
-            access_token = task.get("access_token")
-            if not access_token:
-                error_msg = "Access token required for Google Drive processing"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-
-            try:
-                # Get the process_drive_files function
-                process_drive_files = get_process_drive_files()
-
-                if isinstance(uri, str):
-                    file_ids = [uri]
-                else:
-                    file_ids = uri
-
-                with app.app_context():
-                    process_drive_files(file_ids, access_token)
-
-                logger.info(f"Google Drive processing completed: {uri}")
-            except Exception as e:
-                logger.error(f"Error processing Google Drive {uri}: {e}", exc_info=True)
-                raise
-
-        elif source == "s3":
-            # Process S3
-            logger.info(f"Processing S3: {uri}")
-            # Parse the S3 URI
-            if not uri.startswith("s3://"):
-                error_msg = "Invalid S3 URI format. Expected s3://bucket-name/path/to/file"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-
-            try:
-                # Get the fetch_s3_files_async function
-                fetch_s3_files_async = get_fetch_s3_files_async()
-
-                s3_parts = uri[5:].split("/", 1)
-                if len(s3_parts) < 2:
-                    error_msg = "Invalid S3 URI format. Expected s3://bucket-name/path/to/file"
-                    logger.error(error_msg)
-                    raise ValueError(error_msg)
-
-                # Extract file type
-                file_ext = os.path.splitext(s3_parts[1])[1].lstrip('.')
-                if not file_ext:
-                    error_msg = "Could not determine file type from S3 URI"
-                    logger.error(error_msg)
-                    raise ValueError(error_msg)
-
-                with app.app_context():
-                    fetch_s3_files_async([file_ext])
-
-                logger.info(f"S3 processing completed: {uri}")
-            except Exception as e:
-                logger.error(f"Error processing S3 {uri}: {e}", exc_info=True)
-                raise
-
-        elif source == "slack":
-            # Process Slack
-            logger.info(f"Processing Slack: {uri}")
-            try:
-                # Get the fetch_slack_data_async function
-                fetch_slack_data_async = get_fetch_slack_data_async()
-
-                with app.app_context():
-                    fetch_slack_data_async(uri)
-
-                logger.info(f"Slack processing completed: {uri}")
-            except Exception as e:
-                logger.error(f"Error processing Slack {uri}: {e}", exc_info=True)
-                raise
-
-        else:
+        handler = HANDLERS.get(source)
+        if handler is None:
             error_msg = f"Unsupported source: {source}"
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+        handler(task, uri)
+
         logger.info(f"Task {task['id']} completed successfully")
 
     except Exception as e:
         logger.error(f"Task {task['id']} failed: {e}", exc_info=True)
         raise
 
+# Tasks waiting in the queue longer than this are considered stuck and removed
+STUCK_TASK_AGE = 1800  # 30 minutes
+
+def drop_stuck_tasks():
+    """Log the queue size and remove tasks that have waited in the queue too long"""
+    queue_size = broker.queue_size()
+    if queue_size > 0:
+        logger.info(f"Current queue size: {queue_size}")
+
+        # The broker keeps queued tasks in a heap by enqueue time, so this only looks at expired ones
+        for task_id in broker.drop_expired_tasks(STUCK_TASK_AGE):
+            logger.warning(f"Found stuck task {task_id} in queue. Removing it.")
+
+def handle_task(task, worker_name):
+    """Process one task and record its outcome with the broker"""
+    try:
+        # Update task status
+        broker.update_task_status(task["id"], "processing")
+        logger.info(f"Worker {worker_name} processing task {task['id']}")
+
+        # Process the task
+        process_task(task)
+
+        # Update task status; the broker takes it off the queue in the same step
+        broker.update_task_status(task["id"], "completed")
+
+        logger.info(f"Worker {worker_name} completed task {task['id']}")
+    except Exception as e:
+        error_msg = f"Error processing task {task['id']}: {e}"
+        logger.error(error_msg, exc_info=True)
+
+        # Mark as failed; this also takes it off the queue
+        broker.update_task_status(task["id"], "failed", str(e))
+
 def worker_thread():
     """Worker thread function to process tasks"""
     thread_name = threading.current_thread().name
+    if multiprocessing.parent_process() is not None:
+        # Running as a worker process (--executor process)
+        thread_name = multiprocessing.current_process().name
     logger.info(f"Worker thread started: {thread_name}")
 
     # Print the broker queue size at startup
-    logger.info(f"Initial queue size: {len(broker.tasks)}")
+    logger.info(f"Initial queue size: {broker.queue_size()}")
 
     while True:
         try:
-            # Print queue size periodically
-            queue_size = len(broker.tasks)
-            if queue_size > 0:
-                logger.info(f"Current queue size: {queue_size}")
-
-                # Check for stuck tasks (tasks that have been in the queue for too long)
-                current_time = time.time()
-                with broker.lock:
-                    for i, task in enumerate(broker.tasks):
-                        # If the task has a timestamp, check if it's been in the queue for more than 30 minutes
-                        if 'timestamp' in task:
-                            try:
-                                task_time = datetime.datetime.fromisoformat(task['timestamp']).timestamp()
-                                if current_time - task_time > 1800:  # 30 minutes
-                                    logger.warning(f"Found stuck task {task['id']} in queue. Removing it.")
-                                    broker.tasks.pop(i)
-                                    broker._save_tasks_to_file()
-                                    break
-                            except Exception as e:
-                                logger.error(f"Error checking task timestamp: {e}")
-
-            # Get a task from the queue
+            drop_stuck_tasks()
+
+            # Get a task from the queue (blocks until one arrives or the wait times out)
             task = broker.get_next_task()
 
             if task:
-                try:
-                    # Update task status
-                    broker.update_task_status(task["id"], "processing")
-                    logger.info(f"Worker {thread_name} processing task {task['id']}")
-
-                    # Process the task
-                    process_task(task)
-
-                    # Update task status and ensure it's removed from the queue
-                    broker.update_task_status(task["id"], "completed")
-
-                    # Double-check that the task was removed from the queue
-                    with broker.lock:
-                        for i, t in enumerate(broker.tasks):
-                            if t.get('id') == task["id"]:
-                                logger.warning(f"Task {task['id']} still in queue after completion. Removing it.")
-                                broker.tasks.pop(i)
-                                broker._save_tasks_to_file()
-                                break
-
-                    logger.info(f"Worker {thread_name} completed task {task['id']}")
-                except Exception as e:
-                    error_msg = f"Error processing task {task['id']}: {e}"
-                    logger.error(error_msg, exc_info=True)
-
-                    # Mark as failed and ensure it's removed from the queue
-                    broker.update_task_status(task["id"], "failed", str(e))
-
-                    # Double-check that the task was removed from the queue
-                    with broker.lock:
-                        for i, t in enumerate(broker.tasks):
-                            if t.get('id') == task["id"]:
-                                logger.warning(f"Task {task['id']} still in queue after failure. Removing it.")
-                                broker.tasks.pop(i)
-                                broker._save_tasks_to_file()
-                                break
-            else:
-                # No tasks, sleep briefly
-                time.sleep(0.1)
+                handle_task(task, thread_name)
         except Exception as e:
             error_msg = f"Worker {thread_name} error: {e}"
             logger.error(error_msg, exc_info=True)
             time.sleep(1)  # Sleep to avoid tight loop on error
 
-def start_workers(num_workers=2):
+async def dispatcher(max_in_flight):
+    """
+    Take tasks off the broker and run up to max_in_flight of them at once
+
+    Blocking broker calls and process_task run in the loop's thread pool, so a
+    single event loop replaces one long-lived thread per worker.
+    """
+    loop = asyncio.get_running_loop()
+    # One extra thread for the blocking get_next_task call
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max_in_flight + 1, thread_name_prefix="StreamingTask"))
+    slots = asyncio.Semaphore(max_in_flight)
+    in_flight = set()
+    name = threading.current_thread().name
+    logger.info(f"Dispatcher started: {name} (up to {max_in_flight} tasks at once)")
+
+    async def run(task):
+        try:
+            await asyncio.to_thread(handle_task, task, name)
+        finally:
+            slots.release()
+
+    while True:
+        # Don't take a task off the queue until there is a slot to run it
+        await slots.acquire()
+        try:
+            await asyncio.to_thread(drop_stuck_tasks)
+            task = await asyncio.to_thread(broker.get_next_task)
+        except Exception as e:
+            slots.release()
+            logger.error(f"Dispatcher {name} error: {e}", exc_info=True)
+            await asyncio.sleep(1)  # Sleep to avoid tight loop on error
+            continue
+
+        if not task:
+            slots.release()
+            continue
+
+        job = asyncio.create_task(run(task))
+        in_flight.add(job)
+        job.add_done_callback(in_flight.discard)
+
+def async_worker(concurrency):
+    """Thread target that runs the asyncio dispatcher"""
+    asyncio.run(dispatcher(concurrency))
+
+# Heavy, side-effect-free libraries imported once in the forkserver, so worker
+# processes fork with them already loaded and share those pages copy-on-write.
+# main2 itself is left out: importing it opens the broker's lock file and client
+# connections, which must not be shared between processes
+FORKSERVER_PRELOAD = ['flask', 'pymongo', 'nltk', 'requests']
+
+def _process_context():
+    """forkserver children start from a small clean server instead of copying this process's heap"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        # Missing modules are skipped by the forkserver
+        ctx.set_forkserver_preload(FORKSERVER_PRELOAD)
+        return ctx
+    return multiprocessing.get_context('spawn')
+
+def _report_exit(target, name, death_queue):
+    """Run target and put the worker's name on death_queue however it ends"""
+    try:
+        target()
+    finally:
+        death_queue.put(name)
+
+def spawn_worker(name, executor="thread", death_queue=None, concurrency=1):
     """
-    Start worker threads to process streaming tasks
+    Start a single worker as a daemon thread or process
 
     Args:
-        num_workers (int): Number of worker threads to start
+        name (str): Worker name
+        executor (str): "thread" for I/O-bound work, "process" to sidestep the GIL,
+            "async" for one event loop running up to `concurrency` tasks
+        death_queue (queue.Queue, optional): Receives the worker's name when it exits
+        concurrency (int): Tasks in flight for the "async" executor
+    """
+    if executor == "process":
+        # Each process gets its own broker; the Redis list / queue log is shared between them
+        worker = _process_context().Process(target=worker_thread, name=name)
+        worker.daemon = True
+        worker.start()
+        if death_queue is not None:
+            # A local queue can't cross the process boundary, so a parent-side thread waits on it
+            threading.Thread(target=_report_exit, args=(worker.join, name, death_queue),
+                             name=f"{name}-watch", daemon=True).start()
+        return worker
+
+    target = worker_thread
+    if executor == "async":
+        target = functools.partial(async_worker, concurrency)
+
+    if death_queue is not None:
+        worker = threading.Thread(target=_report_exit, args=(target, name, death_queue), name=name)
+    else:
+        worker = threading.Thread(target=target, name=name)
+    worker.daemon = True
+    worker.start()
+    return worker
+
+def start_workers(num_workers=2, executor="thread", death_queue=None):
     """
-    logger.info(f"Starting {num_workers} worker threads")
+    Start workers to process streaming tasks
+
+    Args:
+        num_workers (int): Number of workers to start (tasks in flight for "async")
+        executor (str): "thread", "process" or "async"
+        death_queue (queue.Queue, optional): Receives a worker's name when it exits
+    """
+    kind = {"process": "processes", "async": "async task slots"}.get(executor, "threads")
+    logger.info(f"Starting {num_workers} worker {kind}")
 
     # Check if app is available
     if 'app' not in globals():
         logger.error("Flask app not available. Workers may not function correctly.")
         print("WARNING: Flask app not available. Workers may not function correctly.")
 
-    # Start worker threads
-    workers = []
-    for i in range(num_workers):
-        thread = threading.Thread(target=worker_thread, name=f"StreamingWorker-{i+1}")
-        thread.daemon = True
-        thread.start()
-        workers.append(thread)
-
-    logger.info(f"Started {num_workers} worker threads")
-    print(f"Started {num_workers} worker threads")
+    # Start the workers
+    if executor == "async":
+        workers = [spawn_worker("StreamingDispatcher", executor, death_queue, num_workers)]
+    else:
+        workers = [spawn_worker(f"StreamingWorker-{i+1}", executor, death_queue) for i in range(num_workers)]
+
+    logger.info(f"Started {num_workers} worker {kind}")
+    print(f"Started {num_workers} worker {kind}")
 
     return workers
 
@@ -1,17 +1,28 @@
+import os
 import re
 import random
+import atexit
+import threading
+import multiprocessing
 from collections import Counter
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
 import nltk
 
-# Uncomment these lines and add punkt_tab
-nltk.download('punkt')
-nltk.download('stopwords')
-# Add this line to download punkt_tab resource
-nltk.download('punkt_tab')
+# Download punkt, stopwords and punkt_tab only when they aren't installed yet;
+# nltk.download() re-checks the index on every call, and this runs in every pool worker
+for _resource, _path in (('punkt', 'tokenizers/punkt'),
+                         ('stopwords', 'corpora/stopwords'),
+                         ('punkt_tab', 'tokenizers/punkt_tab')):
+    try:
+        nltk.data.find(_path)
+    except LookupError:
+        nltk.download(_resource, quiet=True)
+
+stop_words = frozenset(stopwords.words('english'))
 
-stop_words = set(stopwords.words('english'))
+# Runs of letters (any script); the C regex engine stands in for word_tokenize + isalpha
+_WORD_RE = re.compile(r"[^\W\d_]+")
 
 def clean_text(text):
 
@@ -27,7 +38,7 @@ def generate_title(text):
     return "Untitled..."
 
 def extract_keywords(text, max_keywords=14):
-    words = [w.lower() for w in word_tokenize(text) if w.isalpha() and w.lower() not in stop_words]
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in stop_words]
     freq = Counter(words)
     if not freq:
         return []
@@ -35,27 +46,33 @@ def extract_keywords(text, max_keywords=14):
     keywords = [word for word, _ in freq.most_common(max_keywords // 2)]
     return keywords * 2  # Repeat each keyword
 
-def random_category(text=""):
-    category_patterns = {
-        'data': ['data', 'database', 'analytics', 'information', 'dataset'],
-        'machine learning': ['model', 'train', 'predict', 'ml', 'algorithm', 'machine learning'],
-        'api': ['api', 'endpoint', 'request', 'response', 'rest', 'call'],
-        'security': ['secure', 'auth', 'permission', 'access', 'protect'],
-        'infrastructure': ['cloud', 'server', 'container', 'kubernetes', 'docker'],
-        'guidelines': ['guide', 'best practice', 'recommend', 'should', 'policy'],
-        'development': ['code', 'program', 'develop', 'software', 'app'],
-        'documentation': ['document', 'manual', 'refer', 'instruct'],
-        'testing': ['test', 'quality', 'validation', 'verify'],
-        'integration': ['connect', 'integrate', 'pipeline', 'workflow'],
-        'governance': ['governance', 'compliance', 'regulation', 'legal'],
-    }
+CATEGORY_PATTERNS = {
+    'data': ['data', 'database', 'analytics', 'information', 'dataset'],
+    'machine learning': ['model', 'train', 'predict', 'ml', 'algorithm', 'machine learning'],
+    'api': ['api', 'endpoint', 'request', 'response', 'rest', 'call'],
+    'security': ['secure', 'auth', 'permission', 'access', 'protect'],
+    'infrastructure': ['cloud', 'server', 'container', 'kubernetes', 'docker'],
+    'guidelines': ['guide', 'best practice', 'recommend', 'should', 'policy'],
+    'development': ['code', 'program', 'develop', 'software', 'app'],
+    'documentation': ['document', 'manual', 'refer', 'instruct'],
+    'testing': ['test', 'quality', 'validation', 'verify'],
+    'integration': ['connect', 'integrate', 'pipeline', 'workflow'],
+    'governance': ['governance', 'compliance', 'regulation', 'legal'],
+}
+
+# Every keyword in one alternation, so a single regex pass finds all of them
+_KW_TO_CAT = {kw: category for category, keywords in CATEGORY_PATTERNS.items() for kw in keywords}
+_CAT_RE = re.compile(r'\b(' + '|'.join(re.escape(kw) for kw in sorted(_KW_TO_CAT, key=len, reverse=True)) + r')\b',
+                     re.IGNORECASE)
+_CAT_RANK = {category: rank for rank, category in enumerate(CATEGORY_PATTERNS)}
 
-    words = set(word_tokenize(text.lower()))
-    for category, keywords in category_patterns.items():
-        if any(kw in words for kw in keywords):
-            return category.capitalize()
+def random_category(text=""):
+    # The earliest category in CATEGORY_PATTERNS with a matching keyword wins
+    matched = {_KW_TO_CAT[kw.lower()] for kw in _CAT_RE.findall(text)}
+    if matched:
+        return min(matched, key=_CAT_RANK.__getitem__).capitalize()
 
-    return random.choice(list(category_patterns.keys())).capitalize()
+    return random.choice(list(CATEGORY_PATTERNS)).capitalize()
 
 def random_tower_option():
     return random.choice([
@@ -64,19 +81,31 @@ def random_tower_option():
         "Procedure", "Specification"
     ])
 
+def _reverse_lines(file, block_size=4096):
+    """Yield the lines of a binary file from last to first, reading backwards in blocks."""
+    file.seek(0, 2)
+    pos = file.tell()
+    tail = b''
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        file.seek(pos)
+        lines = (file.read(step) + tail).split(b'\n')
+        # The first piece may be the end of a line that starts in an earlier block
+        tail = lines.pop(0)
+        yield from reversed(lines)
+    yield tail
+
 def get_last_entity_id(output_path):
     """Get the last entity ID from the existing output file."""
     try:
-        with open(output_path, 'r', encoding='utf-8') as file:
-            # Read the file line by line from the end to find the last valid entity
-            lines = file.readlines()
-
-            # Start from the end and go backwards
-            for line in reversed(lines):
+        with open(output_path, 'rb') as file:
+            # Read the file from the end so only the last few blocks are touched
+            for line in _reverse_lines(file):
                 line = line.strip()
                 if line:  # Skip empty lines
                     # Extract the entity ID from the beginning of the line
-                    parts = line.split('~~', 1)
+                    parts = line.split(b'~~', 1)
                     if len(parts) >= 1 and parts[0].isdigit():
                         return int(parts[0])
 
@@ -90,6 +119,42 @@ def get_last_entity_id(output_path):
         print(f"Error reading last entity ID: {e}. Starting with ID 2000.")
         return 1999  # So the next ID will be 2000
 
+# Input files at least this large are split across a process pool;
+# below it, starting the pool costs more than it saves
+PARALLEL_MIN_BYTES = 64 * 1024
+POOL_CHUNKSIZE = 64
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    """Long-lived worker pool for building entries, or None where one can't be used."""
+    global _pool
+    # Daemonic processes (e.g. --executor process streaming workers) can't have children
+    if multiprocessing.current_process().daemon:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Callers are threaded (the ingest pool, streaming workers), so workers come from
+            # a forkserver (else spawn) rather than a fork that could inherit a held lock
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                ctx = multiprocessing.get_context('forkserver')
+            else:
+                ctx = multiprocessing.get_context('spawn')
+            _pool = ctx.Pool(os.cpu_count(), maxtasksperchild=1000)
+            atexit.register(_pool.terminate)
+        return _pool
+
+def _build_entry(para):
+    """Build the structured entry for one paragraph (runs in the pool)."""
+    return {
+        'title_text': generate_title(para),
+        'description_text': para,
+        'tags_list_text': extract_keywords(para),
+        'category_text': random_category(para),
+        'tower_option_tower': random_tower_option()
+    }
+
 def process_file(input_path, output_path, append=True):
     """Process input file and generate structured data.
 
@@ -97,32 +162,40 @@ def process_file(input_path, output_path, append=True):
     input_path (str): Path to the input text file
     output_path (str): Path to the output file
     append (bool): Whether to append to existing file or overwrite
-    """
-    with open(input_path, 'r', encoding='utf-8') as file:
-        raw_text = file.read()
-
-    # Split into paragraphs as logical units
-    paragraphs = [clean_text(p) for p in raw_text.split('\n') if p.strip()]
 
+    Returns:
+    str: The generated entries, exactly as written to output_path
+    """
     # Get the last entity ID from existing file if appending
     start_id = get_last_entity_id(output_path) + 1 if append else 2000
     print(f"Starting entity generation from ID: {start_id}")
 
     # Open file in append mode if append=True, otherwise in write mode
     mode = 'a' if append else 'w'
-    with open(output_path, mode, encoding='utf-8') as outfile:
-        for idx, para in enumerate(paragraphs):
+    # Entries are CPU-bound and independent, so large files fan out over the pool (order is kept)
+    pool = _get_pool() if os.path.getsize(input_path) >= PARALLEL_MIN_BYTES else None
+
+    lines = []
+    with open(input_path, 'r', encoding='utf-8', buffering=1 << 20) as file:
+        # Stream lines as paragraphs (logical units) straight into the pool
+        paragraphs = (clean_text(line) for line in file if line.strip())
+        if pool is not None:
+            entries = pool.imap(_build_entry, paragraphs, chunksize=POOL_CHUNKSIZE)
+        else:
+            entries = map(_build_entry, paragraphs)
+
+        for idx, entry in enumerate(entries):
             entity_id = start_id + idx
-            entry = {
-                'title_text': generate_title(para),
-                'description_text': para,
-                'tags_list_text': extract_keywords(para),
-                'category_text': random_category(para),
-                'tower_option_tower': random_tower_option()
-            }
-            outfile.write(f"{entity_id}~~{entry}\n")
-
-        print(f"Generated {len(paragraphs)} new entities, from ID {start_id} to {start_id + len(paragraphs) - 1}")
+            lines.append(f"{entity_id}~~{entry}\n")
+
+    generated = "".join(lines)
+    with open(output_path, mode, encoding='utf-8') as outfile:
+        outfile.write(generated)
+
+    print(f"Generated {len(lines)} new entities, from ID {start_id} to {start_id + len(lines) - 1}")
+
+    # Returned so callers can load the new entities without re-reading output_path
+    return generated
 
 if __name__ == '__main__':
     import argparse